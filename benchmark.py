@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Performance Benchmarks
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Benchmark raid throughput, API cost, handler latency and memory.
+
+Everything runs in-process on virtual time against the simulator's fake
+Telegram bot and seeded Twitter metrics, with fixed seeds, so two runs on
+the same machine measure the same work:
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --compare baseline.json   # exits 1 on a regression
+
+Benchmarks:
+    capacity    raids one process keeps up with at a fixed poll tick
+    api_cost    Telegram and Twitter calls per raid-minute in a campaign
+    handlers    /raid and button callback handler latency percentiles
+    render      format_raid_message cost
+    memory      heap and resident memory per active raid
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+
+# bot.py builds its RaidManager on import, keep it away from the real raid store
+os.environ['RAID_STORE_PATH'] = ':memory:'
+
+import bot
+import clock
+from clock import VirtualClock, VirtualTimeLoop
+from config import BULK_RAID_MAX, STATUS_UPDATE_INTERVAL
+from logging_setup import configure_logging
+from raid_manager import RaidManager
+from sharding import ShardRouter
+from simulator import EngagementModel, FakeTelegramBot, SimulatedMetricsProvider, generate_campaign, simulate
+
+# Simulated Twitter requests per window when the budget shouldn't limit the benchmark
+UNLIMITED_RATE = 10 ** 9
+
+# Metric -> True if higher is better, for --compare. Resident memory and
+# p99 latencies are reported but too noisy between runs to gate on.
+METRIC_DIRECTIONS = {
+    'capacity.raids_per_process': True,
+    'api_cost.telegram_calls_per_raid_minute': False,
+    'api_cost.twitter_requests_per_raid_minute': False,
+    'handlers.raid_p50_ms': False,
+    'handlers.raid_p90_ms': False,
+    'handlers.callback_p50_ms': False,
+    'handlers.callback_p90_ms': False,
+    'render.us_per_message': False,
+    'memory.heap_bytes_per_raid': False,
+}
+
+def percentile(values, pct):
+    """Get the pct-th percentile of values (nearest rank)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+def rss_bytes():
+    """Get this process's resident memory, or None where /proc isn't available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+def run_virtual(coro_func, *args):
+    """Run coroutine function coro_func(*args) on a fresh virtual-time loop"""
+    loop = VirtualTimeLoop()
+    previous = clock.install(VirtualClock(loop))
+    try:
+        return loop.run_until_complete(coro_func(*args))
+    finally:
+        loop.close()
+        clock.install(previous)
+
+class OpenRaidManager(RaidManager):
+    """RaidManager with admission control wide open, so every launched raid runs"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.admission.chat_limit = self.admission.global_limit = float('inf')
+
+    def backpressure(self):
+        return 0.0
+
+async def start_manager(seed, rate_limit=UNLIMITED_RATE):
+    """Start an OpenRaidManager wired to the fake bot and seeded metrics"""
+    manager = OpenRaidManager(store_path=':memory:')
+    manager.twitter_api.provider = SimulatedMetricsProvider(
+        manager.twitter_api.budget, EngagementModel(seed), rate_limit
+    )
+    await manager.start(SimpleNamespace(bot=FakeTelegramBot(latency=0)))
+    return manager
+
+async def launch_raids(manager, raids, chats, targets):
+    """Bulk-launch raids tweets spread over chats, returns the started raids"""
+    started = []
+    for launch in generate_campaign(raids, chats, 0, seed=0):
+        entries = [(f"https://x.com/bench/status/{tweet_id}", tweet_id, dict(targets)) for tweet_id in launch['tweets']]
+        for i in range(0, len(entries), BULK_RAID_MAX):
+            raids_started, _, _ = await manager.start_raids(launch['chat_id'], entries[i:i + BULK_RAID_MAX])
+            started.extend(raids_started)
+    return started
+
+class FixedTickRaidManager(OpenRaidManager):
+    """RaidManager polling every raid at a fixed interval"""
+
+    tick = STATUS_UPDATE_INTERVAL
+
+    def _raid_cadence(self, raid_id):
+        return self.tick
+
+def bench_capacity(args):
+    """Measure how many raids one process keeps up with at a fixed poll tick
+
+    Raids never meet their targets, so all of them stay active for the
+    whole raid duration; the Twitter budget is unlimited so every tick
+    really polls. Capacity is the raid count scaled by how much virtual
+    time one CPU second covers.
+    """
+    FixedTickRaidManager.tick = args.tick
+    launches = generate_campaign(args.capacity_raids, args.chats, 0, args.seed)
+    for launch in launches:
+        launch['targets'] = {'likes': 10 ** 9, 'retweets': 10 ** 9, 'comments': 10 ** 9}
+    report = simulate(launches, args.seed, rate_limit=UNLIMITED_RATE, latency=0, manager_class=FixedTickRaidManager)
+    active_seconds = report['raid_minutes'] * 60 / args.capacity_raids
+    return {
+        'tick_seconds': args.tick,
+        'raids': args.capacity_raids,
+        'cpu_seconds': report['cpu_seconds'],
+        'active_seconds': active_seconds,
+        'raids_per_process': args.capacity_raids * active_seconds / report['cpu_seconds']
+    }
+
+def bench_api_cost(args):
+    """Count outbound API calls per raid-minute in a seeded campaign"""
+    launches = generate_campaign(args.raids, args.chats, args.launch_window, args.seed)
+    report = simulate(launches, args.seed, latency=0)
+    raid_minutes = report['raid_minutes'] or 1
+    telegram_calls = sum(report['telegram_calls'].values())
+    twitter_requests = sum(report['twitter_requests'].values())
+    return {
+        'raids': args.raids,
+        'raid_minutes': report['raid_minutes'],
+        'telegram_calls': report['telegram_calls'],
+        'twitter_requests': report['twitter_requests'],
+        'telegram_calls_per_raid_minute': telegram_calls / raid_minutes,
+        'twitter_requests_per_raid_minute': twitter_requests / raid_minutes,
+        'outcomes': report['raids']
+    }
+
+def _command_update(chat_id, text):
+    """Build a minimal command Update for a bot.py handler"""
+    async def reply_text(*args, **kwargs):
+        return None
+    message = SimpleNamespace(chat_id=chat_id, text=text, reply_text=reply_text)
+    return SimpleNamespace(message=message, effective_chat=SimpleNamespace(id=chat_id))
+
+def _callback_update(query_id, chat_id, data):
+    """Build a minimal callback query Update for bot.button_callback"""
+    async def answer(*args, **kwargs):
+        return True
+    query = SimpleNamespace(
+        id=str(query_id),
+        data=data,
+        message=SimpleNamespace(chat_id=chat_id),
+        from_user=SimpleNamespace(id=1),
+        answer=answer
+    )
+    return SimpleNamespace(callback_query=query)
+
+async def _bench_handlers(args):
+    """Time bot.py's /raid and refresh button handlers"""
+    manager = await start_manager(args.seed)
+    bot.raid_router = ShardRouter.local(manager)
+    await bot.raid_router.start()
+    raid_times, callback_times = [], []
+    try:
+        for i in range(args.handler_calls):
+            chat_id = -1000000000000 - i % args.chats
+            text = f"/raid https://x.com/bench/status/{10 ** 18 + i} 100 20 40"
+            context = SimpleNamespace(args=text.split()[1:])
+            started = time.perf_counter()
+            await bot.raid_command(_command_update(chat_id, text), context)
+            raid_times.append(time.perf_counter() - started)
+
+        raids = manager.get_active_raids()
+        for i in range(args.handler_calls):
+            raid = raids[i % len(raids)]
+            update = _callback_update(i, raid.chat_id, f"refresh_{raid.raid_id}")
+            started = time.perf_counter()
+            await bot.button_callback(update, SimpleNamespace())
+            callback_times.append(time.perf_counter() - started)
+    finally:
+        await bot.raid_router.stop()
+        await manager.stop()
+
+    return {
+        'calls': args.handler_calls,
+        'raid_p50_ms': percentile(raid_times, 50) * 1000,
+        'raid_p90_ms': percentile(raid_times, 90) * 1000,
+        'raid_p99_ms': percentile(raid_times, 99) * 1000,
+        'callback_p50_ms': percentile(callback_times, 50) * 1000,
+        'callback_p90_ms': percentile(callback_times, 90) * 1000,
+        'callback_p99_ms': percentile(callback_times, 99) * 1000
+    }
+
+def bench_handlers(args):
+    """Measure /raid and callback handler latency percentiles"""
+    return run_virtual(_bench_handlers, args)
+
+async def _bench_render(args):
+    """Time format_raid_message on a raid with a full metrics history"""
+    manager = await start_manager(args.seed)
+    try:
+        [raid] = await launch_raids(manager, 1, 1, {'likes': 500, 'retweets': 100, 'comments': 50})
+        for i in range(raid.series.capacity):
+            raid.record_metrics(
+                {'likes': 10 + 3 * i, 'retweets': 5 + i, 'comments': 2 + i // 2},
+                clock.time() - (raid.series.capacity - i) * STATUS_UPDATE_INTERVAL
+            )
+        seconds = min(timeit.repeat(lambda: manager.format_raid_message(raid), number=args.renders, repeat=5))
+    finally:
+        await manager.stop()
+    return {'renders': args.renders, 'us_per_message': seconds / args.renders * 1e6}
+
+def bench_render(args):
+    """Measure format_raid_message render cost"""
+    return run_virtual(_bench_render, args)
+
+async def _held_memory(args, measure):
+    """Get measure()'s growth across launching memory_raids raids and their first polls"""
+    manager = await start_manager(args.seed)
+    try:
+        gc.collect()
+        before = measure()
+        await launch_raids(manager, args.memory_raids, args.chats, {'likes': 10 ** 9, 'retweets': 10 ** 9, 'comments': 10 ** 9})
+        await asyncio.sleep(5 * STATUS_UPDATE_INTERVAL)  # Dashboards posted, a few samples recorded
+        gc.collect()
+        return (measure() - before) / manager.get_active_raids_count()
+    finally:
+        await manager.stop()
+
+def bench_memory(args):
+    """Measure heap (tracemalloc) and resident memory per active raid
+
+    Resident memory is measured first, in its own run, since tracing
+    inflates it and memory freed by an earlier run would be reused.
+    """
+    rss = run_virtual(_held_memory, args, rss_bytes) if rss_bytes() is not None else None
+    tracemalloc.start()
+    try:
+        heap = run_virtual(_held_memory, args, lambda: tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    return {'raids': args.memory_raids, 'heap_bytes_per_raid': heap, 'rss_bytes_per_raid': rss}
+
+BENCHMARKS = {
+    'capacity': bench_capacity,
+    'api_cost': bench_api_cost,
+    'handlers': bench_handlers,
+    'render': bench_render,
+    'memory': bench_memory,
+}
+
+def flatten(results):
+    """Get {'benchmark.metric': value} for every numeric result"""
+    return {
+        f"{name}.{metric}": value
+        for name, values in results.items()
+        for metric, value in values.items()
+        if isinstance(value, (int, float))
+    }
+
+def compare(results, baseline, tolerance):
+    """Print each tracked metric against the baseline, returns the regressed ones"""
+    current, previous = flatten(results), flatten(baseline)
+    regressions = []
+    for metric, higher_is_better in METRIC_DIRECTIONS.items():
+        if metric not in current or not previous.get(metric):
+            continue
+        change = (current[metric] - previous[metric]) / previous[metric]
+        worse = -change if higher_is_better else change
+        flag = 'REGRESSION' if worse > tolerance else ''
+        if flag:
+            regressions.append(metric)
+        print(f"{metric:>45}: {previous[metric]:>12.3f} -> {current[metric]:>12.3f} ({change:+.1%}) {flag}")
+    return regressions
+
+def main():
+    """Parse arguments, run the benchmarks and report or compare results"""
+    if 'PYTHONHASHSEED' not in os.environ:
+        # Restart with fixed string hashing so runs do the same work
+        os.environ['PYTHONHASHSEED'] = '0'
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    parser = argparse.ArgumentParser(description="Benchmark raid throughput, API cost, latency and memory")
+    parser.add_argument('benchmarks', nargs='*', help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--seed', type=int, default=1, help="seed for campaigns and engagement")
+    parser.add_argument('--raids', type=int, default=1000, help="raids in the api_cost campaign")
+    parser.add_argument('--chats', type=int, default=100, help="chats raids are spread over")
+    parser.add_argument('--launch-window', type=float, default=600, help="seconds over which api_cost launches start")
+    parser.add_argument('--capacity-raids', type=int, default=1000, help="concurrent raids in the capacity run")
+    parser.add_argument('--tick', type=float, default=STATUS_UPDATE_INTERVAL, help="poll interval for the capacity run")
+    parser.add_argument('--handler-calls', type=int, default=500, help="calls per handler")
+    parser.add_argument('--renders', type=int, default=2000, help="renders per timing round")
+    parser.add_argument('--memory-raids', type=int, default=2000, help="raids held for the memory measurement")
+    parser.add_argument('--save', help="write results as JSON to this file")
+    parser.add_argument('--compare', help="baseline JSON from --save to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="relative slowdown counted as a regression")
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+    configure_logging('ERROR', fmt='text')
+
+    results = {}
+    for name in args.benchmarks or BENCHMARKS:
+        started = time.perf_counter()
+        results[name] = BENCHMARKS[name](args)
+        print(f"{name} ({time.perf_counter() - started:.1f}s): {json.dumps(results[name], default=str)}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -8,27 +8,55 @@
 # X: x.com/VIBEaiRforce
 # Docs: github.com/vibeAIrFORCE/Docs
 
+import asyncio
+import json
 import logging
 from telegram import Update
 from telegram.constants import ParseMode
 from telegram.ext import (
     Application, CommandHandler, ContextTypes, 
-    MessageHandler, filters, CallbackQueryHandler
+    MessageHandler, filters, CallbackQueryHandler, TypeHandler
 )
-from config import TELEGRAM_TOKEN, BOT_NAME, BOT_VERSION
-from raid_manager import RaidManager
+import clock
+from config import (
+    BOT_NAME,
+    BOT_VERSION,
+    BULK_RAID_MAX_FILE_BYTES,
+    BOT_MODE,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PORT,
+    WEBHOOK_PATH,
+    WEBHOOK_URL,
+    WEBHOOK_SECRET_TOKEN,
+    UPDATE_RECORD_PATH,
+    PROMETHEUS_PORT,
+    PROMETHEUS_LISTEN,
+    SHARD_WORKERS
+)
+from monitoring import observe_handler, start_metrics_server
+from logging_setup import configure_logging
+from raid_manager import RaidManager, DASHBOARD_EDIT, DASHBOARD_COMBINED
+from sharding import ShardRouter
+from twitter_api import TWEET_URL_RE
+from telegram_client import application_builder
 
 # Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize raid manager
-raid_manager = RaidManager()
+# Raids run in this process, or on the shard workers in SHARD_WORKERS
+if SHARD_WORKERS:
+    raid_manager = None
+    raid_router = ShardRouter.connect(SHARD_WORKERS.split(','))
+else:
+    raid_manager = RaidManager()
+    raid_router = ShardRouter.local(raid_manager)
+
+# The only update types the handlers below consume
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
 
 # Command handlers
+@observe_handler('start')
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a message when the command /start is issued."""
     await update.message.reply_text(
@@ -37,6 +65,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         'Use /help to see available commands.'
     )
 
+@observe_handler('help')
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send a message when the command /help is issued."""
     help_text = (
@@ -44,14 +73,20 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "/start - Start the bot\n"
         "/help - Show this help message\n"
         "/raid <tweet_url> <likes> <comments> <reposts> - Start a new raid\n"
-        "/cancel - Cancel all active raids in this chat\n"
-        "/status - Check active raids status\n\n"
+        "/bulkraid [likes comments reposts] - Start raids on many tweets, one URL per line "
+        "(optionally followed by its own targets), in the message, a replied-to message or a .txt file\n"
+        "/cancel - Cancel all active and queued raids in this chat\n"
+        "/status - Check active raids status and queued raids' place in line\n"
+        "/leaderboard [tweet_url] - Top raiders in this chat, or in one of its raids\n"
+        "/dashboard <edit|repost|combined> [N] - Update dashboards in place (re-posting every N updates), "
+        "re-post every time, or show all raids in one paged message\n\n"
         "Example: /raid https://twitter.com/user/status/123456 100 50 30\n\n"
         "The raid will last for 30 minutes or until all targets are met.\n"
         "Status updates will appear in a single message that updates automatically."
     )
     await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
 
+@observe_handler('raid')
 async def raid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Start a new raid with the given parameters."""
     args = context.args
@@ -80,54 +115,129 @@ async def raid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         return
     
     # Start raid
-    success, result = raid_manager.start_raid(
-        context.application,
+    success, result = await raid_router.start_raid(
         update.effective_chat.id,
         tweet_url,
         targets
     )
     
-    if success:
+    if not success:
+        await update.message.reply_text(f"⚠️ {result}")
+    elif result['position']:
+        await update.message.reply_text(
+            f"⏳ This chat or the bot is at its raid limit, so the raid is queued at position {result['position']}.\n"
+            "It will start with its own dashboard as soon as a slot frees up. Check /status for its place in line."
+        )
+    else:
         await update.message.reply_text(
             f"🚀 {BOT_NAME} raid started successfully!\n"
             "A status dashboard has been created and will update automatically.",
             parse_mode=ParseMode.MARKDOWN
         )
+
+async def _read_raid_file(document):
+    """Download a raid list file attached to a message."""
+    if document.file_size and document.file_size > BULK_RAID_MAX_FILE_BYTES:
+        return None
+    file = await document.get_file()
+    data = await file.download_as_bytearray()
+    return data.decode('utf-8', errors='replace')
+
+@observe_handler('bulkraid')
+async def bulkraid_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Start raids on many tweets with a single summary reply."""
+    message = update.message
+    text = message.text or message.caption or ''
+    
+    # Shared targets may follow the command on its first line
+    header, _, body = text.partition('\n')
+    header_args = header.split()[1:]
+    default_targets = None
+    if header_args and all(arg.isdigit() for arg in header_args):
+        if len(header_args) != 3:
+            await message.reply_text(
+                "⚠️ Incorrect format. Use:\n/bulkraid [likes comments reposts]\n<tweet_url> [likes comments reposts]\n..."
+            )
+            return
+        default_targets = {
+            'likes': int(header_args[0]),
+            'comments': int(header_args[1]),
+            'retweets': int(header_args[2])
+        }
     else:
-        await update.message.reply_text(f"⚠️ {result}")
+        body = ' '.join(header_args) + '\n' + body
+    
+    # Tweets can also come from a replied-to message or an attached .txt file
+    sources = [body]
+    for source in (message, message.reply_to_message):
+        if source is None:
+            continue
+        if source is not message and source.text:
+            sources.append(source.text)
+        if source.document:
+            content = await _read_raid_file(source.document)
+            if content is None:
+                await message.reply_text(f"⚠️ Raid list files must be under {BULK_RAID_MAX_FILE_BYTES // 1024} KB.")
+                return
+            sources.append(content)
+    
+    entries, errors = raid_router.parse_raid_list('\n'.join(sources), default_targets)
+    if not entries:
+        await message.reply_text("⚠️ No tweets to raid. Put one tweet URL per line, each followed by its targets or with shared targets after /bulkraid.")
+        return
+    
+    raids, queued, failures = await raid_router.start_raids(update.effective_chat.id, entries)
+    failures = errors + failures
+    
+    summary = f"🚀 {BOT_NAME} bulk raid: {len(raids)} of {len(entries) + len(errors)} started."
+    if queued:
+        summary += f"\n⏳ {len(queued)} queued, they start as slots free up (see /status)."
+    if failures:
+        summary += f"\n\n⚠️ Not started ({len(failures)}):\n"
+        summary += '\n'.join(f"• {line[:80]} - {reason}" for line, reason in failures[:20])
+        if len(failures) > 20:
+            summary += f"\n…and {len(failures) - 20} more"
+    await message.reply_text(summary, disable_web_page_preview=True)
 
+@observe_handler('cancel')
 async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Cancel all active raids in the chat."""
     try:
-        success, message = raid_manager.cancel_raid(update.effective_chat.id)
+        success, message = await raid_router.cancel_raid(update.effective_chat.id)
         await update.message.reply_text(message)
     except Exception as e:
-        logger.error(f"Error in cancel command: {e}")
+        logger.error("Error in cancel command: %s", e)
         await update.message.reply_text("Error cancelling raids. Please try again.")
 
+@observe_handler('status')
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Check status of active raids."""
-    chat_id = update.effective_chat.id
-    active_count = raid_manager.get_active_raids_count(chat_id)
+    status = await raid_router.get_raid_status(update.effective_chat.id)
+    raids, queued = status['active'], status['queued']
     
-    if active_count > 0:
-        raids = raid_manager.get_active_raids(chat_id)
-        
-        message = f"🚀 *{BOT_NAME} - Active Raids ({active_count})* 🚀\n\n"
+    if raids or queued:
+        message = f"🚀 *{BOT_NAME} - Active Raids ({len(raids)})* 🚀\n\n"
         
         for i, raid in enumerate(raids, 1):
-            time_left = raid['end_time'] - datetime.now()
-            if time_left.total_seconds() <= 0:
+            time_left = raid['end_time'] - clock.time()
+            if time_left <= 0:
                 time_str = "0m 0s"
             else:
-                minutes, seconds = divmod(time_left.seconds, 60)
+                minutes, seconds = divmod(int(time_left), 60)
                 time_str = f"{minutes}m {seconds}s"
                 
             message += f"*Raid #{i}*\n"
             message += f"Tweet: [Link]({raid['tweet_url']})\n"
             message += f"Time Left: {time_str}\n"
+            if raid['poll_interval']:
+                message += f"Polling: every {raid['poll_interval']:.0f}s\n"
             message += f"Status: Active\n\n"
         
+        if queued:
+            message += f"⏳ *Queued Raids ({len(queued)})*\n"
+            for raid in queued:
+                message += f"#{raid['position']} in line: [Link]({raid['tweet_url']})\n"
+        
         await update.message.reply_text(
             message,
             parse_mode=ParseMode.MARKDOWN,
@@ -139,6 +249,68 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             "Start a new raid with /raid command."
         )
 
+@observe_handler('leaderboard')
+async def leaderboard_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Show the chat's top raiders, or the top raiders of one of its raids."""
+    chat_id = update.effective_chat.id
+    tweet_id = None
+    if context.args:
+        match = TWEET_URL_RE.search(context.args[0])
+        if not match:
+            await update.message.reply_text("⚠️ Invalid tweet URL. Usage: /leaderboard [tweet_url]")
+            return
+        tweet_id = match.group(1)
+    
+    leaders = await raid_router.get_leaderboard(chat_id, tweet_id)
+    if leaders is None:
+        await update.message.reply_text("No active raid on that tweet in this chat.")
+        return
+    if not leaders:
+        await update.message.reply_text("No raiders tracked yet. Engagements show up here a minute or so after they happen.")
+        return
+    
+    medals = {1: '🥇', 2: '🥈', 3: '🥉'}
+    icons = {'likes': '❤️', 'retweets': '🔄', 'comments': '💬'}
+    title = "Raid Leaderboard" if tweet_id else "Raider Leaderboard"
+    message = f"🏆 *{BOT_NAME} - {title}* 🏆\n\n"
+    for rank, entry in enumerate(leaders, 1):
+        engaged = ''.join(icons[metric] for metric in entry.get('engaged', ()))
+        message += f"{medals.get(rank, f'{rank}.')} {RaidManager.format_raider(entry)} - {entry['points']} pts {engaged}\n"
+    message += "\n_Approximate: unlikes during a raid hide as many new likes, and protected accounts aren't listed._"
+    await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
+
+@observe_handler('dashboard')
+async def dashboard_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Show or change how raid dashboards are updated in this chat."""
+    chat_id = update.effective_chat.id
+    args = context.args
+    
+    if args:
+        try:
+            repost_every = int(args[1]) if len(args) > 1 else 0
+        except ValueError:
+            await update.message.reply_text("⚠️ Repost interval must be a number.")
+            return
+        
+        success, message = await raid_router.set_dashboard_settings(chat_id, args[0].lower(), repost_every)
+        if not success:
+            await update.message.reply_text(f"⚠️ {message}")
+            return
+    
+    mode, repost_every = await raid_router.get_dashboard_settings(chat_id)
+    if mode == DASHBOARD_EDIT and repost_every:
+        description = f"edited in place, re-posted every {repost_every} updates"
+    elif mode == DASHBOARD_EDIT:
+        description = "edited in place"
+    elif mode == DASHBOARD_COMBINED and repost_every:
+        description = f"combined into one message, re-posted every {repost_every} updates"
+    elif mode == DASHBOARD_COMBINED:
+        description = "combined into one message"
+    else:
+        description = "re-posted on every update"
+    await update.message.reply_text(f"📊 Raid dashboards in this chat are {description}.")
+
+@observe_handler('button')
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle button presses."""
     query = update.callback_query
@@ -148,10 +320,10 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     chat_id = query.message.chat_id
     user_id = query.from_user.id
     
-    logger.info(f"Received callback query: {callback_data} from user {user_id} in chat {chat_id}")
+    logger.info("Received callback query: %s from user %s in chat %s", callback_data, user_id, chat_id)
     
     # Handle the callback query
-    success, message = raid_manager.handle_callback_query(
+    success, message = await raid_router.handle_callback_query(
         query.id, callback_data, chat_id, user_id
     )
     
@@ -167,17 +339,54 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             "⚠️ An error occurred while processing your request. Please try again."
         )
 
+def _append_update(line):
+    """Append a line to the update record file."""
+    with open(UPDATE_RECORD_PATH, 'a') as f:
+        f.write(line)
+
+async def record_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Append an incoming update to the record file for later replay."""
+    await asyncio.to_thread(_append_update, json.dumps(update.to_dict()) + '\n')
+
+async def post_init(application: Application) -> None:
+    """Start the raid scheduler and router once the event loop is running."""
+    if raid_manager:
+        # The router restores stored raids when the in-process worker joins
+        await raid_manager.start(application, restore=False)
+    await raid_router.start()
+
+async def post_shutdown(application: Application) -> None:
+    """Stop the router and raid scheduler."""
+    await raid_router.stop()
+    if raid_manager:
+        await raid_manager.stop()
+
 def main() -> None:
     """Start the bot."""
     # Create the Application and pass it your bot's token
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    application = (
+        application_builder()
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
+    # Record updates before any handler sees them
+    if UPDATE_RECORD_PATH:
+        application.add_handler(TypeHandler(Update, record_update), group=-1)
+    
     # Register command handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(CommandHandler("raid", raid_command))
+    application.add_handler(CommandHandler("bulkraid", bulkraid_command))
+    application.add_handler(MessageHandler(
+        filters.Document.ALL & filters.CaptionRegex(r'^/bulkraid\b'), bulkraid_command
+    ))
     application.add_handler(CommandHandler("cancel", cancel_command))
     application.add_handler(CommandHandler("status", status_command))
+    application.add_handler(CommandHandler("dashboard", dashboard_command))
+    application.add_handler(CommandHandler("leaderboard", leaderboard_command))
     
     # Register callback query handler for buttons
     application.add_handler(CallbackQueryHandler(button_callback))
@@ -185,9 +394,28 @@ def main() -> None:
     # Register error handler
     application.add_error_handler(error_handler)
 
+    # Expose Prometheus metrics
+    if PROMETHEUS_PORT:
+        start_metrics_server(PROMETHEUS_PORT, PROMETHEUS_LISTEN)
+
     # Start the Bot
-    logger.info(f"{BOT_NAME} v{BOT_VERSION} starting...")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    logger.info("%s v%s starting in %s mode...", BOT_NAME, BOT_VERSION, BOT_MODE)
+    if BOT_MODE == 'webhook':
+        if not WEBHOOK_SECRET_TOKEN:
+            logger.error("WEBHOOK_SECRET_TOKEN must be set in webhook mode")
+            return
+        # Updates are pushed to PTB's webhook server; requests without the
+        # secret token header are rejected with 403
+        application.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET_TOKEN,
+            allowed_updates=ALLOWED_UPDATES
+        )
+    else:
+        application.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Clock
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Time source for the raid engine.
+
+Raid code reads the time through now(), time() and monotonic() here
+instead of datetime/time directly, so a simulation can install a
+VirtualClock and run a 30-minute campaign in seconds.
+"""
+
+import asyncio
+import math
+import selectors
+import time as _time
+from datetime import datetime
+
+# Default start of virtual time (2024-01-01 00:00:00 UTC), for reproducible runs
+VIRTUAL_EPOCH = 1704067200.0
+
+class RealClock:
+    """Wall-clock time"""
+
+    def now(self):
+        """Get the current local datetime"""
+        return datetime.now()
+
+    def time(self):
+        """Get seconds since the epoch"""
+        return _time.time()
+
+    def monotonic(self):
+        """Get a monotonic reading in seconds"""
+        return _time.monotonic()
+
+class _WarpSelector:
+    """Selector that skips idle waits by advancing its loop's virtual time.
+
+    Ready I/O (including worker threads handing results back) is always
+    delivered first; only when nothing is ready does it jump straight to
+    the loop's next timer.
+    """
+
+    def __init__(self, selector, loop):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events or (timeout == 0 and self._loop._ready):
+            return events
+        if timeout is None:
+            # No timers at all, only real I/O can wake the loop
+            return self._selector.select(None)
+        self._loop.warp(timeout)
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time only moves when every task is waiting.
+
+    asyncio.sleep(), timeouts and call_later() all follow the virtual time,
+    so idle waits cost no real time at all.
+    """
+
+    def __init__(self):
+        self._virtual_time = 0.0
+        super().__init__(_WarpSelector(selectors.DefaultSelector(), self))
+        # Timers only fire once time has passed them, so waits too short to
+        # change the float still cost a warp instead of spinning in place
+        self._clock_resolution = 0
+
+    def time(self):
+        return self._virtual_time
+
+    def advance(self, seconds):
+        """Move virtual time forward"""
+        self._virtual_time += max(seconds, 0)
+
+    def warp(self, timeout):
+        """Skip an idle wait of timeout seconds, landing on the next timer
+
+        Always moves time forward, even when the timeout is too small to
+        change the float, so a sub-ulp sleep can't spin the loop.
+        """
+        target = self._virtual_time + max(timeout, 0)
+        if self._scheduled:
+            target = max(target, self._scheduled[0].when())
+        self._virtual_time = max(target, math.nextafter(self._virtual_time, math.inf))
+
+class VirtualClock:
+    """Clock that follows a VirtualTimeLoop's time"""
+
+    def __init__(self, loop, start=VIRTUAL_EPOCH):
+        """Initialize clock reading start (epoch seconds) at the loop's time zero"""
+        self.loop = loop
+        self.start = start
+
+    def now(self):
+        """Get the current virtual local datetime"""
+        return datetime.fromtimestamp(self.time())
+
+    def time(self):
+        """Get virtual seconds since the epoch"""
+        return self.start + self.loop.time()
+
+    def monotonic(self):
+        """Get the loop's virtual time in seconds"""
+        return self.loop.time()
+
+_clock = RealClock()
+
+def install(clock):
+    """Make clock the time source for raid code, returns the previous one"""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+def now():
+    """Get the current local datetime"""
+    return _clock.now()
+
+def time():
+    """Get seconds since the epoch"""
+    return _clock.time()
+
+def monotonic():
+    """Get a monotonic reading in seconds"""
+    return _clock.monotonic()
@@ -21,15 +21,105 @@ BOT_VERSION = "1.0.0"
 # Telegram Bot Configuration
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 
+TELEGRAM_API_BASE_URL = os.getenv('TELEGRAM_API_BASE_URL', 'https://api.telegram.org/bot')  # point at a local stub for replay tests
+
+# Update delivery: 'polling' (getUpdates) or 'webhook' (Telegram POSTs to our server)
+BOT_MODE = os.getenv('BOT_MODE', 'polling')
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '127.0.0.1')  # interface the webhook server binds to
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', 'telegram')  # URL path updates are POSTed to
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')  # public URL registered with Telegram, e.g. behind a load balancer
+WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN')  # required in webhook mode, checked on every POST
+UPDATE_RECORD_PATH = os.getenv('UPDATE_RECORD_PATH')  # append every incoming update here as JSON lines, for replay
+
+# Telegram connection pool (shared by handlers and raid dashboards)
+TELEGRAM_POOL_SIZE = 64  # max concurrent keep-alive connections to api.telegram.org
+TELEGRAM_CONNECT_TIMEOUT = 5.0  # seconds
+TELEGRAM_READ_TIMEOUT = 10.0  # seconds
+TELEGRAM_WRITE_TIMEOUT = 10.0  # seconds
+TELEGRAM_POOL_TIMEOUT = 5.0  # seconds to wait for a free pooled connection
+
+# Telegram outbound pacing (Bot API allows ~1 msg/s per chat, ~30 msg/s overall)
+TELEGRAM_CHAT_RATE = 1.0  # calls per second per chat
+TELEGRAM_CHAT_BURST = 3  # calls a quiet chat may make back to back
+TELEGRAM_GLOBAL_RATE = 30.0  # calls per second across all chats
+TELEGRAM_GLOBAL_BURST = 30
+OUTBOUND_STATS_INTERVAL = 60  # seconds between outbound queue stats log lines
+
 # Twitter API Configuration
 TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
 TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET')
 TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
 TWITTER_ACCESS_SECRET = os.getenv('TWITTER_ACCESS_SECRET')
+TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')  # optional, v2 app-only auth
+
+# Metrics backend: 'mock' (simulated, no credentials needed), 'v1' (API v1.1, no
+# comment counts) or 'v2' (API v2 async client with public_metrics)
+METRICS_PROVIDER = os.getenv('METRICS_PROVIDER', 'mock')
 
 # Raid Configuration
 DEFAULT_RAID_DURATION = 30  # minutes
-STATUS_UPDATE_INTERVAL = 20  # seconds
+STATUS_UPDATE_INTERVAL = 20  # seconds, default poll interval until a raid's growth rate is known
+POLL_INTERVAL_MIN = 5  # seconds, floor for raids about to meet their targets
+POLL_INTERVAL_MAX = 60  # seconds, ceiling for stalled raids and raids not on pace
+DASHBOARD_MODE = 'edit'  # 'edit' updates the status message in place, 'repost' deletes and re-sends it, 'combined' edits one message per chat
+DASHBOARD_REPOST_EVERY = 0  # in edit and combined modes, re-post every N updates to keep it at the bottom (0 = never)
+CHAT_DASHBOARD_PAGE_SIZE = 5  # raids per page of a combined dashboard
+RAID_WORKER_THREADS = 8  # threads for blocking calls (v1.1 Twitter client, raid store)
+RAID_WORKER_QUEUE_LIMIT = 64  # blocking calls that may wait for a thread before callers back off
+LOOP_LAG_CHECK_INTERVAL = 0.5  # seconds between event loop heartbeats
+LOOP_LAG_THRESHOLD = 0.25  # seconds of loop lag logged as a stall
+POLL_BATCH_WINDOW = 1  # seconds to wait for more due tweets before a batch lookup
+TWITTER_BATCH_SIZE = 100  # max tweets per lookup request (API limit)
+TWITTER_RATE_LIMIT_RESERVE = 10  # requests per window kept back for /raid and refresh
+BULK_RAID_MAX = 50  # max tweets in one /bulkraid launch
+BULK_RAID_MAX_FILE_BYTES = 64 * 1024  # max size of an attached raid list file
+TWEET_CACHE_SIZE = 10000  # tweets whose last lookup is cached
+TWEET_CACHE_TTL = 10  # seconds a cached lookup is served to /raid and refresh
+REFRESH_FRESH_AGE = 10  # seconds after a raid's last poll that Refresh answers from its current metrics
+TWEET_NEGATIVE_CACHE_TTL = 60  # seconds a deleted/private tweet is remembered as unavailable
+LOW_PRIORITY_THRESHOLD = 0.5  # raids below this priority are slowed under rate-limit pressure
+LOW_PRIORITY_MAX_SLOWDOWN = 4  # max poll interval multiplier for low-priority raids
+METRICS_SERIES_CAPACITY = 32  # metric samples kept per raid (oldest are overwritten)
+METRICS_VELOCITY_WINDOW = 300  # seconds of samples used for growth rate and ETA
+
+# Admission control: raids over a cap wait in a fair queue (chats take turns)
+RAID_CHAT_LIMIT = 25  # concurrent raids per chat
+RAID_GLOBAL_LIMIT = 5000  # concurrent raids per bot (split evenly across shard workers)
+RAID_CHAT_QUEUE_LIMIT = 100  # queued raids per chat, more are refused
+ADMISSION_MAX_PRESSURE = 0.9  # backpressure (0-1, Twitter polling demand or Telegram backlog) at which new raids queue
+ADMISSION_TELEGRAM_BACKLOG = 30  # seconds of queued Telegram calls counted as full backpressure
+ADMISSION_RETRY_INTERVAL = 5  # seconds between admission passes while raids are queued
+
+# Raider leaderboards: who engaged, synced incrementally from the engager endpoints (v2 and mock providers)
+ENGAGER_SYNC_INTERVAL = 60  # seconds between engager syncs, only tweets whose counts grew are fetched
+ENGAGER_PAGE_SIZE = 100  # engagers per page (API limit)
+ENGAGER_MAX_PAGES = 5  # pages per tweet and metric per sync, the rest continue from the cursor next time
+ENGAGER_BASELINE_KEEP = 5  # newest pre-raid likers/retweeters kept per tweet, that many known users in a row end a scan
+ENGAGEMENT_POINTS = {'likes': 1, 'retweets': 2, 'comments': 3}  # leaderboard points per engagement
+LEADERBOARD_SIZE = 10  # raiders shown by /leaderboard
+
+# Raid state persistence
+RAID_STORE_PATH = os.getenv('RAID_STORE_PATH', 'raids.db')  # SQLite file restored on startup
+RAID_STORE_FLUSH_INTERVAL = 2  # seconds between write-behind flushes
+
+# Sharding: raids are partitioned by chat across worker processes (see shard_worker.py)
+SHARD_WORKERS = os.getenv('SHARD_WORKERS', '')  # comma-separated 'unix:/path' or 'tcp:host:port' workers, empty runs raids in-process
+SHARD_SECRET = os.getenv('SHARD_SECRET', '')  # shared secret the front process presents to workers, required for tcp
+SHARD_REQUEST_TIMEOUT = 30  # seconds to wait for a worker to answer (bulk launches look up many tweets)
+SHARD_HEARTBEAT_INTERVAL = 2  # seconds between worker pings
+SHARD_HEARTBEAT_MISSES = 3  # missed pings in a row before a worker's chats are handed off
+
+# Logging
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # default level for every subsystem
+LOG_LEVELS = os.getenv('LOG_LEVELS', 'httpx=WARNING')  # per-subsystem overrides, e.g. 'metrics_poller=WARNING,raid_manager=DEBUG'
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' lines or human-readable 'text'
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '10'))  # log one in N metric updates per raid
+
+# Prometheus metrics
+PROMETHEUS_PORT = int(os.getenv('PROMETHEUS_PORT', '9464'))  # local /metrics port, 0 disables it
+PROMETHEUS_LISTEN = os.getenv('PROMETHEUS_LISTEN', '127.0.0.1')  # interface serving /metrics
+PROMETHEUS_REFRESH_INTERVAL = 5  # seconds between active-raid and queue gauge refreshes
 
-# Mock Mode (set to True if you don't have valid Twitter API credentials)
-MOCK_MODE = True # Change to False when you have valid Twitter API credentials
\ No newline at end of file
+# Mock provider
+MOCK_RATE_LIMIT = 900  # simulated requests per 15-minute window in mock mode
\ No newline at end of file
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Engager Tracker
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import heapq
+import logging
+from array import array
+import clock
+from config import (
+    ENGAGER_SYNC_INTERVAL,
+    ENGAGER_MAX_PAGES,
+    ENGAGER_BASELINE_KEEP,
+    ENGAGEMENT_POINTS
+)
+
+logger = logging.getLogger(__name__)
+
+_EMPTY = frozenset()  # Shared by cursors until their first engager
+
+class UserDirectory:
+    """Interns Twitter user IDs as small ints shared by every engager set.
+
+    Each user's ID and handle are stored once; engager sets hold only the
+    index, so a raider who engages with many tweets costs one set slot per
+    tweet rather than a dict per engagement. Indexes are reference counted:
+    every set or leaderboard holding one takes a reference and releases it
+    when it drops the user. Unreferenced users are forgotten and their
+    indexes reused, so the directory follows live tweets and leaderboards
+    rather than every user ever seen.
+    """
+
+    def __init__(self):
+        """Initialize directory"""
+        self._index = {}  # user_id -> index
+        self._ids = array('Q')  # index -> user_id
+        self._names = []  # index -> username, or None if unknown
+        self._refs = array('I')  # index -> references held
+        self._free = []  # Indexes of forgotten users, reused first
+
+    def __len__(self):
+        """Get number of users referenced"""
+        return len(self._index)
+
+    def find(self, user_id):
+        """Get a user's index, or None if the user isn't referenced"""
+        return self._index.get(user_id)
+
+    def add(self, user_id, username=None):
+        """Get a user's index, adding the user if new, and take a reference to it"""
+        index = self._index.get(user_id)
+        if index is None:
+            if self._free:
+                index = self._free.pop()
+                self._ids[index], self._names[index] = user_id, username
+            else:
+                index = len(self._ids)
+                self._ids.append(user_id)
+                self._names.append(username)
+                self._refs.append(0)
+            self._index[user_id] = index
+        elif username:
+            self._names[index] = username
+        self._refs[index] += 1
+        return index
+
+    def hold(self, index):
+        """Take another reference to an interned user"""
+        self._refs[index] += 1
+
+    def release(self, index):
+        """Drop a reference to an interned user, forgetting the user after the last one"""
+        self._refs[index] -= 1
+        if not self._refs[index]:
+            del self._index[self._ids[index]]
+            self._names[index] = None
+            self._free.append(index)
+
+    def user_id(self, index):
+        """Get an interned user's Twitter ID"""
+        return self._ids[index]
+
+    def username(self, index):
+        """Get an interned user's handle, or None if unknown"""
+        return self._names[index]
+
+class EngagerCursor:
+    """Sync state of one metric's engagers on one tweet.
+
+    Engager lists are scanned newest first. Reply scans end at the
+    previous scan's newest reply (via since_id). Likes and retweets can't
+    be listed from a point, so their scans skip users already seen (a user
+    who unlikes and likes again moves to the top) and end once they have
+    credited as many users as the count grew, or on reaching
+    ENGAGER_BASELINE_KEEP seen users in a row, or on a page with no new
+    users. A scan cut short by the page cap or the budget resumes from
+    token.
+    """
+
+    __slots__ = ('engaged', 'seen', 'token', 'since_id', 'newest_id', 'synced', 'scan_count')
+
+    def __init__(self, baseline):
+        """Initialize cursor, baseline is the public count when tracking started"""
+        self.engaged = _EMPTY  # Interned users credited with an engagement
+        self.seen = ()  # A few newest interned users who engaged before tracking started
+        self.token = None  # Pagination token of the unfinished scan
+        self.since_id = None  # Newest reply ID covered by the last finished scan
+        self.newest_id = None  # Newest reply ID of the scan in progress
+        self.synced = None  # Public count covered so far, None until the baseline scan
+        self.scan_count = baseline  # Public count when the scan in progress started
+
+    def knows(self, index):
+        """Check whether a user has been seen engaging"""
+        return index in self.engaged or index in self.seen
+
+    def add(self, index, credited):
+        """Add a user to the credited or the pre-tracking engagers"""
+        if credited:
+            if self.engaged is _EMPTY:
+                self.engaged = set()
+            self.engaged.add(index)
+        else:
+            self.seen += (index,)
+
+class EngagerTracker:
+    """Tracks which users liked, retweeted and replied to raided tweets.
+
+    Every ENGAGER_SYNC_INTERVAL, each tracked tweet whose public counts grew
+    since its last sync (or whose last scan is unfinished) fetches only its
+    new engagers, so upstream calls follow new engagements rather than
+    totals. The first scan of a tweet is a baseline: the newest page only,
+    crediting as many users as the count grew since tracking started.
+    Pages are paced against each engager endpoint's rate-limit budget.
+
+    Counts are approximate: unlikes during a raid hide as many new likes
+    from the count, and users Twitter doesn't list (protected accounts)
+    are never credited.
+    """
+
+    def __init__(self, twitter_api, scheduler, store, on_engaged):
+        """Initialize tracker
+
+        store: RaidStore the sync state and engagers are written behind to
+        on_engaged: function called as on_engaged(tweet_id, metric, users)
+            with newly credited interned users
+        """
+        self.twitter_api = twitter_api
+        self.scheduler = scheduler
+        self.store = store
+        self._on_engaged = on_engaged
+        self.users = UserDirectory()
+        self._tweets = {}  # tweet_id -> {metric: EngagerCursor}
+        self._counts = {}  # tweet_id -> latest public metrics
+        self._credit = {}  # endpoint -> page requests earned from the budget
+        self._last_sync = clock.monotonic()
+        self.page_requests = 0  # Engager pages fetched so far
+        self.credited = 0  # Engagements credited so far
+
+    def __len__(self):
+        """Get number of tracked tweets"""
+        return len(self._tweets)
+
+    def start(self):
+        """Start the periodic engager sync"""
+        self.scheduler.schedule(('engager_sync',), ENGAGER_SYNC_INTERVAL, self.sync)
+
+    def track(self, tweet_id, metrics):
+        """Start tracking a tweet's engagers from its current public metrics
+
+        Tweets already tracked (or restored) keep their state.
+        """
+        if not self.twitter_api.engager_endpoints:
+            return
+        cursors = self._tweets.setdefault(tweet_id, {})
+        for metric in self.twitter_api.engager_endpoints:
+            if metric not in cursors:
+                cursors[metric] = EngagerCursor(metrics[metric])
+        if not self._counts.get(tweet_id):
+            self._counts[tweet_id] = metrics
+
+    def observe(self, tweet_id, metrics):
+        """Note a tracked tweet's latest public metrics"""
+        if tweet_id in self._counts:
+            self._counts[tweet_id] = metrics
+
+    def release(self, tweet_id):
+        """Stop tracking a tweet and drop its engagers"""
+        cursors = self._tweets.pop(tweet_id, None)
+        if cursors is not None:
+            del self._counts[tweet_id]
+            for cursor in cursors.values():
+                for index in (*cursor.engaged, *cursor.seen):
+                    self.users.release(index)
+            self.store.drop_engagers(tweet_id)
+
+    def restore(self, cursor_rows, engager_rows, tweet_ids):
+        """Resume tracking from stored state, for the tweets in tweet_ids
+
+        Stored state of other tweets is deleted.
+        """
+        for tweet_id, metric, token, since_id, newest_id, synced, scan_count in cursor_rows:
+            if tweet_id not in tweet_ids or metric not in self.twitter_api.engager_endpoints:
+                self.store.drop_engagers(tweet_id)
+                continue
+            cursor = self._tweets.setdefault(tweet_id, {}).setdefault(metric, EngagerCursor(scan_count))
+            cursor.token, cursor.since_id, cursor.newest_id, cursor.synced = token, since_id, newest_id, synced
+        for tweet_id, metric, user_id, username, credited in engager_rows:
+            cursor = self._tweets.get(tweet_id, {}).get(metric)
+            index = self.users.find(user_id)
+            if cursor is not None and (index is None or not cursor.knows(index)):
+                cursor.add(self.users.add(user_id, username), credited)
+        for tweet_id in self._tweets:
+            self._counts.setdefault(tweet_id, {})  # Until track() or the next poll
+
+    def leaderboard(self, tweet_id, limit):
+        """Get a tweet's top engagers as dicts, by ENGAGEMENT_POINTS"""
+        scores, engaged = {}, {}
+        for metric, cursor in self._tweets.get(tweet_id, {}).items():
+            points = ENGAGEMENT_POINTS[metric]
+            for index in cursor.engaged:
+                scores[index] = scores.get(index, 0) + points
+                engaged.setdefault(index, []).append(metric)
+        return [
+            {
+                'user_id': self.users.user_id(index),
+                'username': self.users.username(index),
+                'points': points,
+                'engaged': engaged[index]
+            }
+            for index, points in heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        ]
+
+    def get_stats(self):
+        """Get tracker stats"""
+        return {
+            'tweets': len(self._tweets),
+            'users': len(self.users),
+            'page_requests': self.page_requests,
+            'credited': self.credited
+        }
+
+    async def sync(self):
+        """Fetch new engagers of every tweet whose counts grew, then reschedule"""
+        try:
+            now = clock.monotonic()
+            elapsed, self._last_sync = now - self._last_sync, now
+            for endpoint in set(self.twitter_api.engager_endpoints.values()):
+                self._refill(endpoint, elapsed)
+
+            # Tweets with the most new engagements first, while the budget lasts
+            due = []
+            for tweet_id, cursors in self._tweets.items():
+                for metric, cursor in cursors.items():
+                    backlog = self._backlog(tweet_id, metric, cursor)
+                    if backlog:
+                        due.append((backlog, tweet_id, metric))
+            due.sort(key=lambda entry: entry[0], reverse=True)
+            await asyncio.gather(*(self._sync_cursor(tweet_id, metric) for _, tweet_id, metric in due))
+        except Exception as e:
+            logger.error("Error syncing engagers: %s", e)
+        finally:
+            self.scheduler.schedule(('engager_sync',), ENGAGER_SYNC_INTERVAL, self.sync)
+
+    def _backlog(self, tweet_id, metric, cursor):
+        """Get how many engagements a cursor is behind (a scan in progress counts as one at least)"""
+        count = self._counts[tweet_id].get(metric, 0)
+        if cursor.synced is None:
+            return max(count - cursor.scan_count, 1)
+        if cursor.token is not None:
+            return max(count - cursor.synced, 1)
+        return max(count - cursor.synced, 0)
+
+    def _refill(self, endpoint, elapsed):
+        """Add the page requests an endpoint's budget allows over elapsed seconds"""
+        budget = self.twitter_api.budget
+        allowance = budget.allowance(endpoint, elapsed)
+        if allowance is None:
+            self._credit[endpoint] = 1.0  # Budget unknown until a response reports it, one page finds out
+            return
+        self._credit[endpoint] = min(self._credit.get(endpoint, 0.0) + allowance, budget.usable(endpoint) or 0)
+
+    def _spend(self, endpoint):
+        """Take one page request from an endpoint's credit, False if there is none"""
+        if self._credit.get(endpoint, 0.0) < 1:
+            return False
+        self._credit[endpoint] -= 1
+        return True
+
+    async def _sync_cursor(self, tweet_id, metric):
+        """Scan a tweet's newest engagers of one metric down to the ones already known"""
+        cursor = self._tweets.get(tweet_id, {}).get(metric)
+        if cursor is None:
+            return  # Released while other scans of this sync ran
+        endpoint = self.twitter_api.engager_endpoints[metric]
+        count = self._counts[tweet_id].get(metric, 0)
+        baseline = cursor.synced is None
+        if not baseline and cursor.token is None:
+            cursor.scan_count = count  # A new scan starts
+
+        known_run = 0  # Known users in a row, carried across pages
+        for _ in range(ENGAGER_MAX_PAGES):
+            if not self._spend(endpoint):
+                break
+            self.page_requests += 1
+            since_id = cursor.since_id if metric == 'comments' else None
+            page = await self.twitter_api.get_engagers(tweet_id, metric, cursor.token, since_id)
+            if page is None or self._tweets.get(tweet_id, {}).get(metric) is not cursor:
+                return  # Failed, retried next sync, or released meanwhile
+            users, next_token, newest_id = page
+            if cursor.token is None and newest_id:
+                cursor.newest_id = newest_id
+
+            if baseline:
+                # Only the newest page, crediting the engagements since tracking started.
+                # A few older engagers are kept for later scans to stop at; replies
+                # need none since since_id marks where they stop.
+                fresh = max(count - cursor.scan_count, 0)
+                keep = 0 if metric == 'comments' else ENGAGER_BASELINE_KEEP
+                self._record(tweet_id, metric, cursor, users[:fresh], users[fresh:fresh + keep])
+                next_token = None
+            elif metric == 'comments':
+                self._record(tweet_id, metric, cursor, users)
+            else:
+                fresh, known_run, done = self._scan_page(cursor, users, known_run)
+                self._record(tweet_id, metric, cursor, fresh)
+                cursor.synced = min(cursor.synced + len(fresh), cursor.scan_count)
+                if done:
+                    next_token = None
+            cursor.token = next_token
+            if next_token is None:
+                cursor.synced = count if baseline else cursor.scan_count
+                if cursor.newest_id:
+                    cursor.since_id, cursor.newest_id = cursor.newest_id, None
+                break
+
+        self.store.save_engager_cursor((
+            tweet_id, metric, cursor.token, cursor.since_id, cursor.newest_id, cursor.synced, cursor.scan_count
+        ))
+
+    def _scan_page(self, cursor, users, known_run):
+        """Pick the new users of a likes or retweets page, newest first
+
+        Returns (users to credit, known users in a row at the page's end,
+        whether the scan is done).
+        """
+        fresh, wanted = [], cursor.scan_count - cursor.synced
+        for user_id, username in users:
+            if len(fresh) >= wanted:
+                return fresh, known_run, True
+            index = self.users.find(user_id)
+            if index is not None and cursor.knows(index):
+                known_run += 1
+                if known_run >= ENGAGER_BASELINE_KEEP:
+                    return fresh, known_run, True  # Reached the users synced before
+            else:
+                known_run = 0
+                fresh.append((user_id, username))
+        return fresh, known_run, not fresh
+
+    def _record(self, tweet_id, metric, cursor, credited, seen=()):
+        """Add (user_id, username) engagers, skipping the ones already known"""
+        new, rows, usernames = [], [], {}
+        for users, is_credited in ((credited, 1), (seen, 0)):
+            for user_id, username in users:
+                index = self.users.find(user_id)
+                if index is not None and cursor.knows(index):
+                    continue
+                index = self.users.add(user_id, username)
+                cursor.add(index, is_credited)
+                rows.append((tweet_id, metric, user_id, is_credited))
+                if username:
+                    usernames[user_id] = username
+                if is_credited:
+                    new.append(index)
+        if rows:
+            self.store.save_engagers(rows)
+            self.store.save_users(usernames)
+        if new:
+            self.credited += len(new)
+            self._on_engaged(tweet_id, metric, new)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Logging Setup
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Queued, structured logging for the bot.
+
+Loggers hand records to a QueueHandler, which only enqueues them; a
+QueueListener thread formats them (JSON lines or text) and writes them to
+stderr, so raid code never waits on log I/O or pays for formatting
+messages at call sites. Log calls use %-style arguments, which are only
+merged into the message on the listener thread.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def record_fields(record):
+    """Get the structured fields passed to a log call via extra="""
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        entry.update(record_fields(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Human-readable format, with structured fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record):
+        text = super().format(record)
+        fields = record_fields(record)
+        if fields:
+            text += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock QueueHandler formats every record before enqueueing it, on
+    the caller's thread. Records stay in this process, so only tracebacks
+    (which pin stack frames) are rendered up front.
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            record = copy.copy(record)
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class LogSampler:
+    """Lets through the first and then every Nth log line per key (e.g. raid)"""
+
+    def __init__(self, every):
+        """Initialize sampler logging one in every calls per key (1 logs everything)"""
+        self.every = max(every, 1)
+        self._counts = {}  # key -> calls since its last logged one
+
+    def should_log(self, key):
+        """Check whether this call for key should be logged"""
+        count = self._counts.get(key, 0)
+        self._counts[key] = (count + 1) % self.every
+        return count == 0
+
+    def discard(self, key):
+        """Forget a key once it won't be logged again"""
+        self._counts.pop(key, None)
+
+def parse_levels(spec):
+    """Parse 'logger=LEVEL,logger=LEVEL' into a dict"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def configure_logging(level=LOG_LEVEL, levels=LOG_LEVELS, fmt=LOG_FORMAT):
+    """Route all logging through a queue to a stderr-writing listener thread
+
+    level: root level; levels: per-logger overrides ('name=LEVEL,...');
+    fmt: 'json' or 'text'. Safe to call again, the previous setup is
+    replaced. Returns the running QueueListener.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            handler.listener.stop()
+            atexit.unregister(handler.listener.stop)
+        root.removeHandler(handler)
+
+    output = logging.StreamHandler()
+    output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    for name, logger_level in parse_levels(levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    handler.listener.start()
+    atexit.register(handler.listener.stop)
+    return handler.listener
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Event Loop Lag Monitor
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+logger = logging.getLogger(__name__)
+
+class LoopLagMonitor:
+    """Detects and reports event loop stalls.
+
+    A heartbeat coroutine wakes every interval and measures how late it
+    woke up. A watchdog thread checks the heartbeat too, so while the loop
+    is still stuck it can log the loop thread's stack, pointing at the
+    handler or callback that is blocking it.
+    """
+
+    def __init__(self, interval, threshold):
+        """Initialize monitor
+
+        interval: seconds between heartbeats
+        threshold: lag in seconds that counts as a stall
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stopped = threading.Event()
+
+        # Stats
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+
+    def start(self):
+        """Start the heartbeat and watchdog (call from the event loop thread)"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        """Stop the heartbeat and watchdog"""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    async def _beat(self):
+        """Record a heartbeat every interval and measure how late it is"""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.last_lag = max(now - expected, 0.0)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            if self.last_lag >= self.threshold:
+                self.stalls += 1
+                logger.warning("Event loop stalled for %.3fs", self.last_lag)
+
+    def _watch(self):
+        """Log the loop thread's stack while the loop is stalled (watchdog thread)"""
+        reported = None
+        while not self._stopped.wait(self.interval):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval
+            if stalled_for < self.threshold or reported == heartbeat:
+                continue
+            reported = heartbeat  # One stack per stall
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = ''.join(traceback.format_stack(frame, limit=8))
+            logger.warning("Event loop blocked for %.3fs so far, loop thread is at:\n%s", stalled_for, stack)
+
+    def get_stats(self):
+        """Get stall stats"""
+        return {'stalls': self.stalls, 'max_lag': self.max_lag, 'last_lag': self.last_lag}
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Shared Metrics Poller
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import logging
+import clock
+from config import (
+    POLL_BATCH_WINDOW,
+    TWITTER_BATCH_SIZE,
+    LOW_PRIORITY_THRESHOLD,
+    LOW_PRIORITY_MAX_SLOWDOWN
+)
+
+logger = logging.getLogger(__name__)
+
+class MetricsPoller:
+    """Polls each raided tweet once per interval and fans the result out.
+
+    Raids subscribe by tweet ID; the subscription set doubles as the
+    reference count, so polling for a tweet stops as soon as the last raid
+    on it unsubscribes. Tweets that fall due within the same batch window
+    are collected and looked up together, up to TWITTER_BATCH_SIZE per
+    request.
+
+    Each tweet is polled at the shortest cadence any of its raids asks for.
+    Lookups are paced against the Twitter rate-limit budget: when there is
+    not enough budget for every due tweet, the highest-priority tweets are
+    polled first and the rest wait for the next credit. Low-priority tweets
+    are also polled less often as the window gets used up.
+    """
+
+    def __init__(self, twitter_api, scheduler, on_metrics, interval, priority=None, cadence=None):
+        """Initialize poller
+
+        on_metrics: coroutine function called as on_metrics(raid_id, metrics)
+        interval: default seconds between polls of a tweet
+        priority: function called as priority(raid_id), returning 0.0 - 1.0
+        cadence: function called as cadence(raid_id), returning the seconds
+            the raid wants between polls
+        """
+        self.twitter_api = twitter_api
+        self.scheduler = scheduler
+        self.interval = interval
+        self._on_metrics = on_metrics
+        self._priority = priority or (lambda raid_id: 1.0)
+        self._cadence = cadence or (lambda raid_id: interval)
+        self._subscribers = {}  # tweet_id -> set of raid_ids
+        self._intervals = {}  # tweet_id -> effective seconds until its next poll
+        self._due = set()  # Tweets waiting for the next batch lookup
+        self._poll_rate = 0.0  # Tweet polls per second at the current intervals
+        self._credit = 0.0  # Lookup requests earned from the rate-limit budget
+        self._last_collect = clock.monotonic()
+        self.batch_requests = 0  # Lookup requests issued so far
+        self.deferred_polls = 0  # Due tweets held back for lack of budget
+
+    def subscribe(self, tweet_id, raid_id):
+        """Subscribe a raid to a tweet's metrics, starting polling if needed"""
+        raids = self._subscribers.setdefault(tweet_id, set())
+        raids.add(raid_id)
+        if len(raids) == 1:
+            self._schedule_poll(tweet_id, self.interval)
+            logger.info("Started polling tweet %s", tweet_id)
+
+    def unsubscribe(self, tweet_id, raid_id):
+        """Drop a raid's subscription, stopping polling after the last one"""
+        raids = self._subscribers.get(tweet_id)
+        if raids is None:
+            return
+        raids.discard(raid_id)
+        if not raids:
+            del self._subscribers[tweet_id]
+            interval = self._intervals.pop(tweet_id, None)
+            if interval:
+                self._poll_rate -= 1 / interval
+            self._due.discard(tweet_id)
+            self.scheduler.cancel(('poll', tweet_id))
+            logger.info("Stopped polling tweet %s", tweet_id)
+
+    def subscriber_count(self, tweet_id=None):
+        """Get number of raids subscribed to a tweet, or to all tweets"""
+        if tweet_id is not None:
+            return len(self._subscribers.get(tweet_id, ()))
+        return sum(len(raids) for raids in self._subscribers.values())
+
+    def polled_tweet_count(self):
+        """Get number of tweets currently being polled"""
+        return len(self._subscribers)
+
+    def poll_interval(self, tweet_id):
+        """Get the effective seconds between polls of a tweet, or None if not polled"""
+        return self._intervals.get(tweet_id)
+
+    def budget_utilization(self):
+        """Get polling demand as a share of the lookup budget's rate
+
+        Above 1.0 polls are being deferred; 0.0 while the budget is unknown.
+        """
+        rate = self.twitter_api.budget.allowance(self.twitter_api.lookup_endpoint, 1)
+        if rate is None:
+            return 0.0
+        demand = max(self._poll_rate, 0) / TWITTER_BATCH_SIZE
+        if not rate:
+            return 1.0 if demand else 0.0
+        return demand / rate
+
+    def tweet_priority(self, tweet_id):
+        """Get a tweet's poll priority, the highest of its raids' priorities"""
+        return max((self._priority(raid_id) for raid_id in self._subscribers.get(tweet_id, ())), default=0.0)
+
+    def _next_interval(self, tweet_id, priority):
+        """Get the poll interval for a tweet, stretched for low priority under pressure"""
+        interval = min((self._cadence(raid_id) for raid_id in self._subscribers[tweet_id]), default=self.interval)
+        if priority >= LOW_PRIORITY_THRESHOLD:
+            return interval
+        pressure = self.twitter_api.budget.pressure(self.twitter_api.lookup_endpoint)
+        return interval * (1 + (LOW_PRIORITY_MAX_SLOWDOWN - 1) * pressure)
+
+    def _schedule_poll(self, tweet_id, interval):
+        """Schedule a tweet's next poll"""
+        previous = self._intervals.get(tweet_id)
+        self._poll_rate += 1 / interval - (1 / previous if previous else 0)
+        self._intervals[tweet_id] = interval
+        self.scheduler.schedule(('poll', tweet_id), interval, self._mark_due, tweet_id)
+
+    def _batch_allowance(self, wanted):
+        """Get how many lookup requests may be spent now, up to wanted"""
+        now = clock.monotonic()
+        elapsed, self._last_collect = now - self._last_collect, now
+
+        budget, endpoint = self.twitter_api.budget, self.twitter_api.lookup_endpoint
+        allowance = budget.allowance(endpoint, elapsed)
+        if allowance is None:
+            self._credit = 0.0
+            return wanted  # Budget unknown until the first response
+
+        self._credit = min(self._credit + allowance, budget.usable(endpoint) or 0)
+        allowed = min(int(self._credit), wanted)
+        self._credit -= allowed
+        return allowed
+
+    async def _mark_due(self, tweet_id):
+        """Queue a tweet for the next batch lookup"""
+        if tweet_id not in self._subscribers:
+            return
+        self._due.add(tweet_id)
+        if not self.scheduler.is_scheduled(('collect',)):
+            self.scheduler.schedule(('collect',), POLL_BATCH_WINDOW, self._collect)
+
+    async def _collect(self):
+        """Look up due tweets in batches and deliver metrics to their raids"""
+        if not self._due:
+            return
+
+        # Spend the available budget on the highest-priority tweets first
+        priorities = {tweet_id: self.tweet_priority(tweet_id) for tweet_id in self._due}
+        due = sorted(priorities, key=priorities.get, reverse=True)
+        wanted = -(-len(due) // TWITTER_BATCH_SIZE)
+        allowed = self._batch_allowance(wanted)
+        polled = due[:allowed * TWITTER_BATCH_SIZE]
+        self._due.difference_update(polled)
+
+        if self._due:
+            # Hold the rest until the budget earns another request
+            self.deferred_polls += len(self._due)
+            logger.warning("Rate limit budget low, deferring %s tweet poll(s)", len(self._due))
+            self.scheduler.schedule(('collect',), max(POLL_BATCH_WINDOW, self._credit_wait()), self._collect)
+
+        if not polled:
+            return
+
+        batches = [polled[i:i + TWITTER_BATCH_SIZE] for i in range(0, len(polled), TWITTER_BATCH_SIZE)]
+        logger.info("Polling %s tweets in %s batch(es)", len(polled), len(batches))
+        try:
+            await asyncio.gather(*(self._poll_batch(batch) for batch in batches))
+        finally:
+            # Keep polling every tweet that still has subscribers
+            for tweet_id in polled:
+                if tweet_id in self._subscribers:
+                    self._schedule_poll(tweet_id, self._next_interval(tweet_id, priorities[tweet_id]))
+
+    def _credit_wait(self):
+        """Get seconds until the budget earns one more lookup request"""
+        budget, endpoint = self.twitter_api.budget, self.twitter_api.lookup_endpoint
+        rate = budget.allowance(endpoint, 1)
+        if not rate:
+            return budget.reset_in(endpoint) or self.interval
+        return max((1 - self._credit) / rate, 0)
+
+    async def _poll_batch(self, tweet_ids):
+        """Fetch one batch of tweets and fan the metrics out to subscribers"""
+        self.batch_requests += 1
+        results = await self.twitter_api.get_tweet_metrics_batch(tweet_ids) or {}
+
+        deliveries = []
+        for tweet_id, metrics in results.items():
+            for raid_id in list(self._subscribers.get(tweet_id, ())):
+                deliveries.append(self._on_metrics(raid_id, metrics))
+        await asyncio.gather(*deliveries)
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Tweet Metrics Providers
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import logging
+import random
+import tweepy
+import clock
+from monitoring import observe_twitter_request
+from config import (
+    TWITTER_API_KEY,
+    TWITTER_API_SECRET,
+    TWITTER_ACCESS_TOKEN,
+    TWITTER_ACCESS_SECRET,
+    TWITTER_BEARER_TOKEN,
+    MOCK_RATE_LIMIT,
+    ENGAGER_PAGE_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+# Standard Twitter rate-limit window
+RATE_LIMIT_WINDOW = 15 * 60  # seconds
+
+# Returned by get_tweet_metrics() for deleted, private or nonexistent tweets
+UNAVAILABLE = object()
+
+# Simulated users engaging with mock tweets
+MOCK_USER_BASE = 10 ** 9
+MOCK_USER_POOL = 2000
+METRIC_SALT = {'likes': 0, 'retweets': 101, 'comments': 211}  # Spread each metric's users over the pool
+
+def _http_status(error=None):
+    """Get the HTTP status of a request that raised error (None if it succeeded)"""
+    if error is None:
+        return '200'
+    response = getattr(error, 'response', None)
+    # requests responses (v1.1) have status_code, aiohttp responses (v2) have status
+    status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+    return str(status) if status else 'error'
+
+class MetricsProvider:
+    """Base class for tweet metrics backends.
+
+    Every method is a coroutine. Metrics are dicts with 'likes', 'retweets'
+    and 'comments'; failures are logged and reported as None (or left out
+    of batch results) rather than raised, while tweets that don't exist or
+    can't be seen are reported as UNAVAILABLE. Each provider records its
+    rate-limit windows in the shared budget, keyed by its own endpoints.
+    """
+
+    name = None
+    lookup_endpoint = None  # Budget key for batch lookups
+    show_endpoint = None  # Budget key for single-tweet calls
+    engager_endpoints = {}  # Metric -> budget key for engager pages, empty if not supported
+
+    def __init__(self, budget):
+        """Initialize provider with the shared rate-limit budget"""
+        self.budget = budget
+
+    async def get_tweet_metrics(self, tweet_id):
+        """Get current metrics for a tweet, UNAVAILABLE, or None if they can't be fetched"""
+        raise NotImplementedError
+
+    async def get_tweet_metrics_batch(self, tweet_ids):
+        """Get current metrics for up to TWITTER_BATCH_SIZE tweets, keyed by tweet ID
+
+        Tweets that can't be seen (deleted, private or nonexistent) are left
+        out of the result. Returns None if the lookup itself failed.
+        """
+        raise NotImplementedError
+
+    async def get_engagers(self, tweet_id, metric, token=None, since_id=None):
+        """Get one page of the users behind a metric ('likes', 'retweets' or 'comments')
+
+        Pages run newest first; token continues a scan where the previous
+        page ended. Comments are replies, and since_id limits them to
+        replies newer than that ID. Returns (users, next_token, newest_id)
+        where users are (user_id, username) tuples and newest_id is the
+        newest reply's ID, or None if the page can't be fetched.
+        """
+        raise NotImplementedError
+
+    def release(self, tweet_id):
+        """Drop any per-tweet state once a tweet is no longer raided"""
+
+    def _observe_request(self, endpoint, started, error=None):
+        """Record a finished API request that started at clock.monotonic() started"""
+        observe_twitter_request(endpoint, _http_status(error), clock.monotonic() - started)
+
+    async def close(self):
+        """Release the provider's connections"""
+
+class MockMetricsProvider(MetricsProvider):
+    """Simulated metrics for development without Twitter API credentials"""
+
+    name = 'mock'
+    lookup_endpoint = 'statuses/lookup'
+    show_endpoint = 'statuses/show'
+    engager_endpoints = {
+        'likes': 'tweets/:id/liking_users',
+        'retweets': 'tweets/:id/retweeted_by',
+        'comments': 'tweets/search/recent'
+    }
+
+    def __init__(self, budget):
+        """Initialize mock provider"""
+        super().__init__(budget)
+        self._mock_metrics_store = {}  # Store for mock metrics
+        self._mock_counts = {}  # tweet_id -> last metrics returned, sizes the engager lists
+        self._mock_rate_windows = {}  # endpoint -> [reset_time, remaining]
+        self.rate_limit = MOCK_RATE_LIMIT  # Simulated requests per window, per endpoint
+        logger.info("Running in MOCK MODE - Twitter API calls will be simulated")
+
+    def _consume_mock_request(self, endpoint):
+        """Simulate Twitter's rate-limit window"""
+        now = clock.time()
+        window = self._mock_rate_windows.get(endpoint)
+        if window is None or now >= window[0]:
+            window = self._mock_rate_windows[endpoint] = [now + RATE_LIMIT_WINDOW, self.rate_limit]
+        if window[1] <= 0:
+            self.budget.mark_exhausted(endpoint, window[0])
+            observe_twitter_request(endpoint, '429', 0.0)
+            return False
+        window[1] -= 1
+        observe_twitter_request(endpoint, '200', 0.0)
+        self.budget.update_from_headers(endpoint, {
+            'x-rate-limit-limit': self.rate_limit,
+            'x-rate-limit-remaining': window[1],
+            'x-rate-limit-reset': window[0]
+        })
+        return True
+
+    async def get_tweet_metrics(self, tweet_id):
+        """Get mock metrics for a tweet"""
+        if not self._consume_mock_request(self.show_endpoint):
+            return None
+        metrics = self._mock_counts[tweet_id] = self._get_mock_metrics(tweet_id)
+        return metrics
+
+    async def get_tweet_metrics_batch(self, tweet_ids):
+        """Get mock metrics for several tweets in one simulated request"""
+        if not self._consume_mock_request(self.lookup_endpoint):
+            return None
+        results = {tweet_id: self._get_mock_metrics(tweet_id) for tweet_id in tweet_ids}
+        self._mock_counts.update(results)
+        return results
+
+    async def get_engagers(self, tweet_id, metric, token=None, since_id=None):
+        """Get one page of simulated engagers, as many as the tweet's last metrics
+
+        Engagement i (oldest first) is by a user drawn from a shared pool, so
+        raiders recur across tweets; replies have IDs 1, 2, ... per tweet.
+        """
+        if not self._consume_mock_request(self.engager_endpoints[metric]):
+            return None
+        count = self._mock_counts.get(tweet_id, {}).get(metric, 0)
+        oldest = int(since_id) if since_id else 0
+        start = count - 1 - int(token or 0)  # Newest engagement on this page
+        stop = max(start - ENGAGER_PAGE_SIZE, oldest - 1)
+        salt = int(tweet_id) + METRIC_SALT[metric]
+        users = [
+            (MOCK_USER_BASE + (i * 7919 + salt) % MOCK_USER_POOL, f"raider{(i * 7919 + salt) % MOCK_USER_POOL}")
+            for i in range(start, stop, -1)
+        ]
+        next_token = str(int(token or 0) + ENGAGER_PAGE_SIZE) if stop >= oldest else None
+        newest_id = str(count) if metric == 'comments' and count > oldest else None
+        return users, next_token, newest_id
+
+    def release(self, tweet_id):
+        """Forget a tweet's simulated metrics"""
+        self._mock_metrics_store.pop(tweet_id, None)
+        self._mock_counts.pop(tweet_id, None)
+
+    def _get_mock_metrics(self, tweet_id):
+        """Generate mock metrics for testing without Twitter API"""
+        # Initialize if this is the first call for this tweet
+        if tweet_id not in self._mock_metrics_store:
+            self._mock_metrics_store[tweet_id] = {
+                'likes': random.randint(5, 15),
+                'retweets': random.randint(2, 8),
+                'comments': random.randint(1, 5),
+                'last_update': clock.time(),
+                'update_count': 0
+            }
+            logger.debug("Initialized mock metrics for tweet %s: %s", tweet_id, self._mock_metrics_store[tweet_id])
+            return {
+                'likes': self._mock_metrics_store[tweet_id]['likes'],
+                'retweets': self._mock_metrics_store[tweet_id]['retweets'],
+                'comments': self._mock_metrics_store[tweet_id]['comments']
+            }
+
+        # Update metrics based on time elapsed since last update
+        current_time = clock.time()
+        update_count = self._mock_metrics_store[tweet_id]['update_count'] + 1
+
+        # More frequent updates in the beginning, slower over time
+        if update_count < 5:
+            like_increase = random.randint(3, 7)
+            rt_increase = random.randint(1, 3)
+            comment_increase = random.randint(1, 2)
+        elif update_count < 10:
+            like_increase = random.randint(2, 5)
+            rt_increase = random.randint(1, 2)
+            comment_increase = random.randint(0, 1)
+        else:
+            like_increase = random.randint(1, 3)
+            rt_increase = random.randint(0, 1)
+            comment_increase = random.randint(0, 1)
+
+        # Update the stored metrics
+        self._mock_metrics_store[tweet_id]['likes'] += like_increase
+        self._mock_metrics_store[tweet_id]['retweets'] += rt_increase
+        self._mock_metrics_store[tweet_id]['comments'] += comment_increase
+        self._mock_metrics_store[tweet_id]['last_update'] = current_time
+        self._mock_metrics_store[tweet_id]['update_count'] = update_count
+
+        # Log the updated metrics
+        logger.debug("Updated mock metrics for tweet %s: %s", tweet_id, self._mock_metrics_store[tweet_id])
+
+        # Return the current metrics
+        return {
+            'likes': self._mock_metrics_store[tweet_id]['likes'],
+            'retweets': self._mock_metrics_store[tweet_id]['retweets'],
+            'comments': self._mock_metrics_store[tweet_id]['comments']
+        }
+
+class V1MetricsProvider(MetricsProvider):
+    """Twitter API v1.1 backend using tweepy's blocking API client.
+
+    Calls run on worker threads via run_blocking. v1.1 statuses don't carry
+    a reply count, so comments are always reported as 0, and engagers
+    aren't tracked; use the v2 provider for comment targets and leaderboards.
+    """
+
+    name = 'v1'
+    lookup_endpoint = 'statuses/lookup'
+    show_endpoint = 'statuses/show'
+
+    def __init__(self, budget, run_blocking=None):
+        """Initialize v1.1 provider
+
+        run_blocking: coroutine function used to call the blocking client,
+        defaults to asyncio.to_thread
+        """
+        super().__init__(budget)
+        self._run_blocking = run_blocking or asyncio.to_thread
+        self.api = self._setup_api()
+        logger.warning("Using Twitter API v1.1 - comment counts are not available, use METRICS_PROVIDER=v2")
+
+    def _setup_api(self):
+        """Set up and return Twitter API client"""
+        try:
+            auth = tweepy.OAuth1UserHandler(
+                TWITTER_API_KEY,
+                TWITTER_API_SECRET,
+                TWITTER_ACCESS_TOKEN,
+                TWITTER_ACCESS_SECRET
+            )
+            return tweepy.API(auth)
+        except Exception as e:
+            logger.error("Error setting up Twitter API: %s", e)
+            return None
+
+    def _record_rate_limit(self, endpoint, response=None):
+        """Update the request budget from the last response's headers"""
+        if response is None:
+            response = getattr(self.api, 'last_response', None)
+        if response is not None:
+            self.budget.update_from_headers(endpoint, response.headers)
+
+    def _handle_api_error(self, endpoint, error):
+        """Record rate-limit hits reported by a failed request"""
+        if isinstance(error, tweepy.TooManyRequests):
+            self.budget.mark_exhausted(
+                endpoint, error.response.headers.get('x-rate-limit-reset')
+            )
+        elif isinstance(error, tweepy.HTTPException):
+            self._record_rate_limit(endpoint, error.response)
+
+    @staticmethod
+    def _status_metrics(status):
+        """Convert a v1.1 status to metrics"""
+        return {
+            'likes': status.favorite_count,
+            'retweets': status.retweet_count,
+            'comments': 0
+        }
+
+    def _get_status(self, tweet_id):
+        """Fetch a status, recording the rate limit (blocking)"""
+        started = clock.monotonic()
+        try:
+            status = self.api.get_status(tweet_id)
+        except Exception as e:
+            self._observe_request(self.show_endpoint, started, e)
+            self._handle_api_error(self.show_endpoint, e)
+            raise
+        self._observe_request(self.show_endpoint, started)
+        self._record_rate_limit(self.show_endpoint)
+        return status
+
+    def _lookup_statuses(self, tweet_ids):
+        """Fetch statuses in one lookup, recording the rate limit (blocking)"""
+        started = clock.monotonic()
+        try:
+            statuses = self.api.lookup_statuses(tweet_ids, trim_user=True)
+        except Exception as e:
+            self._observe_request(self.lookup_endpoint, started, e)
+            self._handle_api_error(self.lookup_endpoint, e)
+            raise
+        self._observe_request(self.lookup_endpoint, started)
+        self._record_rate_limit(self.lookup_endpoint)
+        return statuses
+
+    async def get_tweet_metrics(self, tweet_id):
+        """Get current metrics for a tweet, UNAVAILABLE, or None if they can't be fetched"""
+        try:
+            return self._status_metrics(await self._run_blocking(self._get_status, tweet_id))
+        except (tweepy.NotFound, tweepy.Forbidden) as e:
+            logger.warning("Tweet %s is unavailable: %s", tweet_id, e)
+            return UNAVAILABLE
+        except Exception as e:
+            logger.error("Error fetching tweet metrics: %s", e)
+            return None
+
+    async def get_tweet_metrics_batch(self, tweet_ids):
+        """Get current metrics for up to TWITTER_BATCH_SIZE tweets in one lookup"""
+        try:
+            statuses = await self._run_blocking(self._lookup_statuses, list(tweet_ids))
+        except Exception as e:
+            logger.error("Error fetching metrics for %s tweets: %s", len(tweet_ids), e)
+            return None
+        return {status.id_str: self._status_metrics(status) for status in statuses}
+
+
+class V2MetricsProvider(MetricsProvider):
+    """Twitter API v2 backend using tweepy's async client.
+
+    Requests public_metrics, so likes, retweets and replies come back in
+    one non-blocking call. Engagers come from the liking users, retweeters
+    and recent search (replies in the tweet's conversation) endpoints.
+    Needs tweepy's async extras (aiohttp).
+    """
+
+    name = 'v2'
+    lookup_endpoint = 'tweets'
+    show_endpoint = 'tweets/:id'
+    engager_endpoints = {
+        'likes': 'tweets/:id/liking_users',
+        'retweets': 'tweets/:id/retweeted_by',
+        'comments': 'tweets/search/recent'
+    }
+
+    def __init__(self, budget):
+        """Initialize v2 provider"""
+        super().__init__(budget)
+        from tweepy.asynchronous import AsyncClient
+        import aiohttp
+        self._aiohttp = aiohttp
+        # Raw responses, so the rate-limit headers can be read
+        self.client = AsyncClient(
+            bearer_token=TWITTER_BEARER_TOKEN,
+            consumer_key=TWITTER_API_KEY,
+            consumer_secret=TWITTER_API_SECRET,
+            access_token=TWITTER_ACCESS_TOKEN,
+            access_token_secret=TWITTER_ACCESS_SECRET,
+            return_type=aiohttp.ClientResponse
+        )
+        # App-only auth when a bearer token is configured, user context otherwise
+        self._user_auth = not TWITTER_BEARER_TOKEN
+
+    async def _request(self, endpoint, method, *args, **kwargs):
+        """Call a client method, recording the rate limit, returns the decoded payload"""
+        if self.client.session is None:
+            # One pooled session for every request
+            self.client.session = self._aiohttp.ClientSession()
+        started = clock.monotonic()
+        try:
+            response = await method(*args, user_auth=self._user_auth, **kwargs)
+        except Exception as e:
+            self._observe_request(endpoint, started, e)
+            if isinstance(e, tweepy.TooManyRequests):
+                self.budget.mark_exhausted(endpoint, e.response.headers.get('x-rate-limit-reset'))
+            elif isinstance(e, tweepy.HTTPException):
+                self.budget.update_from_headers(endpoint, e.response.headers)
+            raise
+        self._observe_request(endpoint, started)
+        self.budget.update_from_headers(endpoint, response.headers)
+        return await response.json()
+
+    async def _get_tweets(self, endpoint, tweet_ids):
+        """Look up tweets with public_metrics, returns (tweets, errors)"""
+        if endpoint == self.show_endpoint:
+            payload = await self._request(endpoint, self.client.get_tweet, tweet_ids[0], tweet_fields=['public_metrics'])
+        else:
+            payload = await self._request(endpoint, self.client.get_tweets, tweet_ids, tweet_fields=['public_metrics'])
+        data = payload.get('data') or []
+        if isinstance(data, dict):
+            data = [data]
+        return data, payload.get('errors') or []
+
+    @staticmethod
+    def _tweet_metrics(tweet):
+        """Convert a v2 tweet's public_metrics to metrics"""
+        public_metrics = tweet.get('public_metrics', {})
+        return {
+            'likes': public_metrics.get('like_count', 0),
+            'retweets': public_metrics.get('retweet_count', 0),
+            'comments': public_metrics.get('reply_count', 0)
+        }
+
+    async def get_tweet_metrics(self, tweet_id):
+        """Get current metrics for a tweet, UNAVAILABLE, or None if they can't be fetched"""
+        try:
+            tweets, errors = await self._get_tweets(self.show_endpoint, [tweet_id])
+        except (tweepy.NotFound, tweepy.Forbidden) as e:
+            logger.warning("Tweet %s is unavailable: %s", tweet_id, e)
+            return UNAVAILABLE
+        except Exception as e:
+            logger.error("Error fetching tweet metrics: %s", e)
+            return None
+        if not tweets:
+            # Deleted and protected tweets come back as errors in a 200 reply
+            logger.warning("Tweet %s is unavailable: %s", tweet_id, errors)
+            return UNAVAILABLE
+        return self._tweet_metrics(tweets[0])
+
+    async def get_tweet_metrics_batch(self, tweet_ids):
+        """Get current metrics for up to TWITTER_BATCH_SIZE tweets in one lookup"""
+        try:
+            tweets, _ = await self._get_tweets(self.lookup_endpoint, list(tweet_ids))
+        except Exception as e:
+            logger.error("Error fetching metrics for %s tweets: %s", len(tweet_ids), e)
+            return None
+        return {tweet['id']: self._tweet_metrics(tweet) for tweet in tweets}
+
+    async def get_engagers(self, tweet_id, metric, token=None, since_id=None):
+        """Get one page of the users behind a metric, newest first"""
+        endpoint = self.engager_endpoints[metric]
+        try:
+            if metric == 'likes':
+                payload = await self._request(
+                    endpoint, self.client.get_liking_users, tweet_id,
+                    max_results=ENGAGER_PAGE_SIZE, pagination_token=token
+                )
+            elif metric == 'retweets':
+                payload = await self._request(
+                    endpoint, self.client.get_retweeters, tweet_id,
+                    max_results=ENGAGER_PAGE_SIZE, pagination_token=token
+                )
+            else:
+                payload = await self._request(
+                    endpoint, self.client.search_recent_tweets, f'conversation_id:{tweet_id} is:reply',
+                    max_results=ENGAGER_PAGE_SIZE, next_token=token, since_id=since_id, expansions=['author_id']
+                )
+        except Exception as e:
+            logger.error("Error fetching %s engagers of tweet %s: %s", metric, tweet_id, e)
+            return None
+
+        meta = payload.get('meta') or {}
+        if metric == 'comments':
+            usernames = {user['id']: user['username'] for user in (payload.get('includes') or {}).get('users', [])}
+            users = [(int(reply['author_id']), usernames.get(reply['author_id'])) for reply in payload.get('data') or []]
+        else:
+            users = [(int(user['id']), user['username']) for user in payload.get('data') or []]
+        return users, meta.get('next_token'), meta.get('newest_id')
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self.client.session is not None:
+            await self.client.session.close()
+            self.client.session = None
+
+# Provider name -> class, for the METRICS_PROVIDER setting
+METRICS_PROVIDERS = {
+    MockMetricsProvider.name: MockMetricsProvider,
+    V1MetricsProvider.name: V1MetricsProvider,
+    V2MetricsProvider.name: V2MetricsProvider
+}
+
+def create_provider(name, budget, run_blocking=None):
+    """Create the metrics provider selected by name"""
+    if name not in METRICS_PROVIDERS:
+        raise ValueError(f"Unknown metrics provider {name!r}, use one of: {', '.join(METRICS_PROVIDERS)}")
+    if name == V1MetricsProvider.name:
+        return V1MetricsProvider(budget, run_blocking)
+    return METRICS_PROVIDERS[name](budget)
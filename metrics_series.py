@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Metrics Time Series
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+from array import array
+
+class MetricsSeries:
+    """Fixed-capacity ring buffer of timestamped metric samples.
+
+    Samples live in preallocated arrays (one for timestamps, one per
+    metric), so a raid's memory stays the same however long it runs; once
+    full, each new sample overwrites the oldest.
+    """
+
+    __slots__ = ('capacity', '_times', '_columns', '_head', '_count')
+
+    def __init__(self, capacity, metrics):
+        """Initialize an empty series of the named metrics, holding up to capacity samples"""
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._columns = {metric: array('I', bytes(4 * capacity)) for metric in metrics}
+        self._head = 0  # Index the next sample is written to
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, timestamp, metrics):
+        """Record a sample of metrics taken at timestamp (seconds)"""
+        i = self._head
+        self._times[i] = timestamp
+        for metric, column in self._columns.items():
+            column[i] = max(metrics[metric], 0)
+        self._head = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _index(self, age):
+        """Get the buffer index of the sample age steps before the newest"""
+        return (self._head - 1 - age) % self.capacity
+
+    def latest(self, metric):
+        """Get the newest value of a metric, or None if the series is empty"""
+        if not self._count:
+            return None
+        return self._columns[metric][self._index(0)]
+
+    def latest_time(self):
+        """Get the newest sample's timestamp, or None if the series is empty"""
+        if not self._count:
+            return None
+        return self._times[self._index(0)]
+
+    def velocity(self, metric, window):
+        """Get a metric's growth in units/second over the last window seconds
+
+        Measured between the newest sample and the oldest one inside the
+        window; None until two samples at least a second apart exist.
+        """
+        if self._count < 2:
+            return None
+        newest = self._index(0)
+        t_end = self._times[newest]
+        oldest = newest
+        for age in range(1, self._count):
+            i = self._index(age)
+            if t_end - self._times[i] > window:
+                break
+            oldest = i
+        elapsed = t_end - self._times[oldest]
+        if elapsed < 1:
+            return None
+        column = self._columns[metric]
+        return (column[newest] - column[oldest]) / elapsed
+
+    def eta(self, metric, target, window):
+        """Get projected seconds until a metric reaches target
+
+        Returns 0 if it already has, None if it isn't growing (or there is
+        not enough history to tell).
+        """
+        current = self.latest(metric)
+        if current is None:
+            return None
+        if current >= target:
+            return 0
+        velocity = self.velocity(metric, window)
+        if not velocity or velocity <= 0:
+            return None
+        return (target - current) / velocity
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Prometheus Metrics
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import functools
+import logging
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+import clock
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from cache hits up to slow API round trips
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Request status label for a successful call
+STATUS_OK = 'ok'
+
+ACTIVE_RAIDS = Gauge('raider_active_raids', 'Active raids per chat', ['chat_id'])
+ACTIVE_RAIDS_TOTAL = Gauge('raider_active_raids_total', 'Active raids in this process')
+RAID_OUTCOMES = Counter('raider_raid_outcomes_total', 'Raids ended, by outcome', ['outcome'])
+REFRESH_PRESSES = Counter('raider_refresh_presses_total', 'Refresh button presses, by how they were answered', ['result'])
+QUEUED_RAIDS = Gauge('raider_queued_raids', 'Raids waiting for admission')
+BACKPRESSURE = Gauge('raider_backpressure', 'Twitter/Telegram budget saturation used for admission (0-1)')
+POLLED_TWEETS = Gauge('raider_polled_tweets', 'Tweets with at least one raid polling them')
+OUTBOUND_QUEUE_DEPTH = Gauge('raider_outbound_queue_depth', 'Telegram operations waiting in the outbound queue')
+TWITTER_BUDGET_REMAINING = Gauge(
+    'raider_twitter_budget_remaining', 'Twitter requests left in the current rate-limit window', ['endpoint']
+)
+
+TELEGRAM_REQUESTS = Counter('raider_telegram_requests_total', 'Telegram Bot API calls', ['method', 'status'])
+TELEGRAM_LATENCY = Histogram(
+    'raider_telegram_request_seconds', 'Telegram Bot API call latency', ['method'], buckets=LATENCY_BUCKETS
+)
+TWITTER_REQUESTS = Counter('raider_twitter_requests_total', 'Twitter API requests', ['endpoint', 'status'])
+TWITTER_LATENCY = Histogram(
+    'raider_twitter_request_seconds', 'Twitter API request latency', ['endpoint'], buckets=LATENCY_BUCKETS
+)
+RATE_LIMIT_HITS = Counter('raider_rate_limit_hits_total', 'Rate-limit (429) replies received', ['service'])
+DEFERRED_POLLS = Counter('raider_deferred_polls_total', 'Due tweet polls held back for lack of Twitter budget')
+
+SCHEDULER_LAG = Histogram(
+    'raider_scheduler_lag_seconds', 'How late scheduled raid jobs start', buckets=LATENCY_BUCKETS
+)
+LOOP_LAG = Gauge('raider_event_loop_lag_seconds', 'Last measured event loop lag')
+LOOP_STALLS = Gauge('raider_event_loop_stalls', 'Event loop stalls seen since startup')
+
+HANDLER_REQUESTS = Counter('raider_handler_requests_total', 'Bot update handler calls', ['handler', 'status'])
+HANDLER_LATENCY = Histogram(
+    'raider_handler_seconds', 'Bot update handler latency', ['handler'], buckets=LATENCY_BUCKETS
+)
+
+def observe_telegram_request(method, status, seconds):
+    """Record one Telegram Bot API call
+
+    status is STATUS_OK or the error's class name; RetryAfter counts as a
+    rate-limit hit.
+    """
+    TELEGRAM_REQUESTS.labels(method, status).inc()
+    TELEGRAM_LATENCY.labels(method).observe(seconds)
+    if status == 'RetryAfter':
+        RATE_LIMIT_HITS.labels('telegram').inc()
+
+def observe_twitter_request(endpoint, status, seconds):
+    """Record one Twitter API request
+
+    status is the HTTP status code, or 'error' if there was no response;
+    429 counts as a rate-limit hit.
+    """
+    TWITTER_REQUESTS.labels(endpoint, status).inc()
+    TWITTER_LATENCY.labels(endpoint).observe(seconds)
+    if status == '429':
+        RATE_LIMIT_HITS.labels('twitter').inc()
+
+def observe_handler(name):
+    """Decorator recording a bot update handler's latency and failures"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            started = clock.monotonic()
+            status = 'error'
+            try:
+                result = await handler(*args, **kwargs)
+                status = STATUS_OK
+                return result
+            finally:
+                HANDLER_REQUESTS.labels(name, status).inc()
+                HANDLER_LATENCY.labels(name).observe(clock.monotonic() - started)
+        return wrapper
+    return decorator
+
+class RaidEngineGauges:
+    """Refreshes the point-in-time gauges from a RaidManager's state.
+
+    Runs on the event loop, so it reads raid state without racing the
+    scrape thread.
+    """
+
+    def __init__(self, manager):
+        """Initialize gauges for manager"""
+        self.manager = manager
+        self._chats = set()  # chat_id labels currently exported
+        self._deferred_polls = 0
+
+    def refresh(self):
+        """Update every gauge from the manager's current state"""
+        manager = self.manager
+        chats = set()
+        for chat_id in manager.raids.chat_ids():
+            chats.add(str(chat_id))
+            ACTIVE_RAIDS.labels(str(chat_id)).set(manager.raids.count_by_chat(chat_id))
+        for chat_id in self._chats - chats:
+            ACTIVE_RAIDS.remove(chat_id)
+        self._chats = chats
+        ACTIVE_RAIDS_TOTAL.set(len(manager.raids))
+        QUEUED_RAIDS.set(len(manager.admission))
+        BACKPRESSURE.set(manager.backpressure())
+
+        POLLED_TWEETS.set(manager.poller.polled_tweet_count())
+        DEFERRED_POLLS.inc(manager.poller.deferred_polls - self._deferred_polls)
+        self._deferred_polls = manager.poller.deferred_polls
+        OUTBOUND_QUEUE_DEPTH.set(manager.outbound.depth())
+        for endpoint, window in manager.twitter_api.budget.get_stats().items():
+            TWITTER_BUDGET_REMAINING.labels(endpoint).set(window['remaining'])
+
+        loop_stats = manager.loop_monitor.get_stats()
+        LOOP_LAG.set(loop_stats['last_lag'])
+        LOOP_STALLS.set(loop_stats['stalls'])
+
+def start_metrics_server(port, addr):
+    """Serve /metrics for Prometheus on a background thread"""
+    start_http_server(port, addr)
+    logger.info("Serving Prometheus metrics on http://%s:%s/metrics", addr, port)
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Outbound Telegram Queue
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import logging
+from collections import deque
+import clock
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Token bucket rate limiter for coroutines"""
+
+    def __init__(self, rate, capacity):
+        """Initialize bucket with rate tokens/second and a burst capacity"""
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = clock.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last refill"""
+        now = clock.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate, capacity):
+        """Change the refill rate and burst capacity"""
+        self._refill()
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = min(self._tokens, capacity)
+
+    def is_full(self):
+        """Check whether the bucket has refilled completely"""
+        self._refill()
+        return self._tokens >= self.capacity
+
+    async def acquire(self, tokens=1):
+        """Wait until tokens are available and take them, in FIFO order"""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+class _OutboundItem:
+    """A queued Telegram operation"""
+
+    __slots__ = ('func', 'args', 'cost', 'coalesce_key', 'future', 'enqueued_at')
+
+    def __init__(self, func, args, cost, coalesce_key, future):
+        self.func = func
+        self.args = args
+        self.cost = cost
+        self.coalesce_key = coalesce_key
+        self.future = future
+        self.enqueued_at = clock.monotonic()
+
+class OutboundQueue:
+    """Paced queue for chat-bound Telegram operations.
+
+    Every operation for a chat runs in submission order on that chat's
+    worker, after taking tokens from the chat's bucket and the global
+    bucket. Operations submitted with the same coalesce key replace a
+    still-queued one in place, so only the newest is sent; every submitter
+    gets the result of the operation that actually ran. Failed operations
+    are logged and resolve to None.
+    """
+
+    def __init__(self, chat_rate, chat_burst, global_rate, global_burst):
+        """Initialize queue with per-chat and global rates (calls/second)"""
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._global_bucket = TokenBucket(global_rate, global_burst)
+        self._chat_buckets = {}  # chat_id -> TokenBucket
+        self._queues = {}  # chat_id -> deque of pending items
+        self._pending = {}  # (chat_id, coalesce_key) -> queued item
+        self._workers = {}  # chat_id -> worker task
+        self._depth = 0
+
+        # Stats
+        self.max_depth = 0
+        self.submitted = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._wait_total = 0.0
+        self.max_wait = 0.0
+
+    def set_global_rate(self, rate, burst):
+        """Change the global rate, e.g. when other processes share the bot's limit"""
+        self._global_bucket.set_rate(rate, burst)
+
+    def submit(self, chat_id, func, *args, coalesce_key=None, cost=1):
+        """Queue coroutine function func(*args) for a chat
+
+        Returns a future resolving to func's result. cost is the number of
+        Telegram calls the operation makes.
+        """
+        self.submitted += 1
+        if coalesce_key is not None:
+            item = self._pending.get((chat_id, coalesce_key))
+            if item is not None:
+                # Supersede the queued operation, keeping its place in line
+                item.func = func
+                item.args = args
+                item.cost = cost
+                self.coalesced += 1
+                return item.future
+
+        item = _OutboundItem(func, args, cost, coalesce_key, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(chat_id, deque()).append(item)
+        if coalesce_key is not None:
+            self._pending[(chat_id, coalesce_key)] = item
+        self._depth += 1
+        self.max_depth = max(self.max_depth, self._depth)
+
+        if chat_id not in self._workers:
+            self._workers[chat_id] = asyncio.create_task(self._drain(chat_id))
+        return item.future
+
+    def _chat_bucket(self, chat_id):
+        """Get or create the token bucket for a chat"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            # Drop buckets of idle chats that have fully refilled
+            if len(self._chat_buckets) > 2 * len(self._workers) + 128:
+                for idle_chat_id in [c for c, b in self._chat_buckets.items()
+                                     if c not in self._workers and b.is_full()]:
+                    del self._chat_buckets[idle_chat_id]
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def _drain(self, chat_id):
+        """Run a chat's queued operations one at a time, paced by both buckets"""
+        queue = self._queues[chat_id]
+        bucket = self._chat_bucket(chat_id)
+        try:
+            while queue:
+                item = queue[0]
+                await bucket.acquire(item.cost)
+                await self._global_bucket.acquire(item.cost)
+
+                # Past this point the item can no longer be superseded
+                queue.popleft()
+                self._depth -= 1
+                if item.coalesce_key is not None:
+                    self._pending.pop((chat_id, item.coalesce_key), None)
+
+                wait = clock.monotonic() - item.enqueued_at
+                self._wait_total += wait
+                self.max_wait = max(self.max_wait, wait)
+
+                try:
+                    result = await item.func(*item.args)
+                    self.sent += 1
+                    if not item.future.done():
+                        item.future.set_result(result)
+                except Exception as e:
+                    self.failed += 1
+                    logger.error("Error running outbound operation for chat %s: %s", chat_id, e)
+                    if not item.future.done():
+                        item.future.set_result(None)
+        finally:
+            del self._workers[chat_id]
+            if not queue:
+                del self._queues[chat_id]
+
+    def depth(self, chat_id=None):
+        """Get number of queued operations, for one chat or overall"""
+        if chat_id is not None:
+            return len(self._queues.get(chat_id, ()))
+        return self._depth
+
+    def backlog_seconds(self):
+        """Get seconds the queued operations take to send at the global rate"""
+        return self._depth / self._global_bucket.rate
+
+    def get_stats(self):
+        """Get queue depth and wait-time stats"""
+        started = self.sent + self.failed
+        return {
+            'depth': self._depth,
+            'max_depth': self.max_depth,
+            'busy_chats': len(self._workers),
+            'submitted': self.submitted,
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'failed': self.failed,
+            'avg_wait': self._wait_total / started if started else 0.0,
+            'max_wait': self.max_wait
+        }
+
+    async def stop(self):
+        """Cancel all chat workers and their queued operations"""
+        workers = list(self._workers.values())
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for queue in self._queues.values():
+            for item in queue:
+                if not item.future.done():
+                    item.future.cancel()
+        self._queues.clear()
+        self._pending.clear()
+        self._depth = 0
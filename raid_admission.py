@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Raid Admission
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+from collections import deque
+
+class QueuedRaid:
+    """A validated raid waiting for capacity to start"""
+
+    __slots__ = ('raid_id', 'chat_id', 'tweet_id', 'tweet_url', 'targets', 'metrics')
+
+    def __init__(self, raid_id, chat_id, tweet_id, tweet_url, targets, metrics):
+        """Initialize queued raid, metrics are the tweet's when it was validated"""
+        self.raid_id = raid_id
+        self.chat_id = chat_id
+        self.tweet_id = tweet_id
+        self.tweet_url = tweet_url
+        self.targets = targets
+        self.metrics = metrics
+
+def queued_to_row(queued):
+    """Convert a queued raid to a plain tuple, for handing it to another shard"""
+    return (queued.raid_id, queued.chat_id, queued.tweet_id, queued.tweet_url, queued.targets, queued.metrics)
+
+def queued_from_row(row):
+    """Rebuild a queued raid from queued_to_row()"""
+    return QueuedRaid(*row)
+
+class AdmissionQueue:
+    """Per-chat and global caps on concurrent raids, with a fair overflow queue.
+
+    Raids over a cap wait in per-chat FIFO queues. Chats with queued raids
+    take turns round-robin as slots free up, so a chat that queued 200
+    raids gets one slot per turn like every other waiting chat.
+    """
+
+    def __init__(self, chat_limit, global_limit, chat_queue_limit):
+        """Initialize queue
+
+        chat_limit: concurrent raids per chat
+        global_limit: concurrent raids overall
+        chat_queue_limit: queued raids per chat, more are refused
+        """
+        self.chat_limit = chat_limit
+        self.global_limit = global_limit
+        self.chat_queue_limit = chat_queue_limit
+        self._queues = {}  # chat_id -> deque of QueuedRaid
+        self._turns = deque()  # chat_ids with queued raids, next turn first
+        self._queued = {}  # raid_id -> QueuedRaid
+        self._starting = {}  # raid_id -> QueuedRaid taken off the queue, not yet claimed
+
+        # Stats
+        self.enqueued = 0
+        self.admitted = 0
+        self.max_queued = 0
+
+    def __len__(self):
+        """Get number of queued raids"""
+        return len(self._queued)
+
+    def __contains__(self, raid_id):
+        """Check if a raid is queued"""
+        return raid_id in self._queued
+
+    def has_room(self, chat_active, total_active):
+        """Check whether a chat running chat_active raids may start one more now"""
+        return chat_active < self.chat_limit and total_active < self.global_limit
+
+    def push(self, queued):
+        """Queue a raid at the back of its chat's line
+
+        A raid already queued under the same ID is updated in place.
+        Returns False if the chat's queue is full.
+        """
+        existing = self._queued.get(queued.raid_id)
+        if existing is not None:
+            existing.tweet_url = queued.tweet_url
+            existing.targets = queued.targets
+            existing.metrics = queued.metrics
+            return True
+
+        queue = self._queues.get(queued.chat_id)
+        if queue is None:
+            queue = self._queues[queued.chat_id] = deque()
+            self._turns.append(queued.chat_id)
+        elif len(queue) >= self.chat_queue_limit:
+            return False
+        queue.append(queued)
+        self._queued[queued.raid_id] = queued
+        self.enqueued += 1
+        self.max_queued = max(self.max_queued, len(self._queued))
+        return True
+
+    def _drop_chat(self, chat_id):
+        """Forget a chat whose queue has emptied"""
+        del self._queues[chat_id]
+        self._turns.remove(chat_id)
+
+    def remove(self, raid_id):
+        """Drop a queued or starting raid, returns it or None if there was none"""
+        if raid_id in self._starting:
+            return self._starting.pop(raid_id)
+        queued = self._queued.pop(raid_id, None)
+        if queued is not None:
+            queue = self._queues[queued.chat_id]
+            queue.remove(queued)
+            if not queue:
+                self._drop_chat(queued.chat_id)
+        return queued
+
+    def remove_chat(self, chat_id):
+        """Drop every queued or starting raid of a chat, returns them"""
+        removed = [queued for queued in self._starting.values() if queued.chat_id == chat_id]
+        for queued in removed:
+            del self._starting[queued.raid_id]
+        queue = self._queues.get(chat_id)
+        if queue:
+            self._drop_chat(chat_id)
+            for queued in queue:
+                del self._queued[queued.raid_id]
+            removed.extend(queue)
+        return removed
+
+    def starting(self, chat_id=None):
+        """Get number of raids taken off the queue but not claimed yet, in a chat or overall"""
+        if chat_id is None:
+            return len(self._starting)
+        return sum(queued.chat_id == chat_id for queued in self._starting.values())
+
+    def by_chat(self, chat_id):
+        """Get a chat's queued raids in order"""
+        return list(self._queues.get(chat_id, ()))
+
+    def all(self):
+        """Get every queued raid"""
+        return list(self._queued.values())
+
+    def position(self, raid_id):
+        """Get a queued raid's 1-based place in the fair order, or None
+
+        This is the order raids start in if no chat is at its own cap.
+        """
+        queued = self._queued.get(raid_id)
+        if queued is None:
+            return None
+        index = self._queues[queued.chat_id].index(queued)
+        # Earlier rounds of every chat, then this round's earlier turns
+        position = 1
+        for chat_id in self._turns:
+            if chat_id == queued.chat_id:
+                position += index
+                break
+            position += min(len(self._queues[chat_id]), index + 1)
+        for chat_id in list(self._turns)[self._turns.index(queued.chat_id) + 1:]:
+            position += min(len(self._queues[chat_id]), index)
+        return position
+
+    def pop_admissible(self, chat_active, total_active):
+        """Take the queued raids that fit under the caps, in fair order
+
+        chat_active: function called as chat_active(chat_id), returning the
+        chat's running raid count. Raids still starting from an earlier
+        call count as running. Each raid must then be claim()ed as it
+        starts.
+        """
+        admitted = []
+        running = {}  # chat_id -> running raids, counting those starting or admitted here
+        skipped = 0  # Chats passed over in a row because they're at their cap
+        total_active += len(self._starting)
+        while self._turns and total_active + len(admitted) < self.global_limit and skipped < len(self._turns):
+            chat_id = self._turns[0]
+            self._turns.rotate(-1)
+            if chat_id not in running:
+                running[chat_id] = chat_active(chat_id) + self.starting(chat_id)
+            if running[chat_id] >= self.chat_limit:
+                skipped += 1
+                continue
+
+            skipped = 0
+            queue = self._queues[chat_id]
+            queued = queue.popleft()
+            del self._queued[queued.raid_id]
+            self._starting[queued.raid_id] = queued
+            running[chat_id] += 1
+            admitted.append(queued)
+            if not queue:
+                self._drop_chat(chat_id)
+        return admitted
+
+    def claim(self, queued):
+        """Confirm a raid from pop_admissible() is starting
+
+        Returns False if it was removed (cancelled) in the meantime.
+        """
+        if self._starting.pop(queued.raid_id, None) is None:
+            return False
+        self.admitted += 1
+        return True
+
+    def get_stats(self):
+        """Get queue stats"""
+        return {
+            'queued': len(self._queued),
+            'waiting_chats': len(self._queues),
+            'max_queued': self.max_queued,
+            'enqueued': self.enqueued,
+            'admitted': self.admitted
+        }
@@ -8,149 +8,539 @@
 # X: x.com/VIBEaiRforce
 # Docs: github.com/vibeAIrFORCE/Docs
 
-import time
+import asyncio
+import heapq
 import logging
-import threading
-import requests
-import json
-from datetime import datetime, timedelta
-from twitter_api import TwitterAPI
-from config import BOT_NAME, DEFAULT_RAID_DURATION, STATUS_UPDATE_INTERVAL, TELEGRAM_TOKEN
-
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+import clock
+from twitter_api import TwitterAPI, TWEET_URL_PATTERN
+from metrics_providers import UNAVAILABLE
+from telegram_client import TelegramClient
+from raid_scheduler import RaidScheduler
+from metrics_poller import MetricsPoller
+from engager_tracker import EngagerTracker
+from outbound_queue import OutboundQueue
+from raid_registry import ChatDashboard, Raid, RaidRegistry
+from raid_admission import AdmissionQueue, QueuedRaid
+from raid_store import RaidStore
+from loop_monitor import LoopLagMonitor
+from monitoring import RAID_OUTCOMES, REFRESH_PRESSES, RaidEngineGauges
+from logging_setup import LogSampler
+from config import (
+    BOT_NAME,
+    DEFAULT_RAID_DURATION,
+    STATUS_UPDATE_INTERVAL,
+    RAID_WORKER_THREADS,
+    RAID_WORKER_QUEUE_LIMIT,
+    LOOP_LAG_CHECK_INTERVAL,
+    LOOP_LAG_THRESHOLD,
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_CHAT_BURST,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_GLOBAL_BURST,
+    OUTBOUND_STATS_INTERVAL,
+    DASHBOARD_MODE,
+    DASHBOARD_REPOST_EVERY,
+    CHAT_DASHBOARD_PAGE_SIZE,
+    RAID_STORE_PATH,
+    RAID_STORE_FLUSH_INTERVAL,
+    POLL_INTERVAL_MIN,
+    POLL_INTERVAL_MAX,
+    BULK_RAID_MAX,
+    PROMETHEUS_REFRESH_INTERVAL,
+    LOG_SAMPLE_EVERY,
+    RAID_CHAT_LIMIT,
+    RAID_GLOBAL_LIMIT,
+    RAID_CHAT_QUEUE_LIMIT,
+    ADMISSION_MAX_PRESSURE,
+    ADMISSION_TELEGRAM_BACKLOG,
+    ADMISSION_RETRY_INTERVAL,
+    REFRESH_FRESH_AGE,
+    ENGAGEMENT_POINTS,
+    LEADERBOARD_SIZE
 )
+
+# Dashboard modes
+DASHBOARD_EDIT = 'edit'  # Edit the status message in place
+DASHBOARD_REPOST = 'repost'  # Delete and re-send the status message every update
+DASHBOARD_COMBINED = 'combined'  # Edit one message showing all of a chat's raids
+DASHBOARD_MODES = (DASHBOARD_EDIT, DASHBOARD_REPOST, DASHBOARD_COMBINED)
+
+# One line of a bulk raid list: a tweet URL, optionally followed by
+# likes, comments and reposts targets
+RAID_LINE_RE = re.compile('(' + TWEET_URL_PATTERN + r')(?:[\s,]+(\d+)[\s,]+(\d+)[\s,]+(\d+))?', re.IGNORECASE)
+
 logger = logging.getLogger(__name__)
 
 class RaidManager:
     """Manages raid state and operations"""
     
-    def __init__(self):
-        """Initialize raid manager"""
-        self.active_raids = {}  # Store active raids
-        self.twitter_api = TwitterAPI()
-        self.telegram_api_url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}"
+    def __init__(self, store_path=RAID_STORE_PATH):
+        """Initialize raid manager, persisting raids to the SQLite file at store_path"""
+        self.raids = RaidRegistry()  # Store active raids
+        self.store = RaidStore(store_path)  # Durable copy, restored on startup
+        self.telegram = None  # Bound to the application's bot in start()
+        # Paced, coalescing queue for every chat-bound Telegram call
+        self.outbound = OutboundQueue(
+            TELEGRAM_CHAT_RATE,
+            TELEGRAM_CHAT_BURST,
+            TELEGRAM_GLOBAL_RATE,
+            TELEGRAM_GLOBAL_BURST
+        )
+        self.scheduler = RaidScheduler()
+        # Caps on concurrent raids, overflow waits here
+        self.admission = AdmissionQueue(RAID_CHAT_LIMIT, RAID_GLOBAL_LIMIT, RAID_CHAT_QUEUE_LIMIT)
+        self.chat_settings = {}  # chat_id -> {'dashboard_mode', 'repost_every'} overrides
+        self.chat_dashboards = {}  # chat_id -> ChatDashboard, for chats in combined mode
+        self.dashboard_stats = {'edits': 0, 'reposts': 0, 'skipped': 0}
+        # Bounded pool for blocking calls (v1.1 Twitter client, store flushes)
+        self._executor = ThreadPoolExecutor(
+            max_workers=RAID_WORKER_THREADS,
+            thread_name_prefix='raid-worker'
+        )
+        # Caps blocking calls in flight or waiting for a worker thread
+        self._worker_slots = asyncio.Semaphore(RAID_WORKER_THREADS + RAID_WORKER_QUEUE_LIMIT)
+        self.loop_monitor = LoopLagMonitor(LOOP_LAG_CHECK_INTERVAL, LOOP_LAG_THRESHOLD)
+        self.twitter_api = TwitterAPI(run_blocking=self._run_blocking)
+        # One shared poll per tweet, fanned out to every raid on it
+        self.poller = MetricsPoller(
+            self.twitter_api,
+            self.scheduler,
+            self._on_metrics,
+            STATUS_UPDATE_INTERVAL,
+            priority=self._raid_priority,
+            cadence=self._raid_cadence
+        )
+        # Who liked, retweeted and replied, for the leaderboards
+        self.engagers = EngagerTracker(self.twitter_api, self.scheduler, self.store, self._on_engaged)
+        self.chat_scores = {}  # chat_id -> {interned user: leaderboard points}
+        self.gauges = RaidEngineGauges(self)
+        self._log_sampler = LogSampler(LOG_SAMPLE_EVERY)  # Thins out per-raid progress logs
+    
+    async def start(self, application, restore=True):
+        """Bind to the application's bot, restore stored raids and start the raid scheduler
+
+        Shard workers pass restore=False and restore once they know which
+        chats they own.
+        """
+        self.telegram = TelegramClient(application.bot)
+        self.loop_monitor.start()
+        self.scheduler.start()
+        if restore:
+            await self.restore_raids()
+        self.scheduler.schedule(('outbound_stats',), OUTBOUND_STATS_INTERVAL, self._log_outbound_stats)
+        self.scheduler.schedule(('store_flush',), RAID_STORE_FLUSH_INTERVAL, self._flush_store)
+        self.scheduler.schedule(('gauges',), 0, self._refresh_gauges)
+        self.engagers.start()
+    
+    async def stop(self):
+        """Stop the raid scheduler, flush raid state and release worker threads"""
+        await self.scheduler.stop()
+        await self.outbound.stop()
+        await self.twitter_api.close()
+        await self._run_blocking(self.store.flush, *self.store.take_pending(self.raids))
+        self.store.close()
+        self._executor.shutdown(wait=False)
+        await self.loop_monitor.stop()
+    
+    async def restore_raids(self, owns=None):
+        """Reload stored raids and resume them on their existing dashboards
+
+        Tweets aren't re-validated. Raids that ran out of time while the bot
+        was down are ended by the first expiry sweep, which replaces their
+        dashboards with the usual final message. If owns(chat_id) is given,
+        other chats' raids are dropped from the store instead, as another
+        shard has taken them over. Returns the number of raids restored.
+        """
+        chat_settings = await self._run_blocking(self.store.load_chat_settings)
+        chat_dashboards = await self._run_blocking(self.store.load_chat_dashboards)
+        chat_scores = await self._run_blocking(self.store.load_chat_scores)
+        engager_cursors, engagers = await self._run_blocking(self.store.load_engagers)
+        raids = await self._run_blocking(self.store.load_raids)
+        if owns is not None:
+            for raid in raids:
+                if not owns(raid.chat_id):
+                    self.store.mark_dirty(raid.raid_id)
+            for chat_id in chat_dashboards:
+                if not owns(chat_id):
+                    self.store.save_chat_dashboard(chat_id, None)
+            raids = [raid for raid in raids if owns(raid.chat_id)]
+            chat_settings = {chat_id: settings for chat_id, settings in chat_settings.items() if owns(chat_id)}
+            chat_dashboards = {chat_id: message_id for chat_id, message_id in chat_dashboards.items() if owns(chat_id)}
+            chat_scores = [row for row in chat_scores if owns(row[0])]
+        self.chat_settings.update(chat_settings)
+        self._load_chat_scores(chat_scores)
+        self.engagers.restore(engager_cursors, engagers, {raid.tweet_id for raid in raids})
+        self._resume_raids(raids)
+        self._resume_chat_dashboards(chat_dashboards)
+        if raids:
+            logger.info("Restored %s raid(s) from %s", len(raids), self.store.path)
+        return len(raids)
+    
+    def _resume_raids(self, raids):
+        """Register existing raids and resume polling and updating their dashboards"""
+        for replaced in self.raids.add_many(raids):
+            self._retire_raid(replaced)
+        now = clock.now()
+        for raid in raids:
+            if raid.end_time > now:
+                self.scheduler.schedule(('dashboard', raid.raid_id), 0, self._post_dashboard, raid.raid_id)
+                self.poller.subscribe(raid.tweet_id, raid.raid_id)
+                self.engagers.track(raid.tweet_id, raid.current_metrics)
+        self._schedule_expiry()
+    
+    def _resume_chat_dashboards(self, chat_dashboards):
+        """Take over existing combined dashboard messages, {chat_id: message_id}
+
+        Each is brought up to date, or deleted if its chat has no raids left.
+        """
+        for chat_id, message_id in chat_dashboards.items():
+            self.chat_dashboards[chat_id] = ChatDashboard(chat_id, message_id)
+            self._queue_chat_dashboard(chat_id)
+    
+    def release_chats(self, owns):
+        """Hand off every chat owns(chat_id) rejects to another shard
+
+        Their raids are dropped without a final message, since the new
+        owner carries on with the same dashboards, and deleted from the
+        store. Returns (raids, chat_settings, queued raids, chat dashboards,
+        chat score rows) for the new owner's adopt_raids(). Engagers of the
+        handed-off tweets aren't moved, the new owner tracks them afresh.
+        """
+        chat_scores = []
+        for chat_id in list(self.chat_scores):
+            if not owns(chat_id):
+                scores = self.chat_scores.pop(chat_id)
+                chat_scores.extend(self._chat_score_rows(chat_id, scores))
+                for index in scores:
+                    self.engagers.users.release(index)
+                self.store.drop_chat_scores(chat_id)
+        chat_dashboards = {}
+        for chat_id in list(self.chat_dashboards):
+            if not owns(chat_id):
+                chat_dashboards[chat_id] = self.chat_dashboards.pop(chat_id).message_id
+                self.store.save_chat_dashboard(chat_id, None)
+        queued = []
+        for chat_id in {queued.chat_id for queued in self.admission.all()}:
+            if not owns(chat_id):
+                queued.extend(self.admission.remove_chat(chat_id))
+        released = [raid for raid in self.raids.all() if not owns(raid.chat_id)]
+        for raid in released:
+            self._remove_raid(raid.raid_id)
+        chat_settings = {
+            chat_id: self.chat_settings.pop(chat_id)
+            for chat_id in list(self.chat_settings) if not owns(chat_id)
+        }
+        self._schedule_expiry()
+        return released, chat_settings, queued, chat_dashboards, chat_scores
+    
+    def adopt_raids(self, raids, chat_settings, queued=(), chat_dashboards=None, chat_scores=()):
+        """Take over raids, chat settings, queued raids, chat dashboards and leaderboards released by another shard"""
+        self._load_chat_scores(chat_scores, save=True)
+        for raid in queued:
+            self.admission.push(raid)
+        if queued:
+            self._schedule_admission()
+        for chat_id, settings in chat_settings.items():
+            self.chat_settings[chat_id] = settings
+            self.store.save_chat_settings(chat_id, settings['dashboard_mode'], settings['repost_every'])
+        for raid in raids:
+            self.store.mark_dirty(raid.raid_id)
+        self._resume_raids(raids)
+        for chat_id, message_id in (chat_dashboards or {}).items():
+            if message_id is not None:
+                self.store.save_chat_dashboard(chat_id, message_id)
+        self._resume_chat_dashboards(chat_dashboards or {})
+        return len(raids)
+    
+    async def adopt_store(self, path, owns):
+        """Take over the chats owns(chat_id) accepts from another shard's raid store
+
+        They're deleted from that store as they're read, so its own shard
+        doesn't bring them back when it restarts. Returns the number of
+        raids taken over.
+        """
+        store = await self._run_blocking(RaidStore, path)
+        try:
+            raids, chat_settings, chat_dashboards, chat_scores = await self._run_blocking(store.take_chats, owns)
+        finally:
+            store.close()
+        return self.adopt_raids(raids, chat_settings, chat_dashboards=chat_dashboards, chat_scores=chat_scores)
+    
+    def _load_chat_scores(self, rows, save=False):
+        """Add (chat_id, user_id, username, points) leaderboard rows, also writing them to the store if save"""
+        users = self.engagers.users
+        for chat_id, user_id, username, points in rows:
+            scores = self.chat_scores.setdefault(chat_id, {})
+            index = users.add(user_id, username)
+            if index in scores:
+                users.release(index)  # Already held by this leaderboard
+            scores[index] = points
+            if save:
+                self.store.save_chat_score(chat_id, user_id, points)
+                if username:
+                    self.store.save_users({user_id: username})
+    
+    def _chat_score_rows(self, chat_id, scores):
+        """Convert a chat's leaderboard to (chat_id, user_id, username, points) rows"""
+        users = self.engagers.users
+        return [(chat_id, users.user_id(index), users.username(index), points) for index, points in scores.items()]
+    
+    def set_shard_count(self, shards):
+        """Limit this process to 1/shards of the bot's Telegram and Twitter rate limits"""
+        self.outbound.set_global_rate(TELEGRAM_GLOBAL_RATE / shards, max(TELEGRAM_GLOBAL_BURST // shards, 1))
+        self.twitter_api.budget.share = 1 / shards
+        self.admission.global_limit = max(RAID_GLOBAL_LIMIT // shards, 1)
+    
+    async def _flush_store(self):
+        """Write dirty raid state to the store in one batch"""
+        try:
+            if self.store.has_pending():
+                await self._run_blocking(self.store.flush, *self.store.take_pending(self.raids))
+        except Exception as e:
+            logger.error("Error flushing raid store: %s", e)
+        finally:
+            self.scheduler.schedule(('store_flush',), RAID_STORE_FLUSH_INTERVAL, self._flush_store)
     
-    def start_raid(self, application, chat_id, tweet_url, targets):
-        """Start a new raid with the given parameters"""
+    async def _log_outbound_stats(self):
+        """Periodically log outbound queue stats for sizing"""
+        stats = self.outbound.get_stats()
+        if stats['submitted']:
+            logger.info("Outbound queue stats", extra=stats)
+        self.scheduler.schedule(('outbound_stats',), OUTBOUND_STATS_INTERVAL, self._log_outbound_stats)
+    
+    async def _refresh_gauges(self):
+        """Periodically update the Prometheus gauges from raid state"""
+        try:
+            self.gauges.refresh()
+        finally:
+            self.scheduler.schedule(('gauges',), PROMETHEUS_REFRESH_INTERVAL, self._refresh_gauges)
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call on the raid worker pool
+
+        Once the pool's queue is full, callers wait here without blocking
+        the event loop.
+        """
+        async with self._worker_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+    
+    async def start_raid(self, chat_id, tweet_url, targets):
+        """Start a new raid with the given parameters
+
+        Returns (True, Raid) if it started, (True, QueuedRaid) if it has to
+        wait for capacity, or (False, error message).
+        """
         # Extract tweet ID
         tweet_id = self.twitter_api.extract_tweet_id(tweet_url)
         if not tweet_id:
             return False, "Invalid tweet URL. Please check and try again."
         
-        # Validate tweet (this will automatically pass in mock mode)
-        if not self.twitter_api.is_valid_tweet(tweet_id):
+        # Validate tweet and get initial metrics in one lookup
+        current_metrics = await self.twitter_api.fetch_tweet(tweet_id)
+        if current_metrics is UNAVAILABLE:
             return False, "Tweet not found or not accessible. Please check and try again."
+        if current_metrics is None:
+            return False, "Couldn't fetch tweet metrics right now (Twitter rate limit). Please try again shortly."
+        logger.info("Initial metrics for tweet %s: %s", tweet_id, current_metrics)
         
-        # Get initial metrics
-        current_metrics = self.twitter_api.get_tweet_metrics(tweet_id)
-        logger.info(f"Initial metrics for tweet {tweet_id}: {current_metrics}")
-        
-        # Create raid info
-        raid_id = f"{chat_id}_{tweet_id}"
-        end_time = datetime.now() + timedelta(minutes=DEFAULT_RAID_DURATION)
-        
-        raid_info = {
-            'raid_id': raid_id,
-            'tweet_id': tweet_id,
-            'tweet_url': tweet_url,
-            'targets': targets,
-            'current_metrics': current_metrics,
-            'start_time': datetime.now(),
-            'end_time': end_time,
-            'chat_id': chat_id,
-            'status_message_id': None,
-            'is_active': True,
-            'update_count': 0  # Track number of updates
-        }
-        
-        # Store raid info
-        self.active_raids[raid_id] = raid_info
-        
-        # Start raid monitoring thread
-        threading.Thread(
-            target=self._monitor_raid,
-            args=(raid_id,),
-            daemon=True
-        ).start()
-        
-        return True, raid_info
-    
-    def _send_telegram_message(self, chat_id, text, parse_mode="Markdown", disable_web_page_preview=True, reply_markup=None):
-        """Send a message to Telegram using direct API call"""
-        url = f"{self.telegram_api_url}/sendMessage"
-        payload = {
-            'chat_id': chat_id,
-            'text': text,
-            'parse_mode': parse_mode,
-            'disable_web_page_preview': disable_web_page_preview
-        }
-        
-        if reply_markup:
-            payload['reply_markup'] = json.dumps(reply_markup)
+        if not self._may_start(chat_id, f"{chat_id}_{tweet_id}"):
+            queued = QueuedRaid(f"{chat_id}_{tweet_id}", chat_id, tweet_id, tweet_url, targets, current_metrics)
+            if not self.admission.push(queued):
+                return False, "Too many raids are waiting to start in this chat. Please try again later."
+            self._schedule_admission(ADMISSION_RETRY_INTERVAL)
+            return True, queued
         
-        try:
-            response = requests.post(url, json=payload)
-            if response.status_code == 200:
-                return response.json()['result']
+        raid = self._create_raid(chat_id, tweet_id, tweet_url, targets, current_metrics)
+        self._activate_raids([raid])
+        return True, raid
+    
+    @staticmethod
+    def parse_raid_list(text, default_targets=None):
+        """Parse a bulk raid list, one tweet URL per line
+
+        Each URL may be followed by its own likes, comments and reposts
+        targets; otherwise default_targets apply. Returns (entries, errors)
+        where entries are (tweet_url, tweet_id, targets) tuples, one per
+        tweet, and errors are (line, reason) tuples.
+        """
+        entries, errors, seen = [], [], set()
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            match = RAID_LINE_RE.search(line)
+            if not match:
+                errors.append((line, "no tweet URL"))
+                continue
+            
+            tweet_url, tweet_id = match.group(1, 2)
+            if '://' not in tweet_url:
+                tweet_url = 'https://' + tweet_url
+            if match.group(3):
+                targets = {
+                    'likes': int(match.group(3)),
+                    'comments': int(match.group(4)),
+                    'retweets': int(match.group(5))
+                }
+            elif default_targets:
+                targets = default_targets
             else:
-                logger.error(f"Error sending message: {response.text}")
-                return None
-        except Exception as e:
-            logger.error(f"Exception sending message: {e}")
-            return None
+                errors.append((line, "no targets"))
+                continue
+            
+            if any(value <= 0 for value in targets.values()):
+                errors.append((line, "targets must be positive"))
+            elif tweet_id in seen:
+                errors.append((line, "duplicate tweet"))
+            else:
+                seen.add(tweet_id)
+                entries.append((tweet_url, tweet_id, targets))
+        return entries, errors
     
-    def _edit_telegram_message(self, chat_id, message_id, text, parse_mode="Markdown", disable_web_page_preview=True, reply_markup=None):
-        """Edit an existing message in Telegram using direct API call"""
-        url = f"{self.telegram_api_url}/editMessageText"
-        payload = {
-            'chat_id': chat_id,
-            'message_id': message_id,
-            'text': text,
-            'parse_mode': parse_mode,
-            'disable_web_page_preview': disable_web_page_preview
-        }
-        
-        if reply_markup:
-            payload['reply_markup'] = json.dumps(reply_markup)
+    async def start_raids(self, chat_id, entries):
+        """Start many raids from parsed (tweet_url, tweet_id, targets) entries
+
+        Every tweet is validated in one batched lookup and the valid raids
+        are registered together, as far as the caps allow; the rest are
+        queued. Returns (started raids, queued raids, failures) where
+        failures are (tweet_url, reason) tuples.
+        """
+        if len(entries) > BULK_RAID_MAX:
+            return [], [], [(tweet_url, f"more than {BULK_RAID_MAX} tweets in one launch")
+                            for tweet_url, _, _ in entries]
         
         try:
-            response = requests.post(url, json=payload)
-            if response.status_code == 200:
-                return True
-            else:
-                # If message content hasn't changed, Telegram returns an error but it's not a real error
-                if "message is not modified" in response.text:
-                    return True
-                logger.error(f"Error editing message: {response.text}")
-                return False
+            results = await self.twitter_api.get_tweet_metrics_batch([tweet_id for _, tweet_id, _ in entries])
         except Exception as e:
-            logger.error(f"Exception editing message: {e}")
-            return False
+            logger.error("Error validating bulk launch in chat %s: %s", chat_id, e)
+            results = None
+        if results is None:
+            # The lookup failed, so nothing is known about the tweets
+            return [], [], [(tweet_url, "couldn't fetch tweet metrics (Twitter rate limit)")
+                            for tweet_url, _, _ in entries]
+        
+        raids, queued, failures = [], [], []
+        for tweet_url, tweet_id, targets in entries:
+            current_metrics = results.get(tweet_id)
+            if current_metrics is None:
+                failures.append((tweet_url, "tweet not found or not accessible"))
+                continue
+            raid_id = f"{chat_id}_{tweet_id}"
+            if self._may_start(chat_id, raid_id, len(raids)):
+                raids.append(self._create_raid(chat_id, tweet_id, tweet_url, targets, current_metrics))
+            elif self.admission.push(QueuedRaid(raid_id, chat_id, tweet_id, tweet_url, targets, current_metrics)):
+                queued.append(self.admission.by_chat(chat_id)[-1])
+            else:
+                failures.append((tweet_url, "too many raids waiting to start in this chat"))
+        
+        self._activate_raids(raids)
+        if queued:
+            self._schedule_admission(ADMISSION_RETRY_INTERVAL)
+        logger.info(
+            "Bulk launch in chat %s: %s started, %s queued, %s failed",
+            chat_id, len(raids), len(queued), len(failures)
+        )
+        return raids, queued, failures
     
-    def _delete_telegram_message(self, chat_id, message_id):
-        """Delete a message from Telegram using direct API call"""
-        if not message_id:
-            return False
+    def backpressure(self):
+        """Get how close the Twitter and Telegram budgets are to saturation (0.0 - 1.0)
+
+        Twitter pressure is the tweet polling demand against the lookup
+        budget's rate; Telegram pressure is the outbound backlog against
+        ADMISSION_TELEGRAM_BACKLOG seconds of the global rate.
+        """
+        twitter = self.poller.budget_utilization()
+        telegram = self.outbound.backlog_seconds() / ADMISSION_TELEGRAM_BACKLOG
+        return min(max(twitter, telegram), 1.0)
+    
+    def _may_start(self, chat_id, raid_id, starting=0):
+        """Check whether a raid can start now rather than queue
+
+        starting: raids in this chat about to start along with it
+        """
+        if raid_id in self.raids:
+            return True  # Replaces a running raid, so needs no new slot
+        if raid_id in self.admission or self.admission.by_chat(chat_id) or self.admission.starting(chat_id):
+            return False  # Wait behind the chat's queued raids, and those starting from the queue
+        return (
+            self.admission.has_room(
+                self.raids.count_by_chat(chat_id) + starting,
+                len(self.raids) + starting + self.admission.starting()
+            )
+            and self.backpressure() < ADMISSION_MAX_PRESSURE
+        )
+    
+    def _schedule_admission(self, delay=0):
+        """Run the admission pass after delay, unless one is already scheduled"""
+        if delay and self.scheduler.is_scheduled(('admission',)):
+            return
+        self.scheduler.schedule(('admission',), delay, self._admit_queued)
+    
+    async def _admit_queued(self):
+        """Start queued raids in fair order while there is capacity and budget"""
+        if not len(self.admission):
+            return
+        try:
+            if self.backpressure() >= ADMISSION_MAX_PRESSURE:
+                return
+            admitted = self.admission.pop_admissible(self.raids.count_by_chat, len(self.raids))
+            if not admitted:
+                return
             
-        url = f"{self.telegram_api_url}/deleteMessage"
-        payload = {
-            'chat_id': chat_id,
-            'message_id': message_id
-        }
+            # Start from fresh metrics, the ones from validation may be minutes old
+            try:
+                results = await self.twitter_api.get_tweet_metrics_batch([queued.tweet_id for queued in admitted]) or {}
+            except Exception as e:
+                logger.error("Error refreshing metrics for queued raids: %s", e)
+                results = {}
+            # Raids cancelled during the lookup aren't claimed
+            raids = [
+                self._create_raid(
+                    queued.chat_id, queued.tweet_id, queued.tweet_url, queued.targets,
+                    results.get(queued.tweet_id, queued.metrics)
+                )
+                for queued in admitted if self.admission.claim(queued)
+            ]
+            self._activate_raids(raids)
+            logger.info("Started %s queued raid(s), %s still queued", len(raids), len(self.admission))
+        finally:
+            if len(self.admission):
+                self._schedule_admission(ADMISSION_RETRY_INTERVAL)
+    
+    def _create_raid(self, chat_id, tweet_id, tweet_url, targets, current_metrics):
+        """Create a raid starting now"""
+        start_time = clock.now()
+        return Raid(
+            f"{chat_id}_{tweet_id}",
+            chat_id,
+            tweet_id,
+            tweet_url,
+            targets,
+            current_metrics,
+            start_time,
+            start_time + timedelta(minutes=DEFAULT_RAID_DURATION)
+        )
+    
+    def _activate_raids(self, raids):
+        """Register new raids and start their dashboards, polling and expiry"""
+        # Store raid info, replacing any earlier raid on the same tweet in this chat
+        for replaced in self.raids.add_many(raids):
+            self._retire_raid(replaced)
+            RAID_OUTCOMES.labels('replaced').inc()
         
-        try:
-            response = requests.post(url, json=payload)
-            if response.status_code == 200:
-                return True
-            else:
-                logger.error(f"Error deleting message: {response.text}")
-                return False
-        except Exception as e:
-            logger.error(f"Exception deleting message: {e}")
-            return False
+        # Post the dashboard, subscribe to shared polling and schedule the expiry
+        for raid in raids:
+            self.store.mark_dirty(raid.raid_id)
+            self.scheduler.schedule(('dashboard', raid.raid_id), 0, self._post_dashboard, raid.raid_id)
+            self.poller.subscribe(raid.tweet_id, raid.raid_id)
+            self.engagers.track(raid.tweet_id, raid.current_metrics)
+        self._schedule_expiry()
     
     def _create_progress_bar(self, current, target, length=10):
         """Create a visual progress bar"""
@@ -159,145 +549,529 @@ class RaidManager:
         bar = '█' * filled_length + '░' * (length - filled_length)
         return f"{bar} {percentage}%"
     
-    def _monitor_raid(self, raid_id):
-        """Monitor raid progress and update status message"""
-        raid_info = self.active_raids.get(raid_id)
-        if not raid_info:
-            logger.error(f"Raid {raid_id} not found in active raids")
-            return
+    def _raid_priority(self, raid_id):
+        """Get a raid's poll priority (0.0 - 1.0)
+
+        Raids close to their end time or close to meeting every target rank
+        highest, since a stale poll costs them the most.
+        """
+        raid = self.raids.get(raid_id)
+        if not raid:
+            return 0.0
         
-        logger.info(f"Starting raid monitoring for {raid_id}")
-        logger.info(f"Targets: {raid_info['targets']}")
+        duration = (raid.end_time - raid.start_time).total_seconds()
+        time_left = (raid.end_time - clock.now()).total_seconds()
+        urgency = 1 - max(time_left, 0) / duration if duration > 0 else 1.0
         
-        # Create initial status message with buttons
-        initial_message = self._send_telegram_message(
-            chat_id=raid_info['chat_id'],
-            text=self.format_raid_message(raid_info),
-            reply_markup=self._create_raid_buttons(raid_id)
+        # The least complete metric decides how close the raid is to success
+        current = raid.current_metrics
+        closeness = min(
+            min(current[metric] / target, 1.0) if target > 0 else 1.0
+            for metric, target in raid.targets.items()
         )
+        return max(urgency, closeness)
+    
+    def _raid_cadence(self, raid_id):
+        """Get the seconds a raid wants between polls
+
+        Raids on pace are polled twice before their projected finish, so
+        near-complete raids are caught quickly. Stalled raids and raids that
+        won't finish before they expire drop to the ceiling. Raids without
+        enough history yet use the default interval.
+        """
+        raid = self.raids.get(raid_id)
+        if not raid or len(raid.series) < 2:
+            return STATUS_UPDATE_INTERVAL
         
-        if initial_message:
-            raid_info['status_message_id'] = initial_message['message_id']
-            logger.info(f"Created initial status message for raid {raid_id}, message ID: {initial_message['message_id']}")
+        eta = raid.eta()
+        time_left = (raid.end_time - clock.now()).total_seconds()
+        if eta is None or eta > time_left:
+            interval = POLL_INTERVAL_MAX
         else:
-            logger.error(f"Failed to create initial status message for raid {raid_id}")
+            interval = eta / 2
+        return min(max(interval, POLL_INTERVAL_MIN), POLL_INTERVAL_MAX)
+    
+    def get_poll_intervals(self, chat_id=None):
+        """Get each raid's effective poll interval in seconds, for tuning
+
+        This is the interval its tweet is actually polled at, which may be
+        shorter than the raid's own cadence if another raid shares the tweet,
+        or longer under rate-limit pressure.
+        """
+        raids = self.raids.by_chat(chat_id) if chat_id else self.raids.all()
+        return {raid.raid_id: self.poller.poll_interval(raid.tweet_id) for raid in raids}
+    
+    def get_raid_status(self, chat_id):
+        """Get a chat's active and queued raids as plain dicts, for /status"""
+        return {
+            'active': [
+                {
+                    'raid_id': raid.raid_id,
+                    'tweet_url': raid.tweet_url,
+                    'end_time': raid.end_time.timestamp(),
+                    'poll_interval': self.poller.poll_interval(raid.tweet_id)
+                }
+                for raid in self.raids.by_chat(chat_id)
+            ],
+            'queued': [
+                {
+                    'raid_id': queued.raid_id,
+                    'tweet_url': queued.tweet_url,
+                    'position': self.admission.position(queued.raid_id)
+                }
+                for queued in self.admission.by_chat(chat_id)
+            ]
+        }
+    
+    def _retire_raid(self, raid):
+        """Deactivate an unregistered raid and stop its polling and jobs"""
+        raid.is_active = False
+        self._log_sampler.discard(raid.raid_id)
+        self.poller.unsubscribe(raid.tweet_id, raid.raid_id)
+        if not self.raids.by_tweet(raid.tweet_id):
+            self.twitter_api.release(raid.tweet_id)
+            self.engagers.release(raid.tweet_id)
+        self.scheduler.cancel(('dashboard', raid.raid_id))
+    
+    def _remove_raid(self, raid_id):
+        """Deactivate a raid and drop it from the active raids"""
+        raid = self.raids.remove(raid_id)
+        if raid:
+            self._retire_raid(raid)
+            self.store.mark_dirty(raid_id)
+            if raid.chat_id in self.chat_dashboards:
+                self._queue_chat_dashboard(raid.chat_id)
+            if len(self.admission):
+                self._schedule_admission()
+        return raid
+    
+    def _schedule_expiry(self):
+        """Schedule the expiry sweep for the next raid to run out of time"""
+        next_expiry = self.raids.next_expiry()
+        if next_expiry is None:
+            self.scheduler.cancel(('expire',))
+            return
+        delay = (next_expiry - clock.now()).total_seconds()
+        self.scheduler.schedule(('expire',), delay, self._expire_raids)
+    
+    def get_dashboard_settings(self, chat_id):
+        """Get a chat's dashboard mode and repost interval"""
+        settings = self.chat_settings.get(chat_id, {})
+        return (
+            settings.get('dashboard_mode', DASHBOARD_MODE),
+            settings.get('repost_every', DASHBOARD_REPOST_EVERY)
+        )
+    
+    def set_dashboard_settings(self, chat_id, mode, repost_every=0):
+        """Set a chat's dashboard mode and, in edit mode, how often to re-post"""
+        if mode not in DASHBOARD_MODES:
+            return False, f"Unknown dashboard mode. Use one of: {', '.join(DASHBOARD_MODES)}."
+        if repost_every < 0:
+            return False, "Repost interval must be zero or a positive number."
+        was_combined = self._is_combined(chat_id)
+        self.chat_settings[chat_id] = {'dashboard_mode': mode, 'repost_every': repost_every}
+        self.store.save_chat_settings(chat_id, mode, repost_every)
+        if was_combined != self._is_combined(chat_id):
+            self._switch_dashboard_layout(chat_id)
+        return True, "Dashboard settings updated."
+    
+    def _is_combined(self, chat_id):
+        """Check whether a chat shows its raids on one combined dashboard"""
+        return self.get_dashboard_settings(chat_id)[0] == DASHBOARD_COMBINED
+    
+    def _switch_dashboard_layout(self, chat_id):
+        """Move a chat's raids between per-raid dashboards and one combined dashboard
+
+        The old messages are deleted and the new ones posted through the
+        outbound queue.
+        """
+        if self._is_combined(chat_id):
+            for raid in self.raids.by_chat(chat_id):
+                if raid.status_message_id:
+                    self.outbound.submit(chat_id, self.telegram.delete_message, chat_id, raid.status_message_id)
+                    raid.status_message_id = None
+                    self.store.mark_dirty(raid.raid_id)
+                raid.dashboard_hash = None
+            if self.raids.count_by_chat(chat_id):
+                self._queue_chat_dashboard(chat_id)
             return
         
-        try:
-            while raid_info['is_active']:
-                # Check if raid should end due to time
-                if datetime.now() >= raid_info['end_time']:
-                    raid_info['is_active'] = False
-                    logger.info(f"Raid {raid_id} ended due to time expiration")
-                    
-                    # Delete the old status message
-                    if raid_info['status_message_id']:
-                        self._delete_telegram_message(raid_info['chat_id'], raid_info['status_message_id'])
-                    
-                    # Send a new completion message
-                    final_message = self._send_telegram_message(
-                        chat_id=raid_info['chat_id'],
-                        text=f"⏱ *{BOT_NAME} - RAID COMPLETED* - Time expired!\n\n" + 
-                             self.format_raid_message(raid_info)
-                    )
-                    
-                    # Remove from active raids
-                    if raid_id in self.active_raids:
-                        del self.active_raids[raid_id]
-                    break
-                
-                # Update metrics
-                raid_info['current_metrics'] = self.twitter_api.get_tweet_metrics(
-                    raid_info['tweet_id']
+        dashboard = self.chat_dashboards.pop(chat_id, None)
+        if dashboard is not None and dashboard.message_id:
+            self.outbound.submit(chat_id, self.telegram.delete_message, chat_id, dashboard.message_id)
+            self.store.save_chat_dashboard(chat_id, None)
+        for raid in self.raids.by_chat(chat_id):
+            self._queue_dashboard(raid.raid_id, force=True)
+    
+    def _dashboard_hash(self, raid):
+        """Hash the meaningful dashboard content
+
+        Covers the metrics (and so the progress bars) plus the minutes left,
+        so the countdown alone only changes the hash once a minute.
+        """
+        minutes_left = max(int((raid.end_time - clock.now()).total_seconds() // 60), 0)
+        return hash((raid.likes, raid.retweets, raid.comments, minutes_left))
+    
+    def _queue_dashboard(self, raid_id, force=False):
+        """Queue a dashboard update, unless its content hasn't changed
+
+        Any update still waiting in the queue is superseded by this one.
+        """
+        raid = self.raids.get(raid_id)
+        if self._is_combined(raid.chat_id):
+            return self._queue_chat_dashboard(raid.chat_id, force)
+        # Due every repost_every updates, counting unchanged ones, so skips can't swallow it
+        mode, repost_every = self.get_dashboard_settings(raid.chat_id)
+        if repost_every and raid.update_count - raid.last_repost >= repost_every:
+            raid.repost_due = True
+        if not force and not raid.repost_due and raid.dashboard_hash == self._dashboard_hash(raid):
+            self.dashboard_stats['skipped'] += 1
+            return None
+        
+        if mode == DASHBOARD_REPOST:
+            raid.repost_due = True
+        repost = raid.repost_due or raid.status_message_id is None
+        
+        return self.outbound.submit(
+            raid.chat_id,
+            self._render_dashboard,
+            raid_id,
+            coalesce_key=('dashboard', raid_id),
+            cost=2 if repost and raid.status_message_id else 1
+        )
+    
+    def _queue_chat_dashboard(self, chat_id, force=False):
+        """Queue an update of a chat's combined dashboard, unless its content hasn't changed
+
+        However many raids changed, the chat has at most one update waiting.
+        """
+        dashboard = self.chat_dashboards.get(chat_id)
+        if dashboard is None:
+            dashboard = self.chat_dashboards[chat_id] = ChatDashboard(chat_id)
+        raids = self.raids.by_chat(chat_id)
+        if not raids:
+            if dashboard.message_id is None:
+                del self.chat_dashboards[chat_id]
+                return None
+        elif not force and dashboard.content_hash == self._chat_dashboard_hash(dashboard, raids):
+            self.dashboard_stats['skipped'] += 1
+            return None
+        
+        _, repost_every = self.get_dashboard_settings(chat_id)
+        if repost_every and dashboard.update_count and dashboard.update_count % repost_every == 0:
+            dashboard.repost_due = True
+        repost = raids and (dashboard.repost_due or dashboard.message_id is None)
+        
+        return self.outbound.submit(
+            chat_id,
+            self._render_chat_dashboard,
+            chat_id,
+            coalesce_key=('chat_dashboard', chat_id),
+            cost=2 if repost and dashboard.message_id else 1
+        )
+    
+    def _chat_page(self, dashboard, raids):
+        """Get the raids on a combined dashboard's current page and the page count"""
+        pages = max(-(-len(raids) // CHAT_DASHBOARD_PAGE_SIZE), 1)
+        dashboard.page = min(dashboard.page, pages - 1)
+        start = dashboard.page * CHAT_DASHBOARD_PAGE_SIZE
+        return raids[start:start + CHAT_DASHBOARD_PAGE_SIZE], pages
+    
+    def _chat_dashboard_hash(self, dashboard, raids):
+        """Hash the meaningful content of a combined dashboard
+
+        Only raids on the page shown count, so progress elsewhere in the
+        chat doesn't cost an edit.
+        """
+        page_raids, pages = self._chat_page(dashboard, raids)
+        return hash((
+            dashboard.page, pages, len(raids),
+            tuple((raid.raid_id, self._dashboard_hash(raid)) for raid in page_raids)
+        ))
+    
+    def _queue_final_message(self, raid, text):
+        """Queue replacing an ended raid's dashboard with a final message"""
+        return self.outbound.submit(
+            raid.chat_id,
+            self._replace_dashboard,
+            raid,
+            text,
+            cost=2 if raid.status_message_id else 1
+        )
+    
+    async def _render_dashboard(self, raid_id):
+        """Bring a raid's status message up to date
+
+        Runs on the outbound queue, so the message is rendered from the
+        newest metrics at send time.
+        """
+        raid = self.raids.get(raid_id)
+        if not raid or not raid.is_active or self._is_combined(raid.chat_id):
+            return False
+        
+        if raid.repost_due or raid.status_message_id is None:
+            return await self._repost_dashboard(raid)
+        return await self._edit_dashboard(raid)
+    
+    async def _edit_dashboard(self, raid):
+        """Edit a raid's status message in place"""
+        content_hash = self._dashboard_hash(raid)
+        edited = await self.telegram.edit_message_text(
+            raid.chat_id,
+            raid.status_message_id,
+            self.format_raid_message(raid),
+            reply_markup=self._create_raid_buttons(raid)
+        )
+        
+        if not edited:
+            # The message may have been deleted by a chat admin, post a new one
+            return await self._repost_dashboard(raid)
+        
+        raid.dashboard_hash = content_hash
+        self.dashboard_stats['edits'] += 1
+        return True
+    
+    async def _repost_dashboard(self, raid):
+        """Replace a raid's status message with a freshly rendered one"""
+        raid_id = raid.raid_id
+        content_hash = self._dashboard_hash(raid)
+        first_post = raid.status_message_id is None
+        
+        # Delete the old status message so the new one appears as the newest message
+        if not first_post:
+            await self.telegram.delete_message(raid.chat_id, raid.status_message_id)
+        
+        # Send a new status message
+        new_message = await self.telegram.send_message(
+            raid.chat_id,
+            self.format_raid_message(raid),
+            reply_markup=self._create_raid_buttons(raid)
+        )
+        
+        if new_message:
+            raid.status_message_id = new_message.message_id
+            self.store.mark_dirty(raid_id)
+            raid.dashboard_hash = content_hash
+            raid.repost_due = False
+            raid.last_repost = raid.update_count
+            self.dashboard_stats['reposts'] += 1
+            logger.info("Created new status message for raid %s, message ID: %s", raid_id, new_message.message_id)
+            return True
+        
+        logger.error("Failed to create new status message for raid %s", raid_id)
+        if first_post:
+            self._remove_raid(raid_id)
+        return False
+    
+    async def _render_chat_dashboard(self, chat_id):
+        """Bring a chat's combined dashboard up to date
+
+        Runs on the outbound queue like _render_dashboard(). Edits the
+        message in place, re-posts it when due or when the edit fails, and
+        deletes it once the chat has no raids left.
+        """
+        dashboard = self.chat_dashboards.get(chat_id)
+        if dashboard is None:
+            return False
+        
+        raids = self.raids.by_chat(chat_id)
+        if not raids:
+            del self.chat_dashboards[chat_id]
+            if dashboard.message_id:
+                await self.telegram.delete_message(chat_id, dashboard.message_id)
+                self.store.save_chat_dashboard(chat_id, None)
+            return True
+        
+        content_hash = self._chat_dashboard_hash(dashboard, raids)
+        text, buttons = self.format_chat_dashboard(dashboard, raids)
+        if dashboard.message_id and not dashboard.repost_due:
+            edited = await self.telegram.edit_message_text(chat_id, dashboard.message_id, text, reply_markup=buttons)
+            if edited:
+                dashboard.content_hash = content_hash
+                dashboard.update_count += 1
+                self.dashboard_stats['edits'] += 1
+                return True
+        
+        # Re-post, the old message may also have been deleted by a chat admin
+        if dashboard.message_id:
+            await self.telegram.delete_message(chat_id, dashboard.message_id)
+        new_message = await self.telegram.send_message(chat_id, text, reply_markup=buttons)
+        if not new_message:
+            logger.error("Failed to post combined dashboard for chat %s", chat_id)
+            dashboard.message_id = None
+            self.store.save_chat_dashboard(chat_id, None)
+            return False
+        
+        dashboard.message_id = new_message.message_id
+        dashboard.content_hash = content_hash
+        dashboard.update_count += 1
+        dashboard.repost_due = False
+        self.store.save_chat_dashboard(chat_id, dashboard.message_id)
+        self.dashboard_stats['reposts'] += 1
+        return True
+    
+    async def _replace_dashboard(self, raid, text):
+        """Delete an ended raid's status message and send a final message"""
+        # Delete the old status message
+        if raid.status_message_id:
+            await self.telegram.delete_message(raid.chat_id, raid.status_message_id)
+        
+        # Send the final message
+        return await self.telegram.send_message(raid.chat_id, text)
+    
+    def _finish_raid(self, raid_id, header, outcome):
+        """End a raid and replace its dashboard with a final message crediting its top raiders"""
+        raid = self.raids.get(raid_id)
+        top = self.engagers.leaderboard(raid.tweet_id, 3) if raid else []
+        raid = self._remove_raid(raid_id)
+        if raid:
+            RAID_OUTCOMES.labels(outcome).inc()
+            text = header + self.format_raid_message(raid)
+            if top:
+                text += "\n\n🏅 Top raiders: " + ", ".join(
+                    f"{self.format_raider(entry)} ({entry['points']})" for entry in top
                 )
-                
-                # Log current metrics for debugging
-                logger.info(f"Current metrics for raid {raid_id}: {raid_info['current_metrics']}")
-                
-                # Check if targets are met
-                targets = raid_info['targets']
-                current = raid_info['current_metrics']
-                
-                # Log comparison for debugging
-                logger.info(f"Comparing - Likes: {current['likes']}/{targets['likes']}, " +
-                           f"Retweets: {current['retweets']}/{targets['retweets']}, " +
-                           f"Comments: {current['comments']}/{targets['comments']}")
-                
-                if (current['likes'] >= targets['likes'] and
-                    current['retweets'] >= targets['retweets'] and
-                    current['comments'] >= targets['comments']):
-                    
-                    raid_info['is_active'] = False
-                    logger.info(f"Raid {raid_id} completed successfully - all targets met")
-                    
-                    # Delete the old status message
-                    if raid_info['status_message_id']:
-                        self._delete_telegram_message(raid_info['chat_id'], raid_info['status_message_id'])
-                    
-                    # Send a new success message
-                    success_message = self._send_telegram_message(
-                        chat_id=raid_info['chat_id'],
-                        text=f"🎉 *{BOT_NAME} - RAID SUCCESSFUL* - All targets met!\n\n" + 
-                             self.format_raid_message(raid_info)
-                    )
-                    
-                    # Remove from active raids
-                    if raid_id in self.active_raids:
-                        del self.active_raids[raid_id]
-                    break
-                
-                # Increment update count
-                raid_info['update_count'] += 1
-                
-                # Every update, delete the old message and send a new one to make it appear as the newest message
-                if raid_info['status_message_id']:
-                    # Delete the old status message
-                    self._delete_telegram_message(raid_info['chat_id'], raid_info['status_message_id'])
-                
-                # Send a new status message
-                new_message = self._send_telegram_message(
-                    chat_id=raid_info['chat_id'],
-                    text=self.format_raid_message(raid_info),
-                    reply_markup=self._create_raid_buttons(raid_id)
+            self._queue_final_message(raid, text)
+    
+    async def _expire_raids(self):
+        """End every raid whose time has run out"""
+        for raid in self.raids.pop_expired(clock.now()):
+            logger.info("Raid %s ended due to time expiration", raid.raid_id)
+            self._finish_raid(raid.raid_id, f"⏱ *{BOT_NAME} - RAID COMPLETED* - Time expired!\n\n", 'expired')
+        self._schedule_expiry()
+    
+    async def _post_dashboard(self, raid_id):
+        """Create the initial status message with buttons for a raid"""
+        raid = self.raids.get(raid_id)
+        if not raid or not raid.is_active:
+            return
+        
+        logger.info("Starting raid monitoring for %s", raid_id, extra={'raid_id': raid_id, 'targets': raid.targets})
+        self._queue_dashboard(raid_id)
+    
+    def _on_engaged(self, tweet_id, metric, users):
+        """Credit newly seen engagers of a tweet in the leaderboard of every chat raiding it"""
+        points = ENGAGEMENT_POINTS[metric]
+        for raid in self.raids.by_tweet(tweet_id):
+            scores = self.chat_scores.setdefault(raid.chat_id, {})
+            for index in users:
+                if index not in scores:
+                    self.engagers.users.hold(index)  # Kept while the chat's leaderboard lists them
+                scores[index] = scores.get(index, 0) + points
+                self.store.save_chat_score(raid.chat_id, self.engagers.users.user_id(index), scores[index])
+    
+    def get_leaderboard(self, chat_id, tweet_id=None, limit=LEADERBOARD_SIZE):
+        """Get a chat's top raiders, or those of its raid on tweet_id, as plain dicts
+
+        Returns None if the chat has no raid on tweet_id.
+        """
+        if tweet_id is not None:
+            if f"{chat_id}_{tweet_id}" not in self.raids:
+                return None
+            return self.engagers.leaderboard(tweet_id, limit)
+        users = self.engagers.users
+        return [
+            {'user_id': users.user_id(index), 'username': users.username(index), 'points': points}
+            for index, points in heapq.nlargest(limit, self.chat_scores.get(chat_id, {}).items(), key=lambda item: item[1])
+        ]
+    
+    @staticmethod
+    def format_raider(entry):
+        """Format a leaderboard entry's Twitter handle (Markdown-escaped), or its user ID if the handle is unknown"""
+        return "@" + entry['username'].replace('_', '\\_') if entry['username'] else f"user {entry['user_id']}"
+    
+    async def _on_metrics(self, raid_id, current):
+        """Apply freshly polled metrics to a raid and update its dashboard"""
+        raid = self.raids.get(raid_id)
+        if not raid or not raid.is_active:
+            return
+        
+        try:
+            raid.record_metrics(current)
+            self.engagers.observe(raid.tweet_id, current)
+            
+            # Log a sample of each raid's progress
+            if self._log_sampler.should_log(raid_id):
+                logger.info(
+                    "Raid %s progress", raid_id,
+                    extra={'raid_id': raid_id, 'metrics': current, 'targets': raid.targets}
                 )
+            
+            # Check if targets are met
+            if raid.targets_met():
                 
-                if new_message:
-                    raid_info['status_message_id'] = new_message['message_id']
-                    logger.info(f"Created new status message for raid {raid_id}, message ID: {new_message['message_id']}")
-                else:
-                    logger.error(f"Failed to create new status message for raid {raid_id}")
-                
-                # Wait for update interval before next update
-                time.sleep(STATUS_UPDATE_INTERVAL)
+                logger.info("Raid %s completed successfully - all targets met", raid_id)
+                self._finish_raid(raid_id, f"🎉 *{BOT_NAME} - RAID SUCCESSFUL* - All targets met!\n\n", 'succeeded')
+                return
+            
+            # Increment update count
+            raid.update_count += 1
+            self.store.mark_dirty(raid_id)
+            
+            # Update the dashboard if anything meaningful changed
+            self._queue_dashboard(raid_id)
         except Exception as e:
-            logger.error(f"Error in raid monitoring: {e}")
+            logger.error("Error in raid monitoring: %s", e)
             # Ensure raid is removed from active raids on error
-            if raid_id in self.active_raids:
-                del self.active_raids[raid_id]
+            if self._remove_raid(raid_id):
+                RAID_OUTCOMES.labels('failed').inc()
     
-    def _create_raid_buttons(self, raid_id):
+    def _create_raid_buttons(self, raid):
         """Create inline keyboard buttons for raid actions"""
-        keyboard = {
-            'inline_keyboard': [
-                [
-                    {'text': '🔄 Refresh', 'callback_data': f'refresh_{raid_id}'},
-                    {'text': '🛑 Cancel Raid', 'callback_data': f'cancel_{raid_id}'}
-                ],
-                [
-                    {'text': '🔗 Open Tweet', 'url': self.active_raids[raid_id]['tweet_url']}
-                ]
+        raid_id = raid.raid_id
+        return InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton('🔄 Refresh', callback_data=f'refresh_{raid_id}'),
+                InlineKeyboardButton('🛑 Cancel Raid', callback_data=f'cancel_{raid_id}')
+            ],
+            [
+                InlineKeyboardButton('🔗 Open Tweet', url=raid.tweet_url)
             ]
-        }
-        return keyboard
+        ])
     
-    def format_raid_message(self, raid_info):
+    def format_chat_dashboard(self, dashboard, raids):
+        """Format a chat's combined dashboard, returns (text, buttons)
+
+        Each raid on the page gets a compact row with its least complete
+        metric's progress bar, and a refresh and cancel button.
+        """
+        page_raids, pages = self._chat_page(dashboard, raids)
+        first = dashboard.page * CHAT_DASHBOARD_PAGE_SIZE + 1
+        now = clock.now()
+        
+        message = f"🚀 *{BOT_NAME} - {len(raids)} RAID(S) IN PROGRESS* 🚀\n\n"
+        keyboard = []
+        for number, raid in enumerate(page_raids, first):
+            seconds_left = max((raid.end_time - now).total_seconds(), 0)
+            current, targets = raid.current_metrics, raid.targets
+            lagging = min(targets, key=lambda metric: current[metric] / targets[metric] if targets[metric] > 0 else 1.0)
+            message += f"*#{number}* [Tweet]({raid.tweet_url}) ⏱ {int(seconds_left // 60)}m · 🎯 {self._format_eta(raid, seconds_left)}\n"
+            message += f"❤️ {current['likes']}/{targets['likes']} 🔄 {current['retweets']}/{targets['retweets']} 💬 {current['comments']}/{targets['comments']}\n"
+            message += f"{self._create_progress_bar(current[lagging], targets[lagging], length=8)} {lagging}\n\n"
+            keyboard.append([
+                InlineKeyboardButton(f'🔄 #{number}', callback_data=f'refresh_{raid.raid_id}'),
+                InlineKeyboardButton(f'🛑 #{number}', callback_data=f'cancel_{raid.raid_id}')
+            ])
+        
+        if pages > 1:
+            message += f"📄 Page {dashboard.page + 1}/{pages}\n"
+            navigation = []
+            if dashboard.page > 0:
+                navigation.append(InlineKeyboardButton('◀️ Prev', callback_data=f'page_{dashboard.page - 1}'))
+            if dashboard.page < pages - 1:
+                navigation.append(InlineKeyboardButton('Next ▶️', callback_data=f'page_{dashboard.page + 1}'))
+            keyboard.append(navigation)
+        message += "🏆 *Raids end when all targets are met or time expires!*"
+        return message, InlineKeyboardMarkup(keyboard)
+    
+    def format_raid_message(self, raid):
         """Format raid status message with progress bars"""
-        tweet_url = raid_info['tweet_url']
-        end_time = raid_info['end_time']
-        targets = raid_info['targets']
-        current = raid_info['current_metrics']
+        tweet_url = raid.tweet_url
+        end_time = raid.end_time
+        targets = raid.targets
+        current = raid.current_metrics
         
-        time_left = end_time - datetime.now()
+        time_left = end_time - clock.now()
         if time_left.total_seconds() <= 0:
             time_str = "0m 0s"
         else:
@@ -318,153 +1092,150 @@ class RaidManager:
         comment_bar = self._create_progress_bar(current['comments'], targets['comments'])
         
         message = f"🚀 *{BOT_NAME} - RAID IN PROGRESS* 🚀\n\n"
-        message += f"⏱ Time Remaining: {time_str}\n\n"
+        message += f"⏱ Time Remaining: {time_str}\n"
+        message += f"🎯 ETA: {self._format_eta(raid, time_left.total_seconds())}\n\n"
         message += "📊 *Progress*:\n"
-        message += f"❤️ Likes: {current['likes']}/{targets['likes']}\n{like_bar}\n\n"
-        message += f"🔄 Retweets: {current['retweets']}/{targets['retweets']}\n{rt_bar}\n\n"
-        message += f"💬 Comments: {current['comments']}/{targets['comments']}\n{comment_bar}\n\n"
+        message += f"❤️ Likes: {current['likes']}/{targets['likes']}{self._format_velocity(raid, 'likes')}\n{like_bar}\n\n"
+        message += f"🔄 Retweets: {current['retweets']}/{targets['retweets']}{self._format_velocity(raid, 'retweets')}\n{rt_bar}\n\n"
+        message += f"💬 Comments: {current['comments']}/{targets['comments']}{self._format_velocity(raid, 'comments')}\n{comment_bar}\n\n"
         message += "🏆 *Raid ends when all targets are met or time expires!*"
         
         return message
     
-    def handle_callback_query(self, callback_query_id, callback_data, chat_id, user_id):
+    def _format_velocity(self, raid, metric):
+        """Format a metric's recent growth rate, or nothing until it's known"""
+        velocity = raid.velocity(metric)
+        if velocity is None:
+            return ""
+        return f" (+{velocity:.1f}/min)"
+    
+    def _format_eta(self, raid, seconds_left):
+        """Format the projected time until every target is met"""
+        eta = raid.eta()
+        if eta is None:
+            return "calculating..." if len(raid.series) < 2 else "not on pace"
+        if eta > seconds_left:
+            return "not on pace"
+        minutes, seconds = divmod(int(eta), 60)
+        return f"~{minutes}m {seconds}s"
+    
+    async def handle_callback_query(self, callback_query_id, callback_data, chat_id, user_id):
         """Handle callback queries from inline buttons"""
-        logger.info(f"Handling callback query: {callback_data}")
+        logger.info("Handling callback query: %s", callback_data)
+        
+        if callback_data.startswith('refresh_'):
+            # Answered with the raid's progress once it's known
+            return await self._refresh_raid(callback_query_id, callback_data[len('refresh_'):])
         
         # Answer the callback query to stop the loading indicator
-        self._answer_callback_query(callback_query_id)
+        await self._answer_callback_query(callback_query_id)
         
-        if callback_data.startswith('refresh_'):
-            # Extract raid_id from callback data
-            raid_id = callback_data[len('refresh_'):]
-            
-            # Check if raid exists
-            if raid_id not in self.active_raids:
-                return False, "Raid not found."
-            
-            # Update metrics immediately
-            raid_info = self.active_raids[raid_id]
-            raid_info['current_metrics'] = self.twitter_api.get_tweet_metrics(
-                raid_info['tweet_id']
-            )
-            
-            # Delete the old status message
-            if raid_info['status_message_id']:
-                self._delete_telegram_message(raid_info['chat_id'], raid_info['status_message_id'])
-            
-            # Send a new status message
-            new_message = self._send_telegram_message(
-                chat_id=raid_info['chat_id'],
-                text=self.format_raid_message(raid_info),
-                reply_markup=self._create_raid_buttons(raid_id)
-            )
-            
-            if new_message:
-                raid_info['status_message_id'] = new_message['message_id']
-                logger.info(f"Created new status message for raid {raid_id}, message ID: {new_message['message_id']}")
-                return True, "Raid status refreshed."
-            else:
-                logger.error(f"Failed to create new status message for raid {raid_id}")
-                return False, "Failed to refresh raid status."
-            
-        elif callback_data.startswith('cancel_'):
+        if callback_data.startswith('cancel_'):
             # Extract raid_id from callback data
             raid_id = callback_data[len('cancel_'):]
             
             # Cancel the raid
-            if raid_id in self.active_raids:
-                raid_info = self.active_raids[raid_id]
-                
-                # Delete the old status message
-                if raid_info['status_message_id']:
-                    self._delete_telegram_message(raid_info['chat_id'], raid_info['status_message_id'])
-                
-                # Send a cancellation message
-                self._send_telegram_message(
-                    chat_id=raid_info['chat_id'],
-                    text=f"🛑 *{BOT_NAME} - RAID CANCELLED*\n\nThis raid has been cancelled by a user."
-                )
-                
-                # Mark raid as inactive and remove from active raids
-                raid_info['is_active'] = False
-                del self.active_raids[raid_id]
-                
+            if self._cancel_raid_by_id(raid_id):
                 return True, "Raid cancelled successfully."
             else:
                 return False, "Raid not found."
         
+        elif callback_data.startswith('page_'):
+            # Turn the page of the chat's combined dashboard
+            dashboard = self.chat_dashboards.get(chat_id)
+            page = callback_data[len('page_'):]
+            if dashboard is None or not page.isdigit():
+                return False, "Dashboard not found."
+            dashboard.page = int(page)
+            self._queue_chat_dashboard(chat_id)
+            return True, "Dashboard page changed."
+        
         return False, "Unknown callback query."
     
-    def _answer_callback_query(self, callback_query_id, text=None, show_alert=False):
-        """Answer a callback query to stop the loading indicator"""
-        url = f"{self.telegram_api_url}/answerCallbackQuery"
-        payload = {
-            'callback_query_id': callback_query_id
-        }
+    def _metrics_age(self, raid):
+        """Get the seconds since a raid's metrics were last polled"""
+        return clock.time() - raid.series.latest_time()
+    
+    async def _refresh_raid(self, callback_query_id, raid_id):
+        """Answer a Refresh press with a toast of the raid's progress
+
+        Presses within REFRESH_FRESH_AGE of the last poll are answered from
+        the raid's current metrics. Later ones look the tweet up past the
+        tweet cache, sharing the lookup with concurrent presses, and apply
+        the result once to every raid on the tweet, so mashing Refresh
+        costs at most one Twitter call and one coalesced dashboard edit.
+        """
+        raid = self.raids.get(raid_id)
+        if not raid:
+            return False, "Raid not found."
         
-        if text:
-            payload['text'] = text
-            payload['show_alert'] = show_alert
+        if self._metrics_age(raid) < REFRESH_FRESH_AGE:
+            REFRESH_PRESSES.labels('cached').inc()
+        else:
+            # Uncached, as the result is recorded as a sample taken now
+            current_metrics = await self.twitter_api.get_tweet_metrics(raid.tweet_id, fresh=True)
+            if current_metrics is None:
+                REFRESH_PRESSES.labels('failed').inc()
+            else:
+                REFRESH_PRESSES.labels('fetched').inc()
+                # Presses that shared the lookup find it already applied
+                if raid.is_active and self._metrics_age(raid) >= REFRESH_FRESH_AGE:
+                    for tweet_raid in self.raids.by_tweet(raid.tweet_id):
+                        await self._on_metrics(tweet_raid.raid_id, current_metrics)
         
-        try:
-            response = requests.post(url, json=payload)
-            return response.status_code == 200
-        except Exception as e:
-            logger.error(f"Error answering callback query: {e}")
-            return False
+        current, targets = raid.current_metrics, raid.targets
+        toast = (
+            f"❤️ {current['likes']}/{targets['likes']} "
+            f"🔄 {current['retweets']}/{targets['retweets']} "
+            f"💬 {current['comments']}/{targets['comments']} "
+            f"· updated {int(self._metrics_age(raid))}s ago"
+        )
+        await self._answer_callback_query(callback_query_id, toast)
+        return True, "Raid status refreshed."
+    
+    async def _answer_callback_query(self, callback_query_id, text=None, show_alert=False):
+        """Answer a callback query to stop the loading indicator"""
+        return await self.telegram.answer_callback_query(callback_query_id, text, show_alert)
     
     def get_active_raids_count(self, chat_id=None):
         """Get count of active raids, optionally filtered by chat_id"""
         if chat_id:
-            return sum(1 for raid in self.active_raids.values() 
-                      if raid['chat_id'] == chat_id and raid['is_active'])
-        return len(self.active_raids)
+            return self.raids.count_by_chat(chat_id)
+        return len(self.raids)
     
     def get_active_raids(self, chat_id=None):
         """Get list of active raids, optionally filtered by chat_id"""
         if chat_id:
-            return [raid for raid in self.active_raids.values() 
-                   if raid['chat_id'] == chat_id and raid['is_active']]
-        return list(self.active_raids.values())
+            return self.raids.by_chat(chat_id)
+        return self.raids.all()
     
-    def cancel_raid(self, chat_id, tweet_id=None):
-        """Cancel a raid or all raids in a chat"""
+    def _cancel_raid_by_id(self, raid_id):
+        """Cancel a single raid and replace its dashboard with a notice"""
+        # Mark raid as inactive and remove from active raids
+        raid = self._remove_raid(raid_id)
+        if not raid:
+            return False
+        RAID_OUTCOMES.labels('cancelled').inc()
+        
+        # Replace the status message with a cancellation message
+        self._queue_final_message(
+            raid,
+            f"🛑 *{BOT_NAME} - RAID CANCELLED*\n\nThis raid has been cancelled by a user."
+        )
+        return True
+    
+    async def cancel_raid(self, chat_id, tweet_id=None):
+        """Cancel a raid or all raids in a chat, queued ones included"""
         if tweet_id:
             # Cancel specific raid
             raid_id = f"{chat_id}_{tweet_id}"
-            if raid_id in self.active_raids:
-                # Delete the old status message
-                if self.active_raids[raid_id]['status_message_id']:
-                    self._delete_telegram_message(chat_id, self.active_raids[raid_id]['status_message_id'])
-                
-                # Send a cancellation message
-                self._send_telegram_message(
-                    chat_id=chat_id,
-                    text=f"🛑 *{BOT_NAME} - RAID CANCELLED*\n\nThis raid has been cancelled by a user."
-                )
-                
-                self.active_raids[raid_id]['is_active'] = False
-                del self.active_raids[raid_id]
+            if self.admission.remove(raid_id) or self._cancel_raid_by_id(raid_id):
                 return True, "Raid cancelled successfully."
             return False, "Raid not found."
         else:
-            # Cancel all raids in chat
-            cancelled = 0
-            for raid_id in list(self.active_raids.keys()):
-                if self.active_raids[raid_id]['chat_id'] == chat_id:
-                    # Delete the old status message
-                    if self.active_raids[raid_id]['status_message_id']:
-                        self._delete_telegram_message(chat_id, self.active_raids[raid_id]['status_message_id'])
-                    
-                    # Send a cancellation message
-                    self._send_telegram_message(
-                        chat_id=chat_id,
-                        text=f"🛑 *{BOT_NAME} - RAID CANCELLED*\n\nThis raid has been cancelled by a user."
-                    )
-                    
-                    self.active_raids[raid_id]['is_active'] = False
-                    del self.active_raids[raid_id]
-                    cancelled += 1
+            # Cancel all raids in chat, the queued ones first so none start in their place
+            cancelled = len(self.admission.remove_chat(chat_id))
+            cancelled += sum(self._cancel_raid_by_id(raid.raid_id) for raid in self.raids.by_chat(chat_id))
             
             if cancelled > 0:
                 return True, f"{cancelled} raid(s) cancelled successfully."
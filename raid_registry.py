@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Raid Registry
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import heapq
+import threading
+import clock
+from metrics_series import MetricsSeries
+from config import METRICS_SERIES_CAPACITY, METRICS_VELOCITY_WINDOW
+
+# Metrics tracked by every raid, in display order
+METRICS = ('likes', 'retweets', 'comments')
+
+class Raid:
+    """State of a single raid.
+
+    Slotted, with metrics and targets stored as plain ints; the targets and
+    current_metrics properties expose them as dicts for callers.
+    """
+
+    __slots__ = (
+        'raid_id', 'chat_id', 'tweet_id', 'tweet_url',
+        'start_time', 'end_time', 'status_message_id', 'is_active',
+        'update_count', 'last_repost', 'dashboard_hash', 'repost_due', 'series',
+        'likes', 'retweets', 'comments',
+        'target_likes', 'target_retweets', 'target_comments'
+    )
+
+    def __init__(self, raid_id, chat_id, tweet_id, tweet_url, targets, current_metrics, start_time, end_time):
+        """Initialize raid"""
+        self.raid_id = raid_id
+        self.chat_id = chat_id
+        self.tweet_id = tweet_id
+        self.tweet_url = tweet_url
+        self.start_time = start_time
+        self.end_time = end_time
+        self.status_message_id = None
+        self.is_active = True
+        self.update_count = 0  # Track number of updates
+        self.last_repost = 0  # update_count when the dashboard was last (re-)posted
+        self.dashboard_hash = None  # Hash of the last dashboard content sent
+        self.repost_due = False  # Next dashboard update re-posts instead of editing
+        self.targets = targets
+        self.series = MetricsSeries(METRICS_SERIES_CAPACITY, METRICS)  # Recent samples for velocity/ETA
+        self.record_metrics(current_metrics, start_time.timestamp())
+
+    @property
+    def targets(self):
+        """Get targets as a dict"""
+        return {'likes': self.target_likes, 'retweets': self.target_retweets, 'comments': self.target_comments}
+
+    @targets.setter
+    def targets(self, targets):
+        self.target_likes = targets['likes']
+        self.target_retweets = targets['retweets']
+        self.target_comments = targets['comments']
+
+    @property
+    def current_metrics(self):
+        """Get current metrics as a dict"""
+        return {'likes': self.likes, 'retweets': self.retweets, 'comments': self.comments}
+
+    @current_metrics.setter
+    def current_metrics(self, metrics):
+        self.likes = metrics['likes']
+        self.retweets = metrics['retweets']
+        self.comments = metrics['comments']
+
+    def record_metrics(self, metrics, timestamp=None):
+        """Set the current metrics and add them to the time series"""
+        self.current_metrics = metrics
+        self.series.append(clock.time() if timestamp is None else timestamp, metrics)
+
+    def velocity(self, metric):
+        """Get a metric's recent growth per minute, or None if unknown"""
+        velocity = self.series.velocity(metric, METRICS_VELOCITY_WINDOW)
+        return None if velocity is None else velocity * 60
+
+    def eta(self):
+        """Get projected seconds until every target is met
+
+        None if any unmet metric isn't growing at its recent pace.
+        """
+        etas = [
+            self.series.eta(metric, target, METRICS_VELOCITY_WINDOW)
+            for metric, target in self.targets.items()
+        ]
+        if None in etas:
+            return None
+        return max(etas)
+
+    def targets_met(self):
+        """Check whether every target has been reached"""
+        return (self.likes >= self.target_likes and
+                self.retweets >= self.target_retweets and
+                self.comments >= self.target_comments)
+
+class ChatDashboard:
+    """State of a chat's combined dashboard, one message for all its raids"""
+
+    __slots__ = ('chat_id', 'message_id', 'content_hash', 'update_count', 'repost_due', 'page')
+
+    def __init__(self, chat_id, message_id=None):
+        """Initialize dashboard, message_id is its existing message if any"""
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.content_hash = None  # Hash of the last content sent
+        self.update_count = 0  # Renders so far, for repost_every
+        self.repost_due = False  # Next render re-posts instead of editing
+        self.page = 0  # Page of raids shown, 0-based
+
+class RaidRegistry:
+    """Thread-safe store of active raids.
+
+    Keeps secondary indexes by chat and by tweet so per-chat lookups don't
+    scan every raid, plus an expiry heap ordered by end_time.
+    """
+
+    def __init__(self):
+        """Initialize registry"""
+        self._lock = threading.RLock()
+        self._raids = {}  # raid_id -> Raid
+        self._by_chat = {}  # chat_id -> {raid_id: Raid}, in start order
+        self._by_tweet = {}  # tweet_id -> {raid_id: Raid}
+        self._expiry = []  # (end_time, raid_id) heap, may contain removed raids
+
+    def add(self, raid):
+        """Register a raid, returns the raid it replaced (same ID) if any"""
+        with self._lock:
+            replaced = self.remove(raid.raid_id)
+            self._raids[raid.raid_id] = raid
+            self._by_chat.setdefault(raid.chat_id, {})[raid.raid_id] = raid
+            self._by_tweet.setdefault(raid.tweet_id, {})[raid.raid_id] = raid
+            heapq.heappush(self._expiry, (raid.end_time, raid.raid_id))
+            return replaced
+
+    def add_many(self, raids):
+        """Register several raids in one step, returns the raids they replaced
+
+        Other threads see either none or all of them.
+        """
+        with self._lock:
+            return [replaced for replaced in map(self.add, raids) if replaced]
+
+    def remove(self, raid_id):
+        """Unregister a raid, returns it or None if it wasn't registered"""
+        with self._lock:
+            raid = self._raids.pop(raid_id, None)
+            if raid is None:
+                return None
+            self._discard(self._by_chat, raid.chat_id, raid_id)
+            self._discard(self._by_tweet, raid.tweet_id, raid_id)
+            # Expiry heap entries are dropped lazily
+            if len(self._expiry) > 2 * len(self._raids) + 64:
+                self._expiry = [(r.end_time, r.raid_id) for r in self._raids.values()]
+                heapq.heapify(self._expiry)
+            return raid
+
+    @staticmethod
+    def _discard(index, key, raid_id):
+        """Remove a raid from a secondary index"""
+        raids = index.get(key)
+        if raids is not None:
+            raids.pop(raid_id, None)
+            if not raids:
+                del index[key]
+
+    def get(self, raid_id):
+        """Get a raid by ID"""
+        with self._lock:
+            return self._raids.get(raid_id)
+
+    def __contains__(self, raid_id):
+        with self._lock:
+            return raid_id in self._raids
+
+    def __len__(self):
+        with self._lock:
+            return len(self._raids)
+
+    def all(self):
+        """Get a snapshot of all raids"""
+        with self._lock:
+            return list(self._raids.values())
+
+    def by_chat(self, chat_id):
+        """Get a snapshot of a chat's raids, in start order"""
+        with self._lock:
+            return list(self._by_chat.get(chat_id, {}).values())
+
+    def count_by_chat(self, chat_id):
+        """Get number of raids in a chat"""
+        with self._lock:
+            return len(self._by_chat.get(chat_id, ()))
+
+    def by_tweet(self, tweet_id):
+        """Get a snapshot of the raids on a tweet"""
+        with self._lock:
+            return list(self._by_tweet.get(tweet_id, {}).values())
+
+    def chat_ids(self):
+        """Get the chats that have raids"""
+        with self._lock:
+            return list(self._by_chat)
+
+    def _prune_expiry(self):
+        """Drop heap entries whose raid is gone or was replaced"""
+        while self._expiry:
+            end_time, raid_id = self._expiry[0]
+            raid = self._raids.get(raid_id)
+            if raid is not None and raid.end_time == end_time:
+                return
+            heapq.heappop(self._expiry)
+
+    def next_expiry(self):
+        """Get the earliest end_time among registered raids, or None"""
+        with self._lock:
+            self._prune_expiry()
+            return self._expiry[0][0] if self._expiry else None
+
+    def pop_expired(self, now):
+        """Get the raids whose end_time has passed, in expiry order
+
+        Raids stay registered; callers remove them as they end them.
+        """
+        with self._lock:
+            expired = {}
+            self._prune_expiry()
+            while self._expiry and self._expiry[0][0] <= now:
+                _, raid_id = heapq.heappop(self._expiry)
+                raid = self._raids.get(raid_id)
+                if raid is not None and raid.end_time <= now:
+                    expired[raid_id] = raid
+                self._prune_expiry()
+            return list(expired.values())
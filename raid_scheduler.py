@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Raid Scheduler
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import heapq
+import itertools
+import logging
+import clock
+from monitoring import SCHEDULER_LAG
+
+logger = logging.getLogger(__name__)
+
+class RaidScheduler:
+    """Deadline-heap scheduler that drives every raid from one coroutine.
+
+    Jobs are keyed (e.g. ``('tick', raid_id)`` or ``('expire', raid_id)``);
+    scheduling a key again replaces its previous deadline. All methods must be
+    called from the event loop thread.
+    """
+
+    def __init__(self):
+        """Initialize scheduler state"""
+        self._heap = []  # (deadline, seq, key) entries, may contain stale ones
+        self._jobs = {}  # key -> (deadline, seq, callback, args)
+        self._counter = itertools.count()
+        self._wakeup = None
+        self._task = None
+        self._running = set()  # Job tasks currently in flight
+
+    def schedule(self, key, delay, callback, *args):
+        """Run coroutine function callback(*args) after delay seconds"""
+        deadline = clock.monotonic() + max(delay, 0)
+        seq = next(self._counter)
+        self._jobs[key] = (deadline, seq, callback, args)
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+        # Drop cancelled/replaced entries once they dominate the heap
+        if len(self._heap) > 2 * len(self._jobs) + 64:
+            self._compact()
+
+        # Wake the loop if this job is now the earliest one
+        if self._heap[0][1] == seq:
+            self._wake()
+
+    def cancel(self, key):
+        """Cancel a scheduled job, returns True if it was pending"""
+        return self._jobs.pop(key, None) is not None
+
+    def is_scheduled(self, key):
+        """Check whether a job is pending for key"""
+        return key in self._jobs
+
+    def time_until(self, key):
+        """Seconds until the job for key is due, or None if not scheduled"""
+        job = self._jobs.get(key)
+        if job is None:
+            return None
+        return max(job[0] - clock.monotonic(), 0)
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def _compact(self):
+        """Rebuild the heap from live jobs only"""
+        self._heap = [(deadline, seq, key) for key, (deadline, seq, _, _) in self._jobs.items()]
+        heapq.heapify(self._heap)
+
+    def start(self):
+        """Start the scheduler coroutine on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Raid scheduler started")
+
+    async def stop(self):
+        """Stop the scheduler and cancel in-flight jobs"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(self._task, *self._running, return_exceptions=True)
+        self._task = None
+        self._wakeup = None
+        logger.info("Raid scheduler stopped")
+
+    def _wake(self):
+        """Wake the scheduler coroutine if it is waiting"""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _run(self):
+        """Pop due jobs off the heap and run each one as a task"""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = clock.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, seq, key = heapq.heappop(self._heap)
+                job = self._jobs.get(key)
+                if job is None or job[1] != seq:
+                    continue  # Cancelled or rescheduled
+                del self._jobs[key]
+                SCHEDULER_LAG.observe(now - deadline)
+                task = asyncio.create_task(self._run_job(key, job[2], job[3]))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            # Wait on a bare future rather than wait_for(), which can swallow
+            # a cancel arriving together with a wakeup and keep stop() hanging
+            self._wakeup = loop.create_future()
+            timer = loop.call_later(self._heap[0][0] - now, self._wake) if self._heap else None
+            try:
+                await self._wakeup
+            finally:
+                if timer is not None:
+                    timer.cancel()
+
+    async def _run_job(self, key, callback, args):
+        """Run a single job, keeping failures away from the scheduler loop"""
+        try:
+            await callback(*args)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Error running scheduled job %s: %s", key, e)
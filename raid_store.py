@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Raid State Store
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from raid_registry import Raid
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS raids (
+    raid_id TEXT PRIMARY KEY,
+    chat_id INTEGER NOT NULL,
+    tweet_id TEXT NOT NULL,
+    tweet_url TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    status_message_id INTEGER,
+    update_count INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    retweets INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    target_likes INTEGER NOT NULL,
+    target_retweets INTEGER NOT NULL,
+    target_comments INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chat_settings (
+    chat_id INTEGER PRIMARY KEY,
+    dashboard_mode TEXT NOT NULL,
+    repost_every INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chat_dashboards (
+    chat_id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS engager_cursors (
+    tweet_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    token TEXT,
+    since_id TEXT,
+    newest_id TEXT,
+    synced INTEGER,
+    scan_count INTEGER NOT NULL,
+    PRIMARY KEY (tweet_id, metric)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS engagers (
+    tweet_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    credited INTEGER NOT NULL,
+    PRIMARY KEY (tweet_id, metric, user_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS twitter_users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT
+);
+CREATE TABLE IF NOT EXISTS chat_scores (
+    chat_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (chat_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS engagers_by_user ON engagers (user_id);
+CREATE INDEX IF NOT EXISTS chat_scores_by_user ON chat_scores (user_id);
+"""
+
+UPSERT_RAID = "INSERT OR REPLACE INTO raids VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+DELETE_RAID = "DELETE FROM raids WHERE raid_id = ?"
+UPSERT_CHAT_SETTINGS = "INSERT OR REPLACE INTO chat_settings VALUES (?, ?, ?)"
+UPSERT_CHAT_DASHBOARD = "INSERT OR REPLACE INTO chat_dashboards VALUES (?, ?)"
+DELETE_CHAT_DASHBOARD = "DELETE FROM chat_dashboards WHERE chat_id = ?"
+INSERT_ENGAGER = "INSERT OR IGNORE INTO engagers VALUES (?, ?, ?, ?)"
+UPSERT_ENGAGER_CURSOR = "INSERT OR REPLACE INTO engager_cursors VALUES (?, ?, ?, ?, ?, ?, ?)"
+DELETE_ENGAGERS = "DELETE FROM engagers WHERE tweet_id = ?"
+DELETE_ENGAGER_CURSORS = "DELETE FROM engager_cursors WHERE tweet_id = ?"
+UPSERT_TWITTER_USER = "INSERT OR REPLACE INTO twitter_users VALUES (?, ?)"
+UPSERT_CHAT_SCORE = "INSERT OR REPLACE INTO chat_scores VALUES (?, ?, ?)"
+DELETE_CHAT_SCORES = "DELETE FROM chat_scores WHERE chat_id = ?"
+DELETE_CHAT_RAIDS = "DELETE FROM raids WHERE chat_id = ?"
+DELETE_CHAT_SETTINGS = "DELETE FROM chat_settings WHERE chat_id = ?"
+DELETE_ORPHAN_ENGAGERS = "DELETE FROM engagers WHERE tweet_id NOT IN (SELECT tweet_id FROM raids)"
+DELETE_ORPHAN_ENGAGER_CURSORS = "DELETE FROM engager_cursors WHERE tweet_id NOT IN (SELECT tweet_id FROM raids)"
+SELECT_ENGAGER_USERS = "SELECT user_id FROM engagers WHERE tweet_id = ?"
+SELECT_CHAT_SCORE_USERS = "SELECT user_id FROM chat_scores WHERE chat_id = ?"
+DELETE_UNREFERENCED_USER = (
+    "DELETE FROM twitter_users WHERE user_id = ?1"
+    " AND NOT EXISTS (SELECT 1 FROM engagers WHERE user_id = ?1)"
+    " AND NOT EXISTS (SELECT 1 FROM chat_scores WHERE user_id = ?1)"
+)
+DELETE_ORPHAN_TWITTER_USERS = (
+    "DELETE FROM twitter_users WHERE user_id NOT IN (SELECT user_id FROM engagers)"
+    " AND user_id NOT IN (SELECT user_id FROM chat_scores)"
+)
+
+def raid_to_row(raid):
+    """Convert a raid to a raids table row"""
+    return (
+        raid.raid_id, raid.chat_id, raid.tweet_id, raid.tweet_url,
+        raid.start_time.timestamp(), raid.end_time.timestamp(),
+        raid.status_message_id, raid.update_count,
+        raid.likes, raid.retweets, raid.comments,
+        raid.target_likes, raid.target_retweets, raid.target_comments
+    )
+
+def raid_from_row(row):
+    """Rebuild a raid from a raids table row"""
+    (raid_id, chat_id, tweet_id, tweet_url, start_time, end_time, status_message_id,
+     update_count, likes, retweets, comments, target_likes, target_retweets, target_comments) = row
+    raid = Raid(
+        raid_id,
+        chat_id,
+        tweet_id,
+        tweet_url,
+        {'likes': target_likes, 'retweets': target_retweets, 'comments': target_comments},
+        {'likes': likes, 'retweets': retweets, 'comments': comments},
+        datetime.fromtimestamp(start_time),
+        datetime.fromtimestamp(end_time)
+    )
+    raid.status_message_id = status_message_id
+    raid.update_count = update_count
+    raid.last_repost = update_count  # Re-post cadence restarts from here
+    return raid
+
+class RaidStore:
+    """SQLite-backed copy of the raid registry, written behind.
+
+    Callers only mark raids dirty; flush() writes the current state of every
+    dirty raid (or deletes it if it's no longer registered) in one
+    transaction. The database runs in WAL mode so flushes don't block reads
+    and a crash loses at most the last flush interval.
+    """
+
+    def __init__(self, path):
+        """Open (or create) the store at path"""
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()  # Flushes run on worker threads
+        self._dirty_raids = set()
+        self._dirty_chats = {}  # chat_id -> (dashboard_mode, repost_every)
+        self._dirty_dashboards = {}  # chat_id -> combined dashboard message_id, or None to delete
+        self._new_engagers = []  # (tweet_id, metric, user_id, credited) rows
+        self._dirty_cursors = {}  # (tweet_id, metric) -> engager_cursors row
+        self._dropped_tweets = set()  # Tweets whose engager state is deleted before the new rows are written
+        self._dirty_users = {}  # user_id -> username
+        self._dirty_scores = {}  # (chat_id, user_id) -> points
+        self._dropped_score_chats = set()  # Chats whose scores are deleted before the new rows are written
+
+        # Stats
+        self.flushes = 0
+        self.rows_written = 0
+
+    def mark_dirty(self, raid_id):
+        """Queue a raid's current state to be written on the next flush"""
+        self._dirty_raids.add(raid_id)
+
+    def save_chat_settings(self, chat_id, dashboard_mode, repost_every):
+        """Queue a chat's dashboard settings to be written on the next flush"""
+        self._dirty_chats[chat_id] = (dashboard_mode, repost_every)
+
+    def save_chat_dashboard(self, chat_id, message_id):
+        """Queue a chat's combined dashboard message (None once it's gone) to be written on the next flush"""
+        self._dirty_dashboards[chat_id] = message_id
+
+    def save_users(self, users):
+        """Queue Twitter handles, {user_id: username}, to be written on the next flush"""
+        self._dirty_users.update(users)
+
+    def save_engagers(self, rows):
+        """Queue new engagers, (tweet_id, metric, user_id, credited) rows"""
+        self._new_engagers.extend(rows)
+
+    def save_engager_cursor(self, row):
+        """Queue a tweet's engager sync state, an engager_cursors row"""
+        self._dirty_cursors[row[0], row[1]] = row
+
+    def drop_engagers(self, tweet_id):
+        """Queue deleting a tweet's engagers and sync state"""
+        self._new_engagers = [row for row in self._new_engagers if row[0] != tweet_id]
+        for key in [key for key in self._dirty_cursors if key[0] == tweet_id]:
+            del self._dirty_cursors[key]
+        self._dropped_tweets.add(tweet_id)
+
+    def save_chat_score(self, chat_id, user_id, points):
+        """Queue a raider's leaderboard points in a chat to be written on the next flush"""
+        self._dirty_scores[chat_id, user_id] = points
+
+    def drop_chat_scores(self, chat_id):
+        """Queue deleting a chat's leaderboard"""
+        for key in [key for key in self._dirty_scores if key[0] == chat_id]:
+            del self._dirty_scores[key]
+        self._dropped_score_chats.add(chat_id)
+
+    def has_pending(self):
+        """Check whether there are unflushed changes"""
+        return bool(
+            self._dirty_raids or self._dirty_chats or self._dirty_dashboards or self._new_engagers
+            or self._dirty_cursors or self._dropped_tweets or self._dirty_scores or self._dropped_score_chats
+        )
+
+    def take_pending(self, registry):
+        """Snapshot and clear the pending changes
+
+        Returns (upserts, deletes, chat_settings, chat_dashboards,
+        engagement) for flush(). Must be called from the thread that
+        mutates the raids, so the rows are consistent.
+        """
+        upserts, deletes = [], []
+        for raid_id in self._dirty_raids:
+            raid = registry.get(raid_id)
+            if raid is not None:
+                upserts.append(raid_to_row(raid))
+            else:
+                deletes.append((raid_id,))
+        chat_settings = [(chat_id, mode, every) for chat_id, (mode, every) in self._dirty_chats.items()]
+        chat_dashboards = list(self._dirty_dashboards.items())
+        engagement = (
+            [(tweet_id,) for tweet_id in self._dropped_tweets],
+            self._new_engagers,
+            list(self._dirty_cursors.values()),
+            list(self._dirty_users.items()),
+            [(chat_id,) for chat_id in self._dropped_score_chats],
+            [(chat_id, user_id, points) for (chat_id, user_id), points in self._dirty_scores.items()]
+        )
+        self._dirty_raids = set()
+        self._dirty_chats = {}
+        self._dirty_dashboards = {}
+        self._new_engagers = []
+        self._dirty_cursors = {}
+        self._dropped_tweets = set()
+        self._dirty_users = {}
+        self._dirty_scores = {}
+        self._dropped_score_chats = set()
+        return upserts, deletes, chat_settings, chat_dashboards, engagement
+
+    def flush(self, upserts, deletes, chat_settings, chat_dashboards=(), engagement=((), (), (), (), (), ())):
+        """Write a snapshot from take_pending() in a single transaction"""
+        if not (upserts or deletes or chat_settings or chat_dashboards or any(engagement)):
+            return
+        dropped_tweets, engagers, cursors, users, dropped_score_chats, scores = engagement
+        with self._lock, self._conn:
+            # Users of dropped rows, deleted last unless other rows still reference them
+            released = {
+                row for query, keys in ((SELECT_ENGAGER_USERS, dropped_tweets), (SELECT_CHAT_SCORE_USERS, dropped_score_chats))
+                for key in keys for row in self._conn.execute(query, key)
+            }
+            self._conn.executemany(UPSERT_RAID, upserts)
+            self._conn.executemany(DELETE_RAID, deletes)
+            self._conn.executemany(UPSERT_CHAT_SETTINGS, chat_settings)
+            self._conn.executemany(UPSERT_CHAT_DASHBOARD, [row for row in chat_dashboards if row[1] is not None])
+            self._conn.executemany(DELETE_CHAT_DASHBOARD, [(chat_id,) for chat_id, message_id in chat_dashboards if message_id is None])
+            # Deletes first, so rows saved after a drop survive it
+            self._conn.executemany(DELETE_ENGAGERS, dropped_tweets)
+            self._conn.executemany(DELETE_ENGAGER_CURSORS, dropped_tweets)
+            self._conn.executemany(INSERT_ENGAGER, engagers)
+            self._conn.executemany(UPSERT_ENGAGER_CURSOR, cursors)
+            self._conn.executemany(UPSERT_TWITTER_USER, users)
+            self._conn.executemany(DELETE_CHAT_SCORES, dropped_score_chats)
+            self._conn.executemany(UPSERT_CHAT_SCORE, scores)
+            self._conn.executemany(DELETE_UNREFERENCED_USER, released)
+        self.flushes += 1
+        self.rows_written += len(upserts) + len(deletes) + len(chat_settings) + len(chat_dashboards)
+        self.rows_written += sum(map(len, engagement))
+
+    def load_raids(self):
+        """Load every stored raid, expired ones included"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM raids ORDER BY start_time").fetchall()
+        return [raid_from_row(row) for row in rows]
+
+    def load_chat_settings(self):
+        """Load every chat's stored dashboard settings"""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM chat_settings").fetchall()
+        return {
+            chat_id: {'dashboard_mode': mode, 'repost_every': repost_every}
+            for chat_id, mode, repost_every in rows
+        }
+
+    def load_chat_dashboards(self):
+        """Load every chat's combined dashboard message ID"""
+        with self._lock:
+            return dict(self._conn.execute("SELECT * FROM chat_dashboards").fetchall())
+
+    def load_engagers(self):
+        """Load every tweet's engager sync state, returns (cursor rows, engager rows)
+
+        Engager rows are (tweet_id, metric, user_id, username, credited).
+        """
+        with self._lock:
+            cursors = self._conn.execute("SELECT * FROM engager_cursors").fetchall()
+            engagers = self._conn.execute(
+                "SELECT tweet_id, metric, user_id, username, credited FROM engagers LEFT JOIN twitter_users USING (user_id)"
+            ).fetchall()
+        return cursors, engagers
+
+    def load_chat_scores(self):
+        """Load every chat's leaderboard as (chat_id, user_id, username, points) rows"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT chat_id, user_id, username, points FROM chat_scores LEFT JOIN twitter_users USING (user_id)"
+            ).fetchall()
+
+    def take_chats(self, owns):
+        """Load and delete every chat owns(chat_id) accepts, for taking over a dead shard's store
+
+        Reading and deleting happen in one transaction, so a chat is taken
+        by exactly one shard and comes back to nobody if this store's own
+        worker restarts. Engager state left without a raid, and Twitter users
+        no longer referenced, are deleted too.
+        Returns (raids, chat_settings, chat_dashboards, chat score rows) as
+        the load_* methods do.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")  # Hold the write lock from the first read
+            raids = [
+                raid_from_row(row)
+                for row in self._conn.execute("SELECT * FROM raids ORDER BY start_time").fetchall()
+                if owns(row[1])
+            ]
+            chat_settings = {
+                chat_id: {'dashboard_mode': mode, 'repost_every': repost_every}
+                for chat_id, mode, repost_every in self._conn.execute("SELECT * FROM chat_settings").fetchall()
+                if owns(chat_id)
+            }
+            chat_dashboards = {
+                chat_id: message_id
+                for chat_id, message_id in self._conn.execute("SELECT * FROM chat_dashboards").fetchall()
+                if owns(chat_id)
+            }
+            chat_scores = [
+                row for row in self._conn.execute(
+                    "SELECT chat_id, user_id, username, points FROM chat_scores LEFT JOIN twitter_users USING (user_id)"
+                ).fetchall()
+                if owns(row[0])
+            ]
+            chat_ids = [(chat_id,) for chat_id in {raid.chat_id for raid in raids}.union(
+                chat_settings, chat_dashboards, (row[0] for row in chat_scores)
+            )]
+            self._conn.executemany(DELETE_CHAT_RAIDS, chat_ids)
+            self._conn.executemany(DELETE_CHAT_SETTINGS, chat_ids)
+            self._conn.executemany(DELETE_CHAT_DASHBOARD, chat_ids)
+            self._conn.executemany(DELETE_CHAT_SCORES, chat_ids)
+            self._conn.execute(DELETE_ORPHAN_ENGAGERS)
+            self._conn.execute(DELETE_ORPHAN_ENGAGER_CURSORS)
+            self._conn.execute(DELETE_ORPHAN_TWITTER_USERS)
+        return raids, chat_settings, chat_dashboards, chat_scores
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Twitter Rate Limit Budget
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import logging
+import threading
+import clock
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBudget:
+    """Tracks the remaining Twitter requests per endpoint.
+
+    Windows are learned from the x-rate-limit-* response headers. Until an
+    endpoint has been seen its budget is unknown and callers are not
+    throttled. Updates arrive from worker threads, so state is lock-guarded.
+    """
+
+    def __init__(self, reserve=0):
+        """Initialize budget
+
+        reserve: requests per window kept back for interactive calls
+        """
+        self.reserve = reserve
+        self.share = 1.0  # Fraction of each window this process may spend (shard workers split it)
+        self._windows = {}  # endpoint -> {'limit', 'remaining', 'reset'}
+        self._lock = threading.Lock()
+
+    def update_from_headers(self, endpoint, headers):
+        """Record the rate-limit window reported by a response"""
+        try:
+            limit = int(headers['x-rate-limit-limit'])
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset = float(headers['x-rate-limit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self._windows[endpoint] = {'limit': limit, 'remaining': remaining, 'reset': reset}
+
+    def mark_exhausted(self, endpoint, reset=None):
+        """Record that an endpoint returned 429 Too Many Requests"""
+        with self._lock:
+            window = self._windows.setdefault(
+                endpoint, {'limit': 0, 'remaining': 0, 'reset': clock.time() + 15 * 60}
+            )
+            window['remaining'] = 0
+            if reset:
+                window['reset'] = float(reset)
+        logger.warning("Twitter rate limit exhausted for %s", endpoint)
+
+    def _window(self, endpoint):
+        """Get the current window for an endpoint, or None if unknown/expired"""
+        window = self._windows.get(endpoint)
+        if window is None or clock.time() >= window['reset']:
+            return None
+        return window
+
+    def remaining(self, endpoint):
+        """Get requests left in the current window, or None if unknown"""
+        with self._lock:
+            window = self._window(endpoint)
+            return None if window is None else window['remaining']
+
+    def reset_in(self, endpoint):
+        """Get seconds until the endpoint's window resets, or 0 if unknown"""
+        with self._lock:
+            window = self._window(endpoint)
+            return 0 if window is None else max(window['reset'] - clock.time(), 0)
+
+    def pressure(self, endpoint):
+        """Get fraction of the window already used (0.0 - 1.0)"""
+        with self._lock:
+            window = self._window(endpoint)
+            if window is None or window['limit'] <= 0:
+                return 0.0 if window is None else 1.0
+            return 1 - window['remaining'] / window['limit']
+
+    def usable(self, endpoint):
+        """Get requests left after the reserve, or None if unknown"""
+        with self._lock:
+            window = self._window(endpoint)
+            return None if window is None else max(window['remaining'] - self.reserve, 0)
+
+    def allowance(self, endpoint, seconds):
+        """Get how many requests may be spent over the next seconds
+
+        This process's share of the usable budget is spread evenly over the
+        rest of the window so polling never burns through it early. The result is fractional so
+        callers can accumulate it; None means the budget is unknown.
+        """
+        with self._lock:
+            window = self._window(endpoint)
+            if window is None:
+                return None
+            usable = max(window['remaining'] - self.reserve, 0)
+            reset_in = max(window['reset'] - clock.time(), 1)
+            return usable * self.share * min(seconds / reset_in, 1)
+
+    def get_stats(self):
+        """Get a snapshot of all known endpoint windows"""
+        with self._lock:
+            now = clock.time()
+            return {
+                endpoint: {
+                    'limit': window['limit'],
+                    'remaining': window['remaining'],
+                    'reset_in': max(window['reset'] - now, 0)
+                }
+                for endpoint, window in self._windows.items()
+            }
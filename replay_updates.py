@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Webhook Update Replay
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Replay recorded updates against a bot running in webhook mode.
+
+Serves a stub Telegram Bot API that records the bot's calls, POSTs each
+recorded update to the webhook and measures how long the bot takes to
+react to it (its first Bot API call for that chat or callback query).
+
+1. Record updates: run the bot with UPDATE_RECORD_PATH=updates.jsonl
+2. Start the replay (it serves the stub API):
+       python replay_updates.py updates.jsonl --secret <WEBHOOK_SECRET_TOKEN>
+3. Start the bot against the stub:
+       BOT_MODE=webhook WEBHOOK_SECRET_TOKEN=<token> \\
+       TELEGRAM_API_BASE_URL=http://127.0.0.1:8081/bot python bot.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from aiohttp import ClientError, ClientSession, web
+
+# Returned by the stub for getMe
+STUB_BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'Replay Stub', 'username': 'replay_stub_bot'}
+
+# Bot API methods that return the sent or edited message
+MESSAGE_METHODS = ('sendMessage', 'editMessageText', 'editMessageReplyMarkup', 'sendDocument')
+
+class StubBotAPI:
+    """Minimal in-memory Telegram Bot API for the bot under test"""
+
+    def __init__(self):
+        """Initialize stub"""
+        self.calls = []  # (monotonic time, method, params)
+        self.webhook_set = asyncio.Event()
+        self._message_ids = iter(range(1, 1 << 62))
+        self._waiters = {}  # ('chat', chat_id) or ('callback', query_id) -> future
+
+    def wait_for(self, key):
+        """Get a future resolving to the time of the next call matching key"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[key] = future
+        return future
+
+    def _resolve(self, key, when):
+        """Resolve the waiter for key, if any"""
+        future = self._waiters.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(when)
+
+    async def handle(self, request):
+        """Answer one Bot API call"""
+        when = time.monotonic()
+        method = request.match_info['method']
+        params = dict(await request.post())
+        if not params and request.can_read_body:
+            params = await request.json()
+        self.calls.append((when, method, params))
+
+        if 'chat_id' in params:
+            self._resolve(('chat', str(params['chat_id'])), when)
+        if method == 'answerCallbackQuery':
+            self._resolve(('callback', str(params.get('callback_query_id'))), when)
+        if method == 'setWebhook':
+            self.webhook_set.set()
+
+        if method == 'getMe':
+            result = STUB_BOT_USER
+        elif method in MESSAGE_METHODS:
+            result = {
+                'message_id': int(params.get('message_id') or next(self._message_ids)),
+                'date': int(time.time()),
+                'chat': {'id': int(params.get('chat_id', 0)), 'type': 'supergroup'},
+                'text': params.get('text', '')
+            }
+        else:
+            result = True
+        return web.json_response({'ok': True, 'result': result})
+
+def update_key(update):
+    """Get the stub waiter key for the bot's reaction to an update"""
+    if 'callback_query' in update:
+        return ('callback', str(update['callback_query']['id']))
+    message = update.get('message') or update.get('edited_message') or {}
+    return ('chat', str(message.get('chat', {}).get('id')))
+
+def percentile(values, pct):
+    """Get the pct-th percentile of values (nearest rank)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+async def replay(args):
+    """Serve the stub API, replay every update and print latency stats"""
+    with open(args.updates) as f:
+        updates = [json.loads(line) for line in f if line.strip()]
+
+    stub = StubBotAPI()
+    app = web.Application()
+    app.router.add_post('/bot{token}/{method}', stub.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, args.api_host, args.api_port).start()
+    print(f"Stub Bot API on http://{args.api_host}:{args.api_port}/bot, waiting for the bot to set its webhook...")
+    await stub.webhook_set.wait()
+
+    headers = {'X-Telegram-Bot-Api-Secret-Token': args.secret} if args.secret else {}
+    ack_times, react_times, statuses, timeouts = [], [], {}, 0
+    async with ClientSession() as session:
+        for update_id, update in enumerate(updates, 1):
+            update = dict(update, update_id=update_id)
+            reaction = stub.wait_for(update_key(update))
+            started = time.monotonic()
+            for attempt in range(50):
+                try:
+                    async with session.post(args.webhook_url, json=update, headers=headers) as response:
+                        status = response.status
+                    break
+                except ClientError:
+                    await asyncio.sleep(0.1)  # Webhook server still starting
+            else:
+                raise SystemExit(f"Webhook {args.webhook_url} is not reachable")
+            ack_times.append(time.monotonic() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status != 200:
+                reaction.cancel()
+                continue
+            try:
+                react_times.append(await asyncio.wait_for(reaction, args.timeout) - started)
+            except asyncio.TimeoutError:
+                timeouts += 1
+
+    await runner.cleanup()
+
+    print(f"Replayed {len(updates)} updates, HTTP statuses: {statuses}, no reaction within {args.timeout}s: {timeouts}")
+    for name, values in (('webhook ack', ack_times), ('handler reaction', react_times)):
+        print(
+            f"{name:>16}: p50 {percentile(values, 50) * 1000:.1f}ms, p90 {percentile(values, 90) * 1000:.1f}ms, "
+            f"p99 {percentile(values, 99) * 1000:.1f}ms, max {max(values, default=0) * 1000:.1f}ms"
+        )
+    print(f"Bot API calls made by the bot: {len(stub.calls)}")
+
+def main():
+    """Parse arguments and run the replay"""
+    parser = argparse.ArgumentParser(description="Replay recorded Telegram updates against the bot's webhook")
+    parser.add_argument('updates', help="JSON lines file of recorded updates (see UPDATE_RECORD_PATH)")
+    parser.add_argument('--webhook-url', default='http://127.0.0.1:8443/telegram', help="URL the bot's webhook listens on")
+    parser.add_argument('--secret', help="the bot's WEBHOOK_SECRET_TOKEN")
+    parser.add_argument('--api-host', default='127.0.0.1', help="interface for the stub Bot API")
+    parser.add_argument('--api-port', type=int, default=8081, help="port for the stub Bot API")
+    parser.add_argument('--timeout', type=float, default=5.0, help="seconds to wait for the bot to react to an update")
+    asyncio.run(replay(parser.parse_args()))
+
+if __name__ == '__main__':
+    main()
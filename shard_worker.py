@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Shard Worker
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Runs the raids of one shard of chats, for the front process (bot.py).
+
+Start one per shard, each with its own raid store, and list their
+addresses in the front process's SHARD_WORKERS:
+
+    python shard_worker.py --listen unix:/run/raider/0.sock --store raids-0.db
+    python shard_worker.py --listen tcp:0.0.0.0:7301 --store /shared/raids-1.db --metrics-port 9465
+
+Workers send dashboards with their own connection pool to the Bot API.
+They own no chats until the front process's router assigns them some.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+from config import SHARD_SECRET
+from logging_setup import configure_logging
+from monitoring import start_metrics_server
+from raid_manager import RaidManager
+from sharding import TCP_PREFIX, ShardWorker
+from telegram_client import application_builder
+
+logger = logging.getLogger(__name__)
+
+async def serve(listen, store_path, metrics_port=0, metrics_listen='127.0.0.1'):
+    """Run a worker until SIGINT or SIGTERM"""
+    if listen.startswith(TCP_PREFIX) and not SHARD_SECRET:
+        logger.error("SHARD_SECRET must be set for workers listening on TCP")
+        return
+    if metrics_port:
+        start_metrics_server(metrics_port, metrics_listen)
+
+    application = application_builder().build()
+    await application.initialize()
+    manager = RaidManager(store_path)
+    await manager.start(application, restore=False)
+    server = await ShardWorker(manager).serve(listen)
+    logger.info("Raid worker listening on %s with store %s", listen, store_path)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+    await stopping.wait()
+
+    logger.info("Raid worker stopping")
+    server.close()
+    await server.wait_closed()
+    await manager.stop()
+    await application.shutdown()
+
+def main():
+    """Run a shard worker from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--listen', required=True, help="unix:/path or tcp:host:port to accept the front process on")
+    parser.add_argument('--store', required=True, help="this worker's raid store (SQLite file)")
+    parser.add_argument('--metrics-port', type=int, default=0, help="serve Prometheus /metrics on this port (0 = off)")
+    parser.add_argument('--metrics-listen', default='127.0.0.1', help="interface serving /metrics")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(serve(args.listen, args.store, args.metrics_port, args.metrics_listen))
+
+if __name__ == '__main__':
+    main()
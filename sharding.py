@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Raid Sharding
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Raids partitioned by chat across worker processes.
+
+Each chat is owned by one shard worker (a RaidManager in its own process,
+see shard_worker.py), picked by rendezvous hashing of the chat_id over the
+live workers. The front process keeps receiving Telegram updates and its
+ShardRouter forwards raid calls to the owning worker over a transport:
+JSON lines on a Unix or TCP socket, or LocalTransport, an in-process
+stand-in used when no workers are configured.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import os
+import uuid
+from raid_manager import RaidManager
+from raid_store import raid_from_row, raid_to_row
+from raid_admission import queued_from_row, queued_to_row
+from config import (
+    SHARD_SECRET,
+    SHARD_REQUEST_TIMEOUT,
+    SHARD_HEARTBEAT_INTERVAL,
+    SHARD_HEARTBEAT_MISSES
+)
+
+logger = logging.getLogger(__name__)
+
+# Worker address schemes
+UNIX_PREFIX = 'unix:'
+TCP_PREFIX = 'tcp:'
+LOCAL_ADDRESS = 'local'  # The in-process worker
+
+# Largest JSON line accepted, handoffs carry every raid of the moved chats
+MESSAGE_LIMIT = 64 * 1024 * 1024
+
+class ShardError(Exception):
+    """A shard worker failed a request"""
+
+class ShardUnavailable(ShardError):
+    """The worker owning a chat can't be reached"""
+
+def shard_owner(chat_id, members):
+    """Pick the worker that owns a chat
+
+    Rendezvous hashing: every member scores the chat and the highest score
+    wins, so losing a member only moves its own chats and adding one only
+    takes over the chats it now wins.
+    """
+    if not members:
+        raise ShardUnavailable("no raid workers are up")
+    return max(members, key=lambda member: hashlib.blake2b(f"{member}/{chat_id}".encode(), digest_size=8).digest())
+
+def _encode(message):
+    """Encode a message as one JSON line"""
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+async def open_connection(address):
+    """Connect to a worker at 'unix:/path' or 'tcp:host:port'"""
+    if address.startswith(UNIX_PREFIX):
+        return await asyncio.open_unix_connection(address[len(UNIX_PREFIX):], limit=MESSAGE_LIMIT)
+    if address.startswith(TCP_PREFIX):
+        host, _, port = address[len(TCP_PREFIX):].rpartition(':')
+        return await asyncio.open_connection(host, int(port), limit=MESSAGE_LIMIT)
+    raise ValueError(f"Unknown shard address {address!r}, use unix:/path or tcp:host:port")
+
+async def start_server(address, handle_connection):
+    """Listen for the front process at 'unix:/path' or 'tcp:host:port'"""
+    if address.startswith(UNIX_PREFIX):
+        path = address[len(UNIX_PREFIX):]
+        if os.path.exists(path):
+            os.unlink(path)  # Stale socket from an earlier run
+        return await asyncio.start_unix_server(handle_connection, path, limit=MESSAGE_LIMIT)
+    if address.startswith(TCP_PREFIX):
+        host, _, port = address[len(TCP_PREFIX):].rpartition(':')
+        return await asyncio.start_server(handle_connection, host, int(port), limit=MESSAGE_LIMIT)
+    raise ValueError(f"Unknown shard address {address!r}, use unix:/path or tcp:host:port")
+
+class SocketTransport:
+    """Connection to a remote shard worker.
+
+    Requests are multiplexed over one connection by ID, so a slow bulk
+    launch doesn't hold up other chats' calls. The connection is reopened
+    on the next request after it drops.
+    """
+
+    def __init__(self, address, secret=SHARD_SECRET, timeout=SHARD_REQUEST_TIMEOUT):
+        """Initialize transport for the worker at address"""
+        self.address = address
+        self.secret = secret
+        self.timeout = timeout
+        self._writer = None
+        self._reader_task = None
+        self._connect_lock = asyncio.Lock()
+        self._pending = {}  # request ID -> future for its response
+        self._ids = itertools.count()
+
+    async def _connect(self):
+        """Open the connection and present the shared secret, if not connected"""
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            reader, writer = await open_connection(self.address)
+            writer.write(_encode({'auth': self.secret}))
+            self._writer = writer
+            self._reader_task = asyncio.create_task(self._read_responses(reader, writer))
+
+    async def _read_responses(self, reader, writer):
+        """Resolve pending requests as their responses arrive"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.get(response['id'])
+                if future is None or future.done():
+                    continue
+                if 'error' in response:
+                    future.set_exception(ShardError(f"{self.address}: {response['error']}"))
+                else:
+                    future.set_result(response['result'])
+        except (OSError, ValueError) as e:
+            logger.warning("Connection to shard %s failed: %s", self.address, e)
+        finally:
+            if self._writer is writer:
+                self._writer = None
+            writer.close()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ShardUnavailable(f"lost connection to {self.address}"))
+
+    async def request(self, method, params):
+        """Call a worker method and wait for its result"""
+        try:
+            await self._connect()
+        except OSError as e:
+            raise ShardUnavailable(f"can't reach {self.address}: {e}") from e
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(_encode({'id': request_id, 'method': method, 'params': params}))
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError as e:
+            raise ShardUnavailable(f"{self.address} didn't answer {method} in time") from e
+        finally:
+            del self._pending[request_id]
+
+    async def close(self):
+        """Close the connection"""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+class LocalTransport:
+    """In-process stand-in for SocketTransport, calling a ShardWorker directly"""
+
+    def __init__(self, worker):
+        """Initialize transport for an in-process worker"""
+        self.worker = worker
+
+    async def request(self, method, params):
+        """Call a worker method and return its result"""
+        return await self.worker.dispatch(method, params)
+
+    async def close(self):
+        """Nothing to close"""
+
+class ShardWorker:
+    """Serves one RaidManager's chats to the front process.
+
+    Every rpc_* method can be called by name through a transport; results
+    are JSON-serializable, with raids passed as raid store rows.
+    """
+
+    def __init__(self, manager, secret=SHARD_SECRET):
+        """Initialize worker serving manager"""
+        self.manager = manager
+        self.secret = secret
+        self.instance = uuid.uuid4().hex  # Tells the router this process restarted
+
+    async def dispatch(self, method, params):
+        """Run one request against the manager"""
+        handler = getattr(self, f'rpc_{method}', None)
+        if handler is None:
+            raise ShardError(f"unknown method {method}")
+        return await handler(**params)
+
+    async def serve(self, address):
+        """Accept connections from the front process at address"""
+        return await start_server(address, self._handle_connection)
+
+    async def _handle_connection(self, reader, writer):
+        """Answer requests from one connection concurrently"""
+        write_lock = asyncio.Lock()
+        requests = set()
+        try:
+            hello = json.loads(await reader.readline() or 'null')
+            secret = hello.get('auth', '') if isinstance(hello, dict) else ''
+            if not hmac.compare_digest(str(secret).encode(), self.secret.encode()):
+                logger.warning("Rejected a shard connection with the wrong secret")
+                return
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._answer(json.loads(line), writer, write_lock))
+                requests.add(task)
+                task.add_done_callback(requests.discard)
+        except (OSError, ValueError) as e:
+            logger.warning("Shard connection failed: %s", e)
+        finally:
+            writer.close()
+
+    async def _answer(self, request, writer, write_lock):
+        """Run a request and write its response"""
+        try:
+            response = {'id': request['id'], 'result': await self.dispatch(request['method'], request['params'])}
+        except Exception as e:
+            logger.exception("Shard request %s failed", request.get('method'))
+            response = {'id': request['id'], 'error': f"{type(e).__name__}: {e}"}
+        async with write_lock:
+            try:
+                writer.write(_encode(response))
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def rpc_ping(self):
+        """Report that this worker is up, with its instance and raid store"""
+        store = self.manager.store.path
+        return {
+            'instance': self.instance,
+            'raids': len(self.manager.raids),
+            'store': store if store == ':memory:' else os.path.abspath(store)
+        }
+
+    async def rpc_start_raid(self, chat_id, tweet_url, targets):
+        """Start or queue a raid, returns (success, raid ID and queue position or error message)"""
+        success, result = await self.manager.start_raid(chat_id, tweet_url, targets)
+        if not success:
+            return success, result
+        return success, {'raid_id': result.raid_id, 'position': self.manager.admission.position(result.raid_id)}
+
+    async def rpc_start_raids(self, chat_id, entries):
+        """Start or queue many raids, returns (started raid IDs, queued raid IDs, failures)"""
+        raids, queued, failures = await self.manager.start_raids(chat_id, [tuple(entry) for entry in entries])
+        return [raid.raid_id for raid in raids], [raid.raid_id for raid in queued], failures
+
+    async def rpc_cancel_raid(self, chat_id):
+        """Cancel every raid in a chat"""
+        return await self.manager.cancel_raid(chat_id)
+
+    async def rpc_handle_callback_query(self, chat_id, callback_query_id, callback_data, user_id):
+        """Handle an inline button press"""
+        return await self.manager.handle_callback_query(callback_query_id, callback_data, chat_id, user_id)
+
+    async def rpc_get_raid_status(self, chat_id):
+        """Get a chat's active and queued raids as dicts"""
+        return self.manager.get_raid_status(chat_id)
+
+    async def rpc_get_leaderboard(self, chat_id, tweet_id):
+        """Get a chat's top raiders, or those of one of its raids"""
+        return self.manager.get_leaderboard(chat_id, tweet_id)
+
+    async def rpc_get_dashboard_settings(self, chat_id):
+        """Get a chat's dashboard mode and repost interval"""
+        return self.manager.get_dashboard_settings(chat_id)
+
+    async def rpc_set_dashboard_settings(self, chat_id, mode, repost_every):
+        """Set a chat's dashboard settings"""
+        return self.manager.set_dashboard_settings(chat_id, mode, repost_every)
+
+    async def rpc_resize(self, shards):
+        """Take 1/shards of the rate limits"""
+        self.manager.set_shard_count(shards)
+
+    async def rpc_restore(self, owner, members):
+        """Restore the stored raids of the chats owner owns among members"""
+        return await self.manager.restore_raids(lambda chat_id: shard_owner(chat_id, members) == owner)
+
+    async def rpc_release(self, owner, members):
+        """Hand off the chats owner no longer owns among members"""
+        raids, chat_settings, queued, chat_dashboards, chat_scores = self.manager.release_chats(
+            lambda chat_id: shard_owner(chat_id, members) == owner
+        )
+        return (
+            [raid_to_row(raid) for raid in raids],
+            [(chat_id, settings['dashboard_mode'], settings['repost_every']) for chat_id, settings in chat_settings.items()],
+            [queued_to_row(raid) for raid in queued],
+            list(chat_dashboards.items()),
+            chat_scores
+        )
+
+    async def rpc_adopt(self, raids, chat_settings, queued, chat_dashboards, chat_scores):
+        """Take over raids, chat settings, queued raids, chat dashboards and leaderboards released by another worker"""
+        return self.manager.adopt_raids(
+            [raid_from_row(row) for row in raids],
+            {chat_id: {'dashboard_mode': mode, 'repost_every': every} for chat_id, mode, every in chat_settings},
+            [queued_from_row(row) for row in queued],
+            dict(chat_dashboards),
+            chat_scores
+        )
+
+    async def rpc_adopt_store(self, path, owner, members):
+        """Take over this worker's chats from a dead worker's raid store"""
+        if not os.path.exists(path):
+            logger.warning("Can't take over chats from %s, it isn't reachable from this host", path)
+            return 0
+        adopted = await self.manager.adopt_store(path, lambda chat_id: shard_owner(chat_id, members) == owner)
+        logger.info("Took over %s raid(s) from %s", adopted, path)
+        return adopted
+
+class ShardRouter:
+    """Routes raid calls from the front process to the worker owning each chat.
+
+    Workers are pinged every SHARD_HEARTBEAT_INTERVAL. One that misses
+    SHARD_HEARTBEAT_MISSES pings in a row leaves, and the others take over
+    its chats from its raid store, which must be on a path they can open
+    (same host or shared storage). A worker that starts answering joins,
+    restores its own chats and takes over the chats it now owns from the
+    other workers. Each worker gets an equal share of the rate limits.
+    """
+
+    parse_raid_list = staticmethod(RaidManager.parse_raid_list)
+
+    def __init__(self, transports):
+        """Initialize router over {address: transport}"""
+        self.transports = dict(transports)
+        self.members = []  # Addresses of the workers owning chats, sorted
+        self._stores = {}  # address -> raid store path the worker reported
+        self._instances = {}  # address -> process instance the worker reported
+        self._misses = {}  # address -> pings missed in a row
+        self._rebalance_lock = None
+        self._heartbeat_task = None
+
+    @classmethod
+    def connect(cls, addresses):
+        """Route to the remote workers at addresses"""
+        return cls({address: SocketTransport(address) for address in addresses})
+
+    @classmethod
+    def local(cls, manager):
+        """Route every chat to a RaidManager in this process"""
+        return cls({LOCAL_ADDRESS: LocalTransport(ShardWorker(manager))})
+
+    async def start(self):
+        """Bring up the reachable workers and start heartbeats"""
+        self._rebalance_lock = asyncio.Lock()
+        await self._heartbeat()
+        if not self.members:
+            logger.warning("No raid workers are up yet, raid commands will fail until one joins")
+        self._heartbeat_task = asyncio.create_task(self._run_heartbeats())
+
+    async def stop(self):
+        """Stop heartbeats and close worker connections"""
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        for transport in self.transports.values():
+            await transport.close()
+
+    def add_worker(self, address):
+        """Add a worker at runtime, it joins on the next heartbeat it answers"""
+        self.transports.setdefault(address, SocketTransport(address))
+
+    async def _run_heartbeats(self):
+        """Ping the workers until stopped"""
+        while True:
+            await asyncio.sleep(SHARD_HEARTBEAT_INTERVAL)
+            try:
+                await self._heartbeat()
+            except Exception as e:
+                logger.error("Shard heartbeat failed: %s", e)
+
+    async def _heartbeat(self):
+        """Ping every worker and rebalance if membership changed"""
+        addresses = list(self.transports)
+        results = await asyncio.gather(*(self._call(address, 'ping') for address in addresses), return_exceptions=True)
+        members = set(self.members)
+        restarted = []
+        for address, result in zip(addresses, results):
+            if isinstance(result, Exception):
+                self._misses[address] = self._misses.get(address, 0) + 1
+                if self._misses[address] >= SHARD_HEARTBEAT_MISSES:
+                    members.discard(address)
+                continue
+            self._misses[address] = 0
+            self._stores[address] = result['store']
+            if address in members and self._instances.get(address) != result['instance']:
+                restarted.append(address)
+            self._instances[address] = result['instance']
+            members.add(address)
+
+        if members != set(self.members):
+            await self._rebalance(sorted(members))
+        for address in restarted:
+            # Restarted before it was missed, nobody took its chats over
+            logger.warning("Raid worker %s restarted, restoring its raids", address)
+            await self._call(address, 'restore', owner=address, members=self.members)
+
+    async def _rebalance(self, members):
+        """Move every chat to its owner under the new membership"""
+        async with self._rebalance_lock:
+            left = [address for address in self.members if address not in members]
+            joined = [address for address in members if address not in self.members]
+            stayed = [address for address in self.members if address in members]
+            logger.info("Raid workers changing", extra={'joined': joined, 'left': left, 'members': members})
+
+            # Joining workers restore their own chats, the others hand over the chats they lost
+            await self._call_each(joined, 'restore', members=members)
+            released = await self._call_each(stayed, 'release', members=members) if joined else []
+            self.members = members
+
+            # new owner -> (raid rows, chat settings rows, queued raid rows, chat dashboard rows, chat score rows)
+            handoffs = {}
+            for raids, chat_settings, queued, chat_dashboards, chat_scores in released:
+                for row in raids:
+                    handoffs.setdefault(shard_owner(row[1], members), ([], [], [], [], []))[0].append(row)
+                for row in chat_settings:
+                    handoffs.setdefault(shard_owner(row[0], members), ([], [], [], [], []))[1].append(row)
+                for row in queued:
+                    handoffs.setdefault(shard_owner(row[1], members), ([], [], [], [], []))[2].append(row)
+                for row in chat_dashboards:
+                    handoffs.setdefault(shard_owner(row[0], members), ([], [], [], [], []))[3].append(row)
+                for row in chat_scores:
+                    handoffs.setdefault(shard_owner(row[0], members), ([], [], [], [], []))[4].append(row)
+            await asyncio.gather(*(
+                self._logged_call(
+                    address, 'adopt',
+                    raids=raids, chat_settings=chat_settings, queued=queued,
+                    chat_dashboards=chat_dashboards, chat_scores=chat_scores
+                )
+                for address, (raids, chat_settings, queued, chat_dashboards, chat_scores) in handoffs.items()
+            ))
+
+            # Chats of workers that died are taken over from their stores
+            for address in left:
+                store = self._stores.get(address)
+                if store and store != ':memory:':
+                    await self._call_each(members, 'adopt_store', path=store, members=members)
+            await asyncio.gather(*(self._logged_call(address, 'resize', shards=len(members)) for address in members))
+
+    async def _call(self, address, method, **params):
+        """Call a method on one worker"""
+        return await self.transports[address].request(method, params)
+
+    async def _logged_call(self, address, method, **params):
+        """Call a method on one worker, logging instead of raising on failure"""
+        try:
+            return await self._call(address, method, **params)
+        except ShardError as e:
+            logger.error("Raid worker %s failed %s: %s", address, method, e)
+            return None
+
+    async def _call_each(self, addresses, method, **params):
+        """Call a method on several workers at once, each as the owner of its chats
+
+        Returns the results of the calls that succeeded.
+        """
+        results = await asyncio.gather(*(
+            self._logged_call(address, method, owner=address, **params) for address in addresses
+        ))
+        return [result for result in results if result is not None]
+
+    async def _route(self, chat_id, method, **params):
+        """Call a method on the worker owning chat_id"""
+        return await self._call(shard_owner(chat_id, self.members), method, chat_id=chat_id, **params)
+
+    async def start_raid(self, chat_id, tweet_url, targets):
+        """Start or queue a raid
+
+        Returns (True, {'raid_id', 'position'}) where position is None if
+        the raid started, or (False, error message).
+        """
+        return await self._route(chat_id, 'start_raid', tweet_url=tweet_url, targets=targets)
+
+    async def start_raids(self, chat_id, entries):
+        """Start or queue many raids, returns (started raid IDs, queued raid IDs, failures)"""
+        return await self._route(chat_id, 'start_raids', entries=entries)
+
+    async def cancel_raid(self, chat_id):
+        """Cancel every raid in a chat, returns (success, message)"""
+        return await self._route(chat_id, 'cancel_raid')
+
+    async def handle_callback_query(self, callback_query_id, callback_data, chat_id, user_id):
+        """Handle an inline button press, returns (success, message)"""
+        return await self._route(
+            chat_id, 'handle_callback_query',
+            callback_query_id=callback_query_id, callback_data=callback_data, user_id=user_id
+        )
+
+    async def get_raid_status(self, chat_id):
+        """Get a chat's active and queued raids as dicts"""
+        return await self._route(chat_id, 'get_raid_status')
+
+    async def get_leaderboard(self, chat_id, tweet_id=None):
+        """Get a chat's top raiders, or those of its raid on tweet_id (None if there's no such raid)"""
+        return await self._route(chat_id, 'get_leaderboard', tweet_id=tweet_id)
+
+    async def get_dashboard_settings(self, chat_id):
+        """Get a chat's dashboard mode and repost interval"""
+        return await self._route(chat_id, 'get_dashboard_settings')
+
+    async def set_dashboard_settings(self, chat_id, mode, repost_every=0):
+        """Set a chat's dashboard settings, returns (success, message)"""
+        return await self._route(chat_id, 'set_dashboard_settings', mode=mode, repost_every=repost_every)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Campaign Simulator
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Replay a whole raid campaign against the real raid engine in seconds.
+
+The RaidManager runs unchanged on a VirtualTimeLoop, so every poll,
+dashboard update and expiry happens on virtual time. Tweets follow a
+seeded engagement model and Telegram calls go to an in-process fake Bot
+API that records them, so runs with the same seed are reproducible (the
+command line pins PYTHONHASHSEED, since set order decides poll order).
+
+    python simulator.py --raids 5000 --chats 250 --seed 7
+    python simulator.py --campaign campaign.json
+
+A campaign file is a JSON list of launches:
+    [{"at": 0, "chat_id": 1, "tweets": ["123", "456"], "targets": {"likes": 50, ...}}]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import clock
+from clock import VirtualClock, VirtualTimeLoop
+from config import BULK_RAID_MAX, DEFAULT_RAID_DURATION, MOCK_RATE_LIMIT
+from logging_setup import configure_logging
+from metrics_providers import MockMetricsProvider
+from raid_manager import RaidManager
+
+logger = logging.getLogger(__name__)
+
+# Growth curves, as fractions of a tweet's engagement ceiling over time t (seconds)
+GROWTH_CURVES = {
+    'linear': lambda t, p: min(t / p['span'], 1.0),
+    'logistic': lambda t, p: 1 / (1 + math.exp(-(t - p['midpoint']) / p['steepness'])),
+    'decay': lambda t, p: 1 - math.exp(-t / p['half_life'] * math.log(2)),
+    'stall': lambda t, p: 0.05 * (1 - math.exp(-t / p['half_life'])),
+}
+
+# Default share of tweets following each curve
+DEFAULT_CURVE_MIX = {'linear': 0.3, 'logistic': 0.3, 'decay': 0.3, 'stall': 0.1}
+
+# Final message headers, see RaidManager._finish_raid and _cancel_raid_by_id
+OUTCOME_MARKERS = (('RAID SUCCESSFUL', 'succeeded'), ('Time expired', 'expired'), ('RAID CANCELLED', 'cancelled'))
+
+class EngagementModel:
+    """Seeded, deterministic engagement growth for simulated tweets.
+
+    Each tweet draws its curve, starting counts and engagement ceiling from
+    a generator seeded with (seed, tweet_id), so a tweet's metrics depend
+    only on the seed and how long it has been live, never on call order.
+    """
+
+    def __init__(self, seed, curve_mix=None, duration=DEFAULT_RAID_DURATION * 60):
+        """Initialize model
+
+        curve_mix: curve name -> weight, see GROWTH_CURVES
+        duration: seconds over which curves play out
+        """
+        self.seed = seed
+        self.curve_mix = curve_mix or DEFAULT_CURVE_MIX
+        self.duration = duration
+        self._profiles = {}
+
+    def profile(self, tweet_id):
+        """Get a tweet's curve and parameters"""
+        profile = self._profiles.get(tweet_id)
+        if profile is None:
+            rng = random.Random(f"{self.seed}:{tweet_id}")
+            curve = rng.choices(list(self.curve_mix), weights=list(self.curve_mix.values()))[0]
+            likes = rng.lognormvariate(math.log(150), 0.8)
+            profile = self._profiles[tweet_id] = {
+                'curve': curve,
+                'base': {'likes': rng.randint(5, 15), 'retweets': rng.randint(2, 8), 'comments': rng.randint(1, 5)},
+                'ceiling': {
+                    'likes': likes,
+                    'retweets': likes * rng.uniform(0.15, 0.4),
+                    'comments': likes * rng.uniform(0.05, 0.2)
+                },
+                'span': self.duration * rng.uniform(0.5, 1.5),
+                'midpoint': self.duration * rng.uniform(0.2, 0.6),
+                'steepness': self.duration * rng.uniform(0.05, 0.15),
+                'half_life': self.duration * rng.uniform(0.1, 0.3)
+            }
+        return profile
+
+    def metrics(self, tweet_id, elapsed):
+        """Get a tweet's metrics elapsed seconds after it was first seen"""
+        profile = self.profile(tweet_id)
+        share = GROWTH_CURVES[profile['curve']](max(elapsed, 0.0), profile)
+        return {
+            metric: base + int(profile['ceiling'][metric] * share)
+            for metric, base in profile['base'].items()
+        }
+
+    def release(self, tweet_id):
+        """Forget a tweet's profile"""
+        self._profiles.pop(tweet_id, None)
+
+class SimulatedMetricsProvider(MockMetricsProvider):
+    """Mock provider whose metrics follow an EngagementModel"""
+
+    name = 'sim'
+
+    def __init__(self, budget, model, rate_limit=MOCK_RATE_LIMIT):
+        """Initialize provider"""
+        super().__init__(budget)
+        self.model = model
+        self.rate_limit = rate_limit
+        self._first_seen = {}  # tweet_id -> clock.monotonic() of the first lookup
+        self.requests = Counter()  # endpoint -> simulated Twitter requests made
+
+    def _consume_mock_request(self, endpoint):
+        """Count a simulated request against its endpoint"""
+        self.requests[endpoint] += 1
+        return super()._consume_mock_request(endpoint)
+
+    def release(self, tweet_id):
+        """Forget a tweet's simulated metrics"""
+        super().release(tweet_id)
+        self._first_seen.pop(tweet_id, None)
+        self.model.release(tweet_id)
+
+    def _get_mock_metrics(self, tweet_id):
+        """Get the model's metrics for a tweet at the current time"""
+        first_seen = self._first_seen.setdefault(tweet_id, clock.monotonic())
+        return self.model.metrics(tweet_id, clock.monotonic() - first_seen)
+
+class FakeTelegramBot:
+    """In-process stand-in for telegram.Bot that records every call"""
+
+    def __init__(self, latency=0.05):
+        """Initialize fake bot answering each call after latency (virtual) seconds"""
+        self.latency = latency
+        self.calls = Counter()  # method -> count
+        self.chat_calls = Counter()  # chat_id -> count
+        self.outcomes = Counter()  # outcome -> count, from final messages
+        self._message_ids = iter(range(1, 1 << 62))
+
+    async def _record(self, method, chat_id=None, text=None):
+        """Record a call and simulate its round trip"""
+        self.calls[method] += 1
+        if chat_id is not None:
+            self.chat_calls[chat_id] += 1
+        if text:
+            for marker, outcome in OUTCOME_MARKERS:
+                if marker in text:
+                    self.outcomes[outcome] += 1
+                    break
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await self._record('sendMessage', chat_id, text)
+        return SimpleNamespace(message_id=next(self._message_ids), chat_id=chat_id, text=text)
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, **kwargs):
+        await self._record('editMessageText', chat_id, text)
+        return True
+
+    async def delete_message(self, chat_id, message_id, **kwargs):
+        await self._record('deleteMessage', chat_id)
+        return True
+
+    async def answer_callback_query(self, callback_query_id, **kwargs):
+        await self._record('answerCallbackQuery')
+        return True
+
+def generate_campaign(raids, chats, launch_window, seed):
+    """Generate launches of raids tweets spread over chats
+
+    Each chat bulk-launches its share of tweets at a random time within
+    the first launch_window seconds.
+    """
+    rng = random.Random(seed)
+    launches = []
+    for chat_index in range(chats):
+        count = raids // chats + (chat_index < raids % chats)
+        if not count:
+            continue
+        likes = rng.choice((25, 50, 100, 200, 400))
+        launches.append({
+            'at': rng.uniform(0, launch_window),
+            'chat_id': -1000000000000 - chat_index,
+            'tweets': [str(10 ** 18 + chat_index * 10 ** 6 + i) for i in range(count)],
+            'targets': {'likes': likes, 'retweets': likes // 4, 'comments': likes // 10}
+        })
+    return launches
+
+async def _launch(manager, launch, counts):
+    """Start one chat's launch, in batches the bulk launcher accepts"""
+    entries = [
+        (f"https://x.com/sim/status/{tweet_id}", tweet_id, dict(launch['targets']))
+        for tweet_id in launch['tweets']
+    ]
+    if len(entries) == 1:
+        success, result = await manager.start_raid(launch['chat_id'], entries[0][0], entries[0][2])
+        if not success:
+            counts['failed_to_start'] += 1
+        else:
+            counts['queued' if result.raid_id in manager.admission else 'started'] += 1
+        return
+    for i in range(0, len(entries), BULK_RAID_MAX):
+        raids, queued, failures = await manager.start_raids(launch['chat_id'], entries[i:i + BULK_RAID_MAX])
+        counts['started'] += len(raids)
+        counts['queued'] += len(queued)
+        counts['failed_to_start'] += len(failures)
+
+async def _count_raid_minutes(manager, totals):
+    """Accumulate active raid-minutes, sampled every virtual second"""
+    while True:
+        await asyncio.sleep(1)
+        totals['raid_minutes'] += len(manager.raids) / 60
+
+async def run_campaign(launches, model, rate_limit=MOCK_RATE_LIMIT, latency=0.05, manager_class=RaidManager):
+    """Run launches through a RaidManager until every raid has ended, returns a report"""
+    loop = asyncio.get_running_loop()
+    manager = manager_class(store_path=':memory:')
+    provider = SimulatedMetricsProvider(manager.twitter_api.budget, model, rate_limit)
+    manager.twitter_api.provider = provider
+    bot = FakeTelegramBot(latency)
+    await manager.start(SimpleNamespace(bot=bot))
+
+    counts = Counter()
+    totals = {'raid_minutes': 0.0}
+    sampler = asyncio.create_task(_count_raid_minutes(manager, totals))
+    started = loop.time()
+    for launch in sorted(launches, key=lambda launch: launch['at']):
+        await asyncio.sleep(max(started + launch['at'] - loop.time(), 0))
+        await _launch(manager, launch, counts)
+
+    # Queued raids start as others end, every raid ends within
+    # DEFAULT_RAID_DURATION, then its final message drains
+    while len(manager.raids) or len(manager.admission) or manager.outbound.depth() or manager.outbound.get_stats()['busy_chats']:
+        await asyncio.sleep(1)
+    sampler.cancel()
+
+    report = {
+        'virtual_seconds': loop.time() - started,
+        'raid_minutes': totals['raid_minutes'],
+        'raids': dict(counts, **bot.outcomes),
+        'telegram_calls': dict(bot.calls),
+        'busiest_chat_calls': max(bot.chat_calls.values(), default=0),
+        'twitter_requests': dict(provider.requests),
+        'twitter_lookups': manager.poller.batch_requests,
+        'deferred_polls': manager.poller.deferred_polls,
+        'admission': manager.admission.get_stats(),
+        'dashboard': dict(manager.dashboard_stats),
+        'outbound': manager.outbound.get_stats(),
+        'tweet_cache': manager.twitter_api.cache.get_stats(),
+        'engagers': manager.engagers.get_stats()
+    }
+    await manager.stop()
+    return report
+
+def simulate(launches, seed, curve_mix=None, rate_limit=MOCK_RATE_LIMIT, latency=0.05, manager_class=RaidManager):
+    """Run a campaign on virtual time, returns its report with the real and CPU seconds taken"""
+    loop = VirtualTimeLoop()
+    previous = clock.install(VirtualClock(loop))
+    wall_started, cpu_started = time.perf_counter(), time.process_time()
+    try:
+        report = loop.run_until_complete(
+            run_campaign(launches, EngagementModel(seed, curve_mix), rate_limit, latency, manager_class)
+        )
+    finally:
+        loop.close()
+        clock.install(previous)
+    report['wall_seconds'] = time.perf_counter() - wall_started
+    report['cpu_seconds'] = time.process_time() - cpu_started
+    return report
+
+def main():
+    """Parse arguments, run the campaign and print its report"""
+    if 'PYTHONHASHSEED' not in os.environ:
+        # Restart with fixed string hashing so poll order is reproducible too
+        os.environ['PYTHONHASHSEED'] = '0'
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    parser = argparse.ArgumentParser(description="Simulate a raid campaign on virtual time")
+    parser.add_argument('--campaign', help="JSON file of launches (generated from the options below if omitted)")
+    parser.add_argument('--raids', type=int, default=2000, help="raids to generate")
+    parser.add_argument('--chats', type=int, default=200, help="chats to spread generated raids over")
+    parser.add_argument('--launch-window', type=float, default=600, help="seconds over which generated launches start")
+    parser.add_argument('--seed', type=int, default=1, help="seed for the campaign and engagement model")
+    parser.add_argument('--curves', type=json.loads, help='curve weights as JSON, e.g. \'{"logistic": 1, "stall": 1}\'')
+    parser.add_argument('--rate-limit', type=int, default=MOCK_RATE_LIMIT, help="simulated Twitter requests per 15-minute window")
+    parser.add_argument('--latency', type=float, default=0.05, help="simulated seconds per Telegram call")
+    parser.add_argument('--log-level', default='ERROR', help="log level for the raid engine")
+    args = parser.parse_args()
+
+    configure_logging(args.log_level, fmt='text')
+    if args.campaign:
+        with open(args.campaign) as f:
+            launches = json.load(f)
+    else:
+        launches = generate_campaign(args.raids, args.chats, args.launch_window, args.seed)
+
+    report = simulate(launches, args.seed, args.curves, args.rate_limit, args.latency)
+    print(json.dumps(report, indent=2, default=str))
+    print(
+        f"Simulated {report['virtual_seconds'] / 60:.1f} minutes in {report['wall_seconds']:.1f}s "
+        f"({report['virtual_seconds'] / max(report['wall_seconds'], 1e-9):.0f}x real time)"
+    )
+
+if __name__ == '__main__':
+    main()
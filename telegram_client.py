@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Telegram Client
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import logging
+from telegram.constants import ParseMode
+from telegram.error import BadRequest, RetryAfter, TelegramError
+from telegram.ext import Application
+import clock
+from monitoring import STATUS_OK, observe_telegram_request
+from config import (
+    TELEGRAM_TOKEN,
+    TELEGRAM_POOL_SIZE,
+    TELEGRAM_CONNECT_TIMEOUT,
+    TELEGRAM_READ_TIMEOUT,
+    TELEGRAM_WRITE_TIMEOUT,
+    TELEGRAM_POOL_TIMEOUT,
+    TELEGRAM_API_BASE_URL
+)
+
+logger = logging.getLogger(__name__)
+
+def application_builder():
+    """Get a PTB Application builder configured for this bot's token and connection pool"""
+    return (
+        Application.builder()
+        .token(TELEGRAM_TOKEN)
+        .base_url(TELEGRAM_API_BASE_URL)
+        # Shared keep-alive connection pool, also used by the raid engine
+        .connection_pool_size(TELEGRAM_POOL_SIZE)
+        .connect_timeout(TELEGRAM_CONNECT_TIMEOUT)
+        .read_timeout(TELEGRAM_READ_TIMEOUT)
+        .write_timeout(TELEGRAM_WRITE_TIMEOUT)
+        .pool_timeout(TELEGRAM_POOL_TIMEOUT)
+    )
+
+class TelegramClient:
+    """Outbound Telegram calls made by the raid engine.
+
+    Wraps the PTB Application's bot so every call reuses its pooled,
+    keep-alive HTTPX connections instead of opening a new one per request.
+    Flood-control (429) replies are waited out and retried once; other
+    errors are logged and reported through the return value.
+    """
+
+    def __init__(self, bot):
+        """Initialize client with the application's bot"""
+        self.bot = bot
+        self.rate_limited = 0  # 429 replies received so far
+
+    async def _timed(self, method, *args, **kwargs):
+        """Call a bot method, recording its latency and outcome"""
+        started = clock.monotonic()
+        status = STATUS_OK
+        try:
+            return await method(*args, **kwargs)
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            observe_telegram_request(method.__name__, status, clock.monotonic() - started)
+
+    async def _call(self, method, *args, **kwargs):
+        """Call a bot method, waiting out one flood-control RetryAfter"""
+        try:
+            return await self._timed(method, *args, **kwargs)
+        except RetryAfter as e:
+            self.rate_limited += 1
+            logger.warning("Telegram flood control hit, retrying in %ss", e.retry_after)
+            await asyncio.sleep(e.retry_after)
+            return await self._timed(method, *args, **kwargs)
+
+    async def send_message(self, chat_id, text, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True, reply_markup=None):
+        """Send a message, returns the sent Message or None"""
+        try:
+            return await self._call(
+                self.bot.send_message,
+                chat_id=chat_id,
+                text=text,
+                parse_mode=parse_mode,
+                disable_web_page_preview=disable_web_page_preview,
+                reply_markup=reply_markup
+            )
+        except TelegramError as e:
+            logger.error("Error sending message: %s", e)
+            return None
+
+    async def edit_message_text(self, chat_id, message_id, text, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True, reply_markup=None):
+        """Edit an existing message, returns True on success"""
+        try:
+            await self._call(
+                self.bot.edit_message_text,
+                chat_id=chat_id,
+                message_id=message_id,
+                text=text,
+                parse_mode=parse_mode,
+                disable_web_page_preview=disable_web_page_preview,
+                reply_markup=reply_markup
+            )
+            return True
+        except BadRequest as e:
+            # If message content hasn't changed, Telegram returns an error but it's not a real error
+            if "message is not modified" in str(e).lower():
+                return True
+            logger.error("Error editing message: %s", e)
+            return False
+        except TelegramError as e:
+            logger.error("Error editing message: %s", e)
+            return False
+
+    async def delete_message(self, chat_id, message_id):
+        """Delete a message, returns True on success"""
+        if not message_id:
+            return False
+
+        try:
+            return await self._call(self.bot.delete_message, chat_id=chat_id, message_id=message_id)
+        except TelegramError as e:
+            logger.error("Error deleting message: %s", e)
+            return False
+
+    async def answer_callback_query(self, callback_query_id, text=None, show_alert=False):
+        """Answer a callback query to stop the loading indicator"""
+        try:
+            return await self._timed(
+                self.bot.answer_callback_query,
+                callback_query_id,
+                text=text,
+                show_alert=show_alert
+            )
+        except TelegramError as e:
+            logger.error("Error answering callback query: %s", e)
+            return False
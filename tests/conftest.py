@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Test Fixtures
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+"""Shared fixtures: raid engines on virtual time, with seeded metrics and a fake Telegram bot"""
+
+import os
+import sys
+from types import SimpleNamespace
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import clock
+from clock import VirtualClock, VirtualTimeLoop
+from raid_manager import RaidManager
+from simulator import EngagementModel, FakeTelegramBot, SimulatedMetricsProvider
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a fresh virtual-time loop, returns its result"""
+    def run_virtual(coro):
+        loop = VirtualTimeLoop()
+        previous = clock.install(VirtualClock(loop))
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+            clock.install(previous)
+    return run_virtual
+
+async def start_manager(store_path=':memory:', seed=1, manager_class=RaidManager):
+    """Start a raid manager wired to seeded metrics and a fake bot, without restoring
+
+    The fake bot is manager.telegram_bot.
+    """
+    manager = manager_class(store_path=store_path)
+    manager.twitter_api.provider = SimulatedMetricsProvider(manager.twitter_api.budget, EngagementModel(seed))
+    manager.telegram_bot = FakeTelegramBot(latency=0)
+    await manager.start(SimpleNamespace(bot=manager.telegram_bot), restore=False)
+    return manager
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Admission Tests
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+from conftest import start_manager
+from raid_admission import AdmissionQueue, QueuedRaid
+
+TARGETS = {'likes': 10 ** 6, 'retweets': 10 ** 6, 'comments': 10 ** 6}
+LOOKUP_DELAY = 5  # Seconds a batch lookup takes while raids start from the queue
+
+async def start_raid(manager, chat_id, tweet_id):
+    """Start or queue a raid, returns whether it started"""
+    success, result = await manager.start_raid(chat_id, f"https://x.com/a/status/{tweet_id}", dict(TARGETS))
+    assert success
+    return result.raid_id in manager.raids
+
+def slow_batch_lookups(manager):
+    """Make batch lookups take LOOKUP_DELAY seconds"""
+    provider = manager.twitter_api.provider
+    lookup = provider.get_tweet_metrics_batch
+
+    async def slow_lookup(tweet_ids):
+        await asyncio.sleep(LOOKUP_DELAY)
+        return await lookup(tweet_ids)
+
+    provider.get_tweet_metrics_batch = slow_lookup
+
+def test_raid_during_admission_waits_for_the_chat_cap(run):
+    """A /raid arriving while queued raids start can't push the chat over its cap"""
+    async def scenario():
+        manager = await start_manager()
+        try:
+            manager.admission.chat_limit = 2
+            chat_id = -1001
+            assert await start_raid(manager, chat_id, '901')
+            assert await start_raid(manager, chat_id, '902')
+            assert not await start_raid(manager, chat_id, '903')
+
+            slow_batch_lookups(manager)
+            await manager.cancel_raid(chat_id, '901')
+            await asyncio.sleep(1)  # 903 is starting, waiting on its lookup
+            assert manager.admission.starting(chat_id) == 1
+            assert not await start_raid(manager, chat_id, '904')
+
+            await asyncio.sleep(2 * LOOKUP_DELAY)
+            assert manager.get_active_raids_count(chat_id) == 2
+            assert f"{chat_id}_904" in manager.admission
+        finally:
+            await manager.stop()
+
+    run(scenario())
+
+def test_raid_during_admission_waits_for_the_global_cap(run):
+    """A /raid in another chat arriving while queued raids start can't push the bot over its cap"""
+    async def scenario():
+        manager = await start_manager()
+        try:
+            manager.admission.global_limit = 2
+            assert await start_raid(manager, -1001, '911')
+            assert await start_raid(manager, -1002, '912')
+            assert not await start_raid(manager, -1001, '913')
+
+            slow_batch_lookups(manager)
+            await manager.cancel_raid(-1001, '911')
+            await asyncio.sleep(1)
+            assert not await start_raid(manager, -1003, '914')
+
+            await asyncio.sleep(2 * LOOKUP_DELAY)
+            assert manager.get_active_raids_count() == 2
+        finally:
+            await manager.stop()
+
+    run(scenario())
+
+def test_pop_admissible_counts_raids_still_starting():
+    """A second admission pass leaves room for the raids the first one hasn't claimed"""
+    admission = AdmissionQueue(chat_limit=1, global_limit=10, chat_queue_limit=10)
+    for index in range(3):
+        admission.push(QueuedRaid(f"a{index}", -1001, str(index), 'url', dict(TARGETS), {}))
+    assert len(admission.pop_admissible(lambda chat_id: 0, 0)) == 1
+    assert admission.pop_admissible(lambda chat_id: 0, 0) == []
+    assert admission.starting(-1001) == 1
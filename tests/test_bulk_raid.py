@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Bulk Raid Tests
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import pytest
+from conftest import start_manager
+
+CHAT_ID = -1001
+TARGETS = {'likes': 100, 'retweets': 10, 'comments': 5}
+ENTRIES = [(f"https://x.com/a/status/{tweet_id}", tweet_id, dict(TARGETS)) for tweet_id in ('601', '602', '603')]
+
+async def bulk_launch(lookup):
+    """Bulk-launch ENTRIES with batch lookups answered by lookup(tweet_ids)"""
+    manager = await start_manager()
+    try:
+        manager.twitter_api.provider.get_tweet_metrics_batch = lookup
+        return await manager.start_raids(CHAT_ID, ENTRIES)
+    finally:
+        await manager.stop()
+
+async def missing(tweet_ids):
+    """A successful lookup that found none of the tweets"""
+    return {}
+
+async def rate_limited(tweet_ids):
+    """A lookup that failed"""
+    return None
+
+async def broken(tweet_ids):
+    """A lookup that raised"""
+    raise RuntimeError("connection reset")
+
+def test_missing_tweets_are_reported_as_not_found(run):
+    raids, queued, failures = run(bulk_launch(missing))
+    assert not raids and not queued
+    assert failures == [(tweet_url, "tweet not found or not accessible") for tweet_url, _, _ in ENTRIES]
+
+@pytest.mark.parametrize('lookup', [rate_limited, broken])
+def test_failed_lookups_are_reported_as_rate_limited(run, lookup):
+    raids, queued, failures = run(bulk_launch(lookup))
+    assert not raids and not queued
+    assert failures == [
+        (tweet_url, "couldn't fetch tweet metrics (Twitter rate limit)") for tweet_url, _, _ in ENTRIES
+    ]
+
+def test_partly_missing_launch_starts_the_rest(run):
+    async def partial(tweet_ids):
+        return {tweet_id: {'likes': 1, 'retweets': 1, 'comments': 1} for tweet_id in tweet_ids if tweet_id != '602'}
+
+    raids, queued, failures = run(bulk_launch(partial))
+    assert sorted(raid.tweet_id for raid in raids) == ['601', '603']
+    assert failures == [(ENTRIES[1][0], "tweet not found or not accessible")]
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Dashboard Tests
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+from conftest import start_manager
+from raid_manager import DASHBOARD_EDIT
+
+CHAT_ID = -1001
+TARGETS = {'likes': 10 ** 6, 'retweets': 10 ** 6, 'comments': 10 ** 6}
+
+def test_repost_every_survives_unchanged_updates(run):
+    """With repost_every=2 and content changing only on odd updates, the dashboard is still re-posted every 2 updates"""
+    async def scenario():
+        manager = await start_manager()
+        try:
+            manager.set_dashboard_settings(CHAT_ID, DASHBOARD_EDIT, 2)
+            success, raid = await manager.start_raid(CHAT_ID, "https://x.com/a/status/950", dict(TARGETS))
+            assert success
+            manager.poller.unsubscribe(raid.tweet_id, raid.raid_id)
+            await asyncio.sleep(1)  # First post
+            posts = manager.telegram_bot.calls['sendMessage']
+
+            metrics = raid.current_metrics
+            for tick in range(1, 9):
+                if tick % 2:
+                    metrics = dict(metrics, likes=metrics['likes'] + 1)
+                await manager._on_metrics(raid.raid_id, metrics)
+                await asyncio.sleep(10)  # Past the chat's Telegram rate limit
+
+            assert manager.telegram_bot.calls['sendMessage'] - posts == 4
+            assert manager.telegram_bot.calls['deleteMessage'] == 4
+        finally:
+            await manager.stop()
+
+    run(scenario())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Engager Tracker Tests
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import logging
+from config import ENGAGER_BASELINE_KEEP
+from engager_tracker import EngagerTracker
+from raid_store import RaidStore
+
+TWEET_ID = '700'
+OTHER_TWEET_ID = '701'
+
+class OpenBudget:
+    """Rate-limit budget with plenty of requests left"""
+
+    def allowance(self, endpoint, seconds):
+        return 1000.0
+
+    def usable(self, endpoint):
+        return 1000
+
+class UnknownBudget:
+    """Rate-limit budget no response has reported yet"""
+
+    def allowance(self, endpoint, seconds):
+        return None
+
+    def usable(self, endpoint):
+        return None
+
+class FakeTwitterAPI:
+    """Liking users of tweets, listed newest first in pages of page_size"""
+
+    engager_endpoints = {'likes': 'tweets/:id/liking_users'}
+
+    def __init__(self, page_size, budget=None):
+        self.page_size = page_size
+        self.budget = budget or OpenBudget()
+        self.likers = {}  # tweet_id -> user IDs, oldest like first
+        self.pages = 0
+
+    def like(self, tweet_id, *user_ids):
+        for user_id in user_ids:
+            self.unlike(tweet_id, user_id)
+            self.likers.setdefault(tweet_id, []).append(user_id)
+
+    def unlike(self, tweet_id, user_id):
+        if user_id in self.likers.get(tweet_id, []):
+            self.likers[tweet_id].remove(user_id)
+
+    def metrics(self, tweet_id):
+        return {'likes': len(self.likers.get(tweet_id, []))}
+
+    async def get_engagers(self, tweet_id, metric, token=None, since_id=None):
+        self.pages += 1
+        await asyncio.sleep(0.1)
+        newest_first = self.likers.get(tweet_id, [])[::-1]
+        start = int(token or 0)
+        page = newest_first[start:start + self.page_size]
+        next_token = str(start + self.page_size) if start + self.page_size < len(newest_first) else None
+        return [(user_id, f"user{user_id}") for user_id in page], next_token, None
+
+class NoScheduler:
+    """Scheduler stub, syncs are run by the tests"""
+
+    def schedule(self, key, delay, func, *args):
+        pass
+
+def make_tracker(api):
+    """Get a tracker over api, recording credited user IDs in tracker.credited_users"""
+    tracker = None
+    credited = []
+
+    def on_engaged(tweet_id, metric, users):
+        credited.extend(tracker.users.user_id(index) for index in users)
+
+    tracker = EngagerTracker(api, NoScheduler(), RaidStore(':memory:'), on_engaged)
+    tracker.credited_users = credited
+    return tracker
+
+async def sync(tracker, api, *tweet_ids):
+    """Pass the tweets' current counts to the tracker and sync it"""
+    for tweet_id in tweet_ids or (TWEET_ID,):
+        tracker.observe(tweet_id, api.metrics(tweet_id))
+    await tracker.sync()
+
+def test_relike_does_not_hide_new_likes(run):
+    """A credited raider who unlikes and likes again moves to the top, the new likes below are still found"""
+    async def scenario():
+        api = FakeTwitterAPI(page_size=2)
+        api.like(TWEET_ID, *range(1, 11))  # Before the raid
+        tracker = make_tracker(api)
+        tracker.track(TWEET_ID, api.metrics(TWEET_ID))
+        await sync(tracker, api)
+        api.like(TWEET_ID, 11, 12)
+        await sync(tracker, api)
+        assert sorted(tracker.credited_users) == [11, 12]
+
+        api.unlike(TWEET_ID, 11)
+        api.like(TWEET_ID, 13, 14, 11)
+        await sync(tracker, api)
+        assert sorted(tracker.credited_users) == [11, 12, 13, 14]
+
+    run(scenario())
+
+def test_unliked_marker_does_not_credit_earlier_likers(run):
+    """Likes from before the raid aren't credited when one of the kept baseline likers unlikes"""
+    async def scenario():
+        api = FakeTwitterAPI(page_size=100)
+        api.like(TWEET_ID, *range(1, 21))  # Before the raid
+        tracker = make_tracker(api)
+        tracker.track(TWEET_ID, api.metrics(TWEET_ID))
+        await sync(tracker, api)
+
+        api.unlike(TWEET_ID, 20)  # Newest pre-raid liker, kept as a marker
+        api.like(TWEET_ID, 21, 22, 23)
+        await sync(tracker, api)
+        credited = set(tracker.credited_users)
+        assert credited and credited <= {21, 22, 23}
+        assert len(tracker.credited_users) == len(credited)
+
+    run(scenario())
+
+def test_scan_stops_at_users_synced_before(run):
+    """A scan with few new likes ends on reaching the kept likers instead of paging through old ones"""
+    async def scenario():
+        api = FakeTwitterAPI(page_size=ENGAGER_BASELINE_KEEP)
+        api.like(TWEET_ID, *range(1, 1001))
+        tracker = make_tracker(api)
+        tracker.track(TWEET_ID, api.metrics(TWEET_ID))
+        await sync(tracker, api)
+        api.like(TWEET_ID, 2001)
+        api.unlike(TWEET_ID, 1)  # The count doesn't grow, but the like still shows up
+        api.like(TWEET_ID, 2002)
+        pages = api.pages
+        await sync(tracker, api)
+        assert 2002 in tracker.credited_users and set(tracker.credited_users) <= {2001, 2002}
+        assert api.pages - pages <= 2
+
+    run(scenario())
+
+def test_unknown_budget_sends_one_page(run):
+    """Before any response reports the budget, each endpoint gets one page per sync"""
+    async def scenario():
+        api = FakeTwitterAPI(page_size=1, budget=UnknownBudget())
+        tracker = make_tracker(api)
+        for index in range(10):
+            tweet_id = str(800 + index)
+            api.like(tweet_id, 1)
+            tracker.track(tweet_id, api.metrics(tweet_id))
+        await tracker.sync()
+        assert api.pages == 1
+
+    run(scenario())
+
+def test_release_during_sync_is_skipped(run, caplog):
+    """A tweet released while a sync is starting is skipped, the others still sync"""
+    async def scenario():
+        api = FakeTwitterAPI(page_size=100)
+        tracker = make_tracker(api)
+        for tweet_id in (TWEET_ID, OTHER_TWEET_ID):
+            api.like(tweet_id, 1)
+            tracker.track(tweet_id, api.metrics(tweet_id))
+        syncing = asyncio.ensure_future(tracker.sync())
+        asyncio.get_running_loop().call_soon(tracker.release, OTHER_TWEET_ID)
+        await syncing
+        assert api.pages == 1
+        assert len(tracker) == 1
+
+    with caplog.at_level(logging.ERROR, logger='engager_tracker'):
+        run(scenario())
+    assert not caplog.records
+
+def test_released_tweets_forget_their_users(run):
+    """Users only referenced by ended tweets are dropped from memory and the store, their indexes reused"""
+    async def scenario():
+        api = FakeTwitterAPI(page_size=100)
+        tracker = make_tracker(api)
+        store = tracker.store
+        for round_index in range(5):
+            tweet_id = str(900 + round_index)
+            first_user = 1000 * round_index
+            api.like(tweet_id, *range(first_user, first_user + 30))  # Before the raid
+            tracker.track(tweet_id, api.metrics(tweet_id))
+            await sync(tracker, api, tweet_id)
+            api.like(tweet_id, *range(first_user + 30, first_user + 50))
+            await sync(tracker, api, tweet_id)
+            store.flush(*store.take_pending({}))
+            assert len(tracker.users) > 0
+
+            tracker.release(tweet_id)
+            store.flush(*store.take_pending({}))
+            assert len(tracker.users) == 0
+            assert store._conn.execute("SELECT COUNT(*) FROM twitter_users").fetchone() == (0,)
+        assert len(tracker.users._ids) <= 50
+
+    run(scenario())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Refresh Tests
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+import asyncio
+import clock
+from conftest import start_manager
+from config import REFRESH_FRESH_AGE
+
+CHAT_ID = -1001
+TARGETS = {'likes': 10 ** 6, 'retweets': 10 ** 6, 'comments': 10 ** 6}
+
+async def start_unpolled_raid(manager, tweet_id):
+    """Start a raid and stop its polling, so only Refresh updates it"""
+    success, raid = await manager.start_raid(CHAT_ID, f"https://x.com/a/status/{tweet_id}", dict(TARGETS))
+    assert success
+    manager.poller.unsubscribe(raid.tweet_id, raid.raid_id)
+    return raid
+
+async def press_refresh(manager, raid, presses):
+    """Press a raid's Refresh button presses times at once"""
+    return await asyncio.gather(*(
+        manager.handle_callback_query(f"q{i}", f"refresh_{raid.raid_id}", CHAT_ID, i)
+        for i in range(presses)
+    ))
+
+def test_stale_refresh_looks_up_past_the_tweet_cache(run):
+    """Presses after the fresh window cost exactly one upstream call, even with a longer cache TTL"""
+    async def scenario():
+        manager = await start_manager()
+        try:
+            manager.twitter_api.cache.ttl = 10 * REFRESH_FRESH_AGE  # Cached lookups outlive the fresh window
+            raid = await start_unpolled_raid(manager, '444')
+            requests = manager.twitter_api.provider.requests
+            await asyncio.sleep(3 * REFRESH_FRESH_AGE)
+
+            before = requests['statuses/show']
+            results = await press_refresh(manager, raid, 20)
+            assert all(success for success, _ in results)
+            assert requests['statuses/show'] == before + 1
+            assert raid.series.latest_time() == clock.time()
+        finally:
+            await manager.stop()
+
+    run(scenario())
+
+def test_fresh_refresh_answers_from_current_metrics(run):
+    """Presses within the fresh window make no upstream call"""
+    async def scenario():
+        manager = await start_manager()
+        try:
+            raid = await start_unpolled_raid(manager, '555')
+            requests = manager.twitter_api.provider.requests
+            before = sum(requests.values())
+            await press_refresh(manager, raid, 20)
+            assert sum(requests.values()) == before
+        finally:
+            await manager.stop()
+
+    run(scenario())
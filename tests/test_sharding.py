@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - Sharding Tests
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+from conftest import start_manager
+from config import SHARD_HEARTBEAT_MISSES
+from sharding import LocalTransport, ShardRouter, ShardUnavailable, ShardWorker, shard_owner
+
+WORKER_A = 'worker-a'
+WORKER_B = 'worker-b'
+TARGETS = {'likes': 10 ** 6, 'retweets': 10 ** 6, 'comments': 10 ** 6}
+
+class DeadTransport:
+    """Transport to a worker that stopped answering"""
+
+    async def request(self, method, params):
+        raise ShardUnavailable("worker is down")
+
+    async def close(self):
+        pass
+
+def chats_owned_by(owner, members, count):
+    """Get count chat IDs that owner owns among members"""
+    chats = []
+    chat_id = -1000
+    while len(chats) < count:
+        if shard_owner(chat_id, members) == owner:
+            chats.append(chat_id)
+        chat_id -= 1
+    return chats
+
+async def heartbeat_until_gone(router, address):
+    """Miss enough heartbeats for a worker to leave"""
+    for _ in range(SHARD_HEARTBEAT_MISSES):
+        await router._heartbeat()
+    assert address not in router.members
+
+def test_rejoining_worker_does_not_restore_adopted_chats(tmp_path, run):
+    """Chats taken over from a dead worker's store stay with their new state when it rejoins"""
+    async def scenario():
+        store_a = str(tmp_path / 'raids-a.db')
+        manager_a = await start_manager(store_a)
+        manager_b = await start_manager(str(tmp_path / 'raids-b.db'))
+        router = ShardRouter({
+            WORKER_A: LocalTransport(ShardWorker(manager_a)),
+            WORKER_B: LocalTransport(ShardWorker(manager_b))
+        })
+        await router.start()
+        try:
+            cancelled_chat, kept_chat = chats_owned_by(WORKER_A, [WORKER_A, WORKER_B], 2)
+            for chat_id, tweet_id in ((cancelled_chat, '111'), (kept_chat, '222')):
+                success, _ = await router.start_raid(chat_id, f"https://x.com/a/status/{tweet_id}", dict(TARGETS))
+                assert success
+            assert manager_a.get_active_raids_count() == 2
+
+            # A dies, B takes its chats over from A's store and one is cancelled there
+            await manager_a.stop()
+            router.transports[WORKER_A] = DeadTransport()
+            await heartbeat_until_gone(router, WORKER_A)
+            assert {raid.chat_id for raid in manager_b.get_active_raids()} == {cancelled_chat, kept_chat}
+            success, _ = await router.cancel_raid(cancelled_chat)
+            assert success
+
+            # A restarts on the same store and gets its chats back from B only
+            manager_a = await start_manager(store_a)
+            router.transports[WORKER_A] = LocalTransport(ShardWorker(manager_a))
+            await router._heartbeat()
+            assert router.members == [WORKER_A, WORKER_B]
+            assert [raid.raid_id for raid in manager_a.get_active_raids()] == [f"{kept_chat}_222"]
+            assert manager_b.get_active_raids_count() == 0
+        finally:
+            await router.stop()
+            await manager_a.stop()
+            await manager_b.stop()
+
+    run(scenario())
+
+def test_adopt_store_takes_each_chat_once(tmp_path, run):
+    """Adopted chats are deleted from the dead store, other shards' chats stay in it"""
+    async def scenario():
+        store_a = str(tmp_path / 'raids-a.db')
+        manager_a = await start_manager(store_a)
+        members = [WORKER_A, WORKER_B]
+        for index, chat_id in enumerate(chats_owned_by(WORKER_A, members, 4)):
+            success, _ = await manager_a.start_raid(chat_id, f"https://x.com/a/status/{300 + index}", dict(TARGETS))
+            assert success
+        await manager_a.stop()
+
+        manager_b = await start_manager(str(tmp_path / 'raids-b.db'))
+        try:
+            # With A gone and C joining, B and C each take their share
+            survivors = [WORKER_B, 'worker-c']
+            adopted_b = await ShardWorker(manager_b).rpc_adopt_store(store_a, WORKER_B, survivors)
+            manager_c = await start_manager(str(tmp_path / 'raids-c.db'))
+            try:
+                adopted_c = await ShardWorker(manager_c).rpc_adopt_store(store_a, 'worker-c', survivors)
+                assert adopted_b + adopted_c == 4
+                assert await ShardWorker(manager_b).rpc_adopt_store(store_a, WORKER_B, survivors) == 0
+            finally:
+                await manager_c.stop()
+        finally:
+            await manager_b.stop()
+
+        rejoined = await start_manager(store_a)
+        try:
+            assert await rejoined.restore_raids() == 0
+        finally:
+            await rejoined.stop()
+
+    run(scenario())
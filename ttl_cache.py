@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# VIBE AI Raider Bot - TTL Cache
+# Built with 💖 by VIBE AI - Where quirky meets powerful tech!
+
+# Copyright (c) 2024 VIBE AI Corp.
+# Website: www.vibe.airforce
+# Telegram: t.me/VIBEaiRforce
+# X: x.com/VIBEaiRforce
+# Docs: github.com/vibeAIrFORCE/Docs
+
+from collections import OrderedDict
+import clock
+
+# Returned by TTLCache.get() for absent or expired keys
+MISSING = object()
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a time-to-live.
+
+    Entries can carry their own TTL, so short-lived negative results can
+    share the cache with normal ones. When full, the least recently used
+    entry is evicted.
+    """
+
+    def __init__(self, maxsize, ttl):
+        """Initialize cache holding up to maxsize entries for ttl seconds each"""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), oldest use first
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get a cached value, or MISSING if absent or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        if clock.monotonic() >= entry[0]:
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl=None):
+        """Cache a value for ttl seconds (the cache default if None)"""
+        self._entries[key] = (clock.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key):
+        """Drop a cached value if present"""
+        self._entries.pop(key, None)
+
+    def get_stats(self):
+        """Get size and hit-rate stats"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
@@ -9,161 +9,132 @@
 # Docs: github.com/vibeAIrFORCE/Docs
 
 import re
+import asyncio
 import logging
-import random
-import tweepy
-import time
+from rate_budget import RateLimitBudget
+from metrics_providers import UNAVAILABLE, create_provider
+from ttl_cache import MISSING, TTLCache
 from config import (
-    TWITTER_API_KEY,
-    TWITTER_API_SECRET,
-    TWITTER_ACCESS_TOKEN,
-    TWITTER_ACCESS_SECRET,
-    MOCK_MODE
+    METRICS_PROVIDER,
+    TWITTER_BATCH_SIZE,
+    TWITTER_RATE_LIMIT_RESERVE,
+    TWEET_CACHE_SIZE,
+    TWEET_CACHE_TTL,
+    TWEET_NEGATIVE_CACHE_TTL
 )
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
 logger = logging.getLogger(__name__)
 
+# Tweet URLs on twitter.com and x.com, including www./mobile. hosts,
+# /i/web/ links and trailing query strings
+TWEET_URL_PATTERN = r'(?<![\w.-])(?:https?://)?(?:(?:www|mobile|m)\.)?(?:twitter|x)\.com/(?:i/web|\w+)/status(?:es)?/(\d+)(?:[/?#][^\s,;()<>]*)?'
+TWEET_URL_RE = re.compile(TWEET_URL_PATTERN, re.IGNORECASE)
+
 class TwitterAPI:
-    """Twitter API integration for raid bot"""
+    """Twitter API integration for raid bot
+
+    Metrics come from the backend selected by METRICS_PROVIDER ('mock', 'v1'
+    or 'v2'); every fetch is a coroutine. Single-tweet lookups are served
+    from a short-lived cache, with unavailable tweets cached as None for
+    TWEET_NEGATIVE_CACHE_TTL, and concurrent lookups of the same tweet share
+    one upstream call; batch polls always go upstream and refresh the cache.
+    """
     
-    def __init__(self):
-        """Initialize Twitter API client"""
-        self.api = None if MOCK_MODE else self._setup_api()
-        self.mock_mode = MOCK_MODE
-        self._mock_metrics_store = {}  # Store for mock metrics
-        
-        if self.mock_mode:
-            logger.info("Running in MOCK MODE - Twitter API calls will be simulated")
+    def __init__(self, run_blocking=None):
+        """Initialize Twitter API client
+
+        run_blocking: coroutine function used by blocking backends to call
+        their client off the event loop
+        """
+        self.budget = RateLimitBudget(reserve=TWITTER_RATE_LIMIT_RESERVE)
+        self.provider = create_provider(METRICS_PROVIDER, self.budget, run_blocking)
+        self.cache = TTLCache(TWEET_CACHE_SIZE, TWEET_CACHE_TTL)  # tweet_id -> metrics, or None if unavailable
+        self._inflight = {}  # tweet_id -> upstream lookup task shared by concurrent fetches
+        self.shared_fetches = 0  # Fetches that joined a lookup already in flight
     
-    def _setup_api(self):
-        """Set up and return Twitter API client"""
-        try:
-            auth = tweepy.OAuth1UserHandler(
-                TWITTER_API_KEY,
-                TWITTER_API_SECRET,
-                TWITTER_ACCESS_TOKEN,
-                TWITTER_ACCESS_SECRET
-            )
-            return tweepy.API(auth)
-        except Exception as e:
-            logger.error(f"Error setting up Twitter API: {e}")
-            return None
+    @property
+    def lookup_endpoint(self):
+        """Rate-limit budget key for batch lookups"""
+        return self.provider.lookup_endpoint
     
     def extract_tweet_id(self, tweet_url):
         """Extract tweet ID from a Twitter URL"""
-        # Twitter URL pattern
-        pattern = r'twitter\.com\/\w+\/status\/(\d+)'
-        match = re.search(pattern, tweet_url)
-        if match:
-            return match.group(1)
-        
-        # X.com URL pattern
-        pattern = r'x\.com\/\w+\/status\/(\d+)'
-        match = re.search(pattern, tweet_url)
-        if match:
-            return match.group(1)
-            
-        return None
-    
-    def get_tweet_metrics(self, tweet_id):
-        """Get current metrics for a tweet"""
-        if self.mock_mode:
-            # Generate mock metrics for testing
-            return self._get_mock_metrics(tweet_id)
-            
-        try:
-            tweet = self.api.get_status(tweet_id)
-            return {
-                'likes': tweet.favorite_count,
-                'retweets': tweet.retweet_count,
-                # Comments count requires different API approach
-                'comments': self._estimate_comment_count(tweet_id)
-            }
-        except Exception as e:
-            logger.error(f"Error fetching tweet metrics: {e}")
-            return {'likes': 0, 'retweets': 0, 'comments': 0}
+        match = TWEET_URL_RE.search(tweet_url)
+        return match.group(1) if match else None
     
-    def _get_mock_metrics(self, tweet_id):
-        """Generate mock metrics for testing without Twitter API"""
-        # Initialize if this is the first call for this tweet
-        if tweet_id not in self._mock_metrics_store:
-            self._mock_metrics_store[tweet_id] = {
-                'likes': random.randint(5, 15),
-                'retweets': random.randint(2, 8),
-                'comments': random.randint(1, 5),
-                'last_update': time.time(),
-                'update_count': 0
-            }
-            logger.info(f"Initialized mock metrics for tweet {tweet_id}: {self._mock_metrics_store[tweet_id]}")
-            return {
-                'likes': self._mock_metrics_store[tweet_id]['likes'],
-                'retweets': self._mock_metrics_store[tweet_id]['retweets'],
-                'comments': self._mock_metrics_store[tweet_id]['comments']
-            }
-        
-        # Update metrics based on time elapsed since last update
-        current_time = time.time()
-        time_elapsed = current_time - self._mock_metrics_store[tweet_id]['last_update']
-        update_count = self._mock_metrics_store[tweet_id]['update_count'] + 1
+    async def fetch_tweet(self, tweet_id, fresh=False):
+        """Get current metrics for a tweet in at most one upstream call
+
+        Returns the metrics, UNAVAILABLE for deleted, private or nonexistent
+        tweets, or None if the lookup failed. With fresh, the cache is
+        skipped (but still updated), for callers that need metrics as of now.
+        """
+        if not fresh:
+            cached = self.cache.get(tweet_id)
+            if cached is not MISSING:
+                return UNAVAILABLE if cached is None else cached
         
-        # More frequent updates in the beginning, slower over time
-        if update_count < 5:
-            like_increase = random.randint(3, 7)
-            rt_increase = random.randint(1, 3)
-            comment_increase = random.randint(1, 2)
-        elif update_count < 10:
-            like_increase = random.randint(2, 5)
-            rt_increase = random.randint(1, 2)
-            comment_increase = random.randint(0, 1)
+        task = self._inflight.get(tweet_id)
+        if task is None:
+            task = self._inflight[tweet_id] = asyncio.ensure_future(self._lookup(tweet_id))
+            task.add_done_callback(lambda _: self._inflight.pop(tweet_id, None))
         else:
-            like_increase = random.randint(1, 3)
-            rt_increase = random.randint(0, 1)
-            comment_increase = random.randint(0, 1)
-        
-        # Update the stored metrics
-        self._mock_metrics_store[tweet_id]['likes'] += like_increase
-        self._mock_metrics_store[tweet_id]['retweets'] += rt_increase
-        self._mock_metrics_store[tweet_id]['comments'] += comment_increase
-        self._mock_metrics_store[tweet_id]['last_update'] = current_time
-        self._mock_metrics_store[tweet_id]['update_count'] = update_count
-        
-        # Log the updated metrics
-        logger.info(f"Updated mock metrics for tweet {tweet_id}: {self._mock_metrics_store[tweet_id]}")
-        
-        # Return the current metrics
-        return {
-            'likes': self._mock_metrics_store[tweet_id]['likes'],
-            'retweets': self._mock_metrics_store[tweet_id]['retweets'],
-            'comments': self._mock_metrics_store[tweet_id]['comments']
-        }
+            self.shared_fetches += 1
+        # Shielded, so a caller giving up doesn't cancel the lookup for the others
+        return await asyncio.shield(task)
+    
+    async def _lookup(self, tweet_id):
+        """Look up one tweet upstream and cache the result"""
+        metrics = await self.provider.get_tweet_metrics(tweet_id)
+        if metrics is UNAVAILABLE:
+            self.cache.set(tweet_id, None, ttl=TWEET_NEGATIVE_CACHE_TTL)
+        elif metrics is not None:
+            self.cache.set(tweet_id, metrics)
+        return metrics
     
-    def _estimate_comment_count(self, tweet_id):
-        """Estimate comment count for a tweet"""
-        try:
-            # This is a simplified approach - in production you'd need
-            # to implement a more sophisticated method using Twitter API v2
-            # or by scraping the tweet page
-            return 0  # Placeholder
-        except Exception as e:
-            logger.error(f"Error estimating comment count: {e}")
-            return 0
+    async def get_tweet_metrics(self, tweet_id, fresh=False):
+        """Get current metrics for a tweet, or None if they can't be fetched (fresh skips the cache)"""
+        metrics = await self.fetch_tweet(tweet_id, fresh)
+        return None if metrics is UNAVAILABLE else metrics
+    
+    async def get_tweet_metrics_batch(self, tweet_ids):
+        """Get current metrics for many tweets, keyed by tweet ID
+
+        Tweets that can't be seen, or whose lookup request failed, are left
+        out of the result. Returns None if every lookup request failed.
+        """
+        tweet_ids = list(tweet_ids)
+        chunks = [tweet_ids[i:i + TWITTER_BATCH_SIZE] for i in range(0, len(tweet_ids), TWITTER_BATCH_SIZE)]
+        results, failed = {}, 0
+        for chunk_results in await asyncio.gather(*(self.provider.get_tweet_metrics_batch(chunk) for chunk in chunks)):
+            if chunk_results is None:
+                failed += 1
+            else:
+                results.update(chunk_results)
+        if chunks and failed == len(chunks):
+            return None
+        for tweet_id, metrics in results.items():
+            self.cache.set(tweet_id, metrics)
+        return results
     
-    def is_valid_tweet(self, tweet_id):
+    async def is_valid_tweet(self, tweet_id):
         """Check if a tweet ID is valid and accessible"""
-        # In mock mode, consider all tweet IDs valid immediately
-        if self.mock_mode:
-            logger.info(f"Mock mode: Considering tweet {tweet_id} valid without API check")
-            return True
-            
-        # Only try API validation if not in mock mode
-        try:
-            self.api.get_status(tweet_id)
-            return True
-        except Exception as e:
-            logger.error(f"Error validating tweet: {e}")
-            return False
+        metrics = await self.fetch_tweet(tweet_id)
+        return metrics is not None and metrics is not UNAVAILABLE
+    
+    @property
+    def engager_endpoints(self):
+        """Metric -> rate-limit budget key for engager pages, empty if the provider can't list engagers"""
+        return self.provider.engager_endpoints
+    
+    async def get_engagers(self, tweet_id, metric, token=None, since_id=None):
+        """Get one page of the users behind a tweet's metric, see MetricsProvider.get_engagers()"""
+        return await self.provider.get_engagers(tweet_id, metric, token, since_id)
+    
+    def release(self, tweet_id):
+        """Drop provider state for a tweet that is no longer raided"""
+        self.provider.release(tweet_id)
+    
+    async def close(self):
+        """Release the metrics provider's connections"""
+        await self.provider.close()